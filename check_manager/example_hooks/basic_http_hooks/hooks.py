@@ -1,5 +1,5 @@
 from fastapi import Request
-import check_hooks.hook_utils as hu  # noqa: F401 might be used later
+import check_hooks.hook_utils as hu
 
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from typing import TypedDict
@@ -13,6 +13,7 @@ async def get_fastapi_security(request: Request) -> HTTPBasicCredentials | None:
     return await HTTPBasic(auto_error=False)(request)
 
 
+@hu.run_inline
 def on_auth(auth_info: HTTPBasicCredentials | None) -> UserInfo:
     if auth_info is None:
         return UserInfo(username="unauthorized_user")
@@ -23,5 +24,6 @@ def on_auth(auth_info: HTTPBasicCredentials | None) -> UserInfo:
 ## For the mock backend
 
 
+@hu.run_inline
 def get_mock_username(userinfo: UserInfo) -> str:
     return userinfo["username"]
@@ -81,6 +81,18 @@ def on_check_create(userinfo: UserInfo, check: hu.InCheckAttributes) -> None:
         )
 
 
+def on_check_update(
+    userinfo: UserInfo, check: hu.OutCheck, attributes: hu.InCheckAttributes
+) -> None:
+    print("ON CHECK UPDATE")
+
+    if userinfo["username"] not in ["alice", "bob"]:
+        raise hu.APIForbiddenError(
+            title="Unauthorized check update",
+            detail=f"You are not authorized to update check with id {check.id}",
+        )
+
+
 def on_check_remove(userinfo: UserInfo, check: hu.OutCheck) -> None:
     print("ON CHECK REMOVE")
 
@@ -125,10 +137,19 @@ async def get_k8s_config(userinfo: UserInfo) -> hu.K8sConfiguration:
     # return await k8s_config_from_cluster()
 
 
+@hu.run_inline
 def get_k8s_namespace(userinfo: UserInfo) -> str:
     return "resource-health"
 
 
+@hu.run_inline
+def get_k8s_cronjob_labels(userinfo: UserInfo) -> dict[str, str]:
+    ## Only list the cronjobs of the user, and label new cronjobs accordingly
+    return {
+        "resource-health.eoepca.org/owner": hu.k8s_label_value(userinfo["username"])
+    }
+
+
 async def on_k8s_cronjob_access(
     userinfo: UserInfo,
     check_id: hu.CheckId,
@@ -184,6 +205,14 @@ async def on_k8s_cronjob_create(
         )
 
 
+def on_k8s_cronjob_update(
+    userinfo: UserInfo, client: hu.K8sClient, cronjob: hu.K8sCronJob, patch: dict
+) -> None:
+    print("on_k8s_cronjob_update")
+
+    ## Access already checked as part of on_k8s_cronjob_access
+
+
 def on_k8s_cronjob_remove(
     userinfo: UserInfo, client: hu.K8sClient, cronjob: hu.K8sCronJob
 ) -> None:
@@ -213,5 +242,6 @@ def on_k8s_cronjob_run(
 ## For the mock backend
 
 
+@hu.run_inline
 def get_mock_username(userinfo: UserInfo) -> str:
     return userinfo["username"]
@@ -15,11 +15,14 @@ from check_backends.check_backend import (
 )
 from exceptions import (
     APIException,
+    CheckBackendTimeoutError,
     CheckConnectionError,
+    CheckIdMismatchError,
     JsonValidationError,
     CronExpressionValidationError,
+    PageCursorExpiredError,
 )
-from eoepca_api_utils.json_api_types import Error
+from eoepca_api_utils.json_api_types import Error, ErrorSourcePointer
 
 
 ROUTE_PREFIX = "/v1"
@@ -33,6 +36,12 @@ UPDATE_CHECK_PATH: Final[str] = ROUTE_PREFIX + "/checks/{check_id}"
 REMOVE_CHECK_PATH: Final[str] = ROUTE_PREFIX + "/checks/{check_id}"
 GET_CHECKS_PATH: Final[str] = ROUTE_PREFIX + "/checks/"
 RUN_CHECK_PATH: Final[str] = ROUTE_PREFIX + "/checks/{check_id}/run/"
+RECONCILE_CHECKS_PATH: Final[str] = ROUTE_PREFIX + "/checks/"
+BULK_CREATE_CHECKS_PATH: Final[str] = ROUTE_PREFIX + "/bulk/checks/"
+BULK_REMOVE_CHECKS_PATH: Final[str] = ROUTE_PREFIX + "/bulk/checks/remove/"
+BULK_RUN_CHECKS_PATH: Final[str] = ROUTE_PREFIX + "/bulk/checks/run/"
+# Prometheus metrics, outside of the versioned API
+METRICS_PATH: Final[str] = "/metrics"
 
 
 def get_check_exceptions(
@@ -41,6 +50,34 @@ def get_check_exceptions(
     return get_exceptions(_get_exception, status_code, content)
 
 
+def get_check_exception(error: Error) -> APIException:
+    return _get_exception(error)
+
+
+def bulk_item_error(index: int, error: Error) -> Error:
+    """
+    The error of the item at index in a bulk request, pointing to that item.
+    Pointers into a single item request document are moved under the item.
+    """
+    pointer = f"/data/{index}"
+    if isinstance(error.source, ErrorSourcePointer) and (
+        error.source.pointer == "/data" or error.source.pointer.startswith("/data/")
+    ):
+        pointer += error.source.pointer.removeprefix("/data")
+    return error.model_copy(update={"source": ErrorSourcePointer(pointer=pointer)})
+
+
+def bulk_item_index(error: Error) -> int | None:
+    """The index of the item of a bulk request the error is about, if any"""
+    if not isinstance(error.source, ErrorSourcePointer):
+        return None
+    match error.source.pointer.split("/"):
+        case ["", "data", index, *_] if index.isdigit():
+            return int(index)
+        case _:
+            return None
+
+
 def _get_exception(error: Error) -> APIException:
     match error.code:
         case JsonValidationError.__name__:
@@ -61,7 +98,13 @@ def _get_exception(error: Error) -> APIException:
             return CheckIdError.create(error)
         case CheckIdNonUniqueError.__name__:
             return CheckIdNonUniqueError.create(error)
+        case CheckIdMismatchError.__name__:
+            return CheckIdMismatchError.create(error)
         case CheckConnectionError.__name__:
             return CheckConnectionError.create(error)
+        case PageCursorExpiredError.__name__:
+            return PageCursorExpiredError.create(error)
+        case CheckBackendTimeoutError.__name__:
+            return CheckBackendTimeoutError.create(error)
         case _:
             return APIException.create(error)
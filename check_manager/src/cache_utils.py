@@ -0,0 +1,152 @@
+import base64
+from collections import OrderedDict
+import hashlib
+import json
+import time
+from typing import Any, Hashable, Self
+
+from pydantic import BaseModel
+
+
+def digest(obj: Any) -> str:
+    """
+    Returns a digest of a JSON-like object (such as the authentication object
+    returned by hooks) that can be used as a cache key.
+    """
+    return hashlib.sha256(
+        json.dumps(obj, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def jwt_expiry(token: str) -> float | None:
+    """
+    Returns the expiry time (seconds since epoch) of a JWT, optionally prefixed with
+    "Bearer ", or None if it isn't a JWT with an expiry time. The signature is not
+    checked.
+    """
+    parts = token.removeprefix("Bearer ").strip().split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        payload = json.loads(
+            base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4))
+        )
+    except ValueError:
+        return None
+    if isinstance(payload, dict) and isinstance(payload.get("exp"), (int, float)):
+        return float(payload["exp"])
+    return None
+
+
+def _credentials(obj: Any) -> Any:
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    if isinstance(obj, BaseModel):
+        return _credentials(obj.model_dump())
+    if isinstance(obj, dict):
+        return sorted((str(key), _credentials(value)) for key, value in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return [_credentials(value) for value in obj]
+    # Validated tokens, such as the ones returned by eoepca_security, keep the token as it was sent
+    raw = getattr(obj, "raw", None)
+    if isinstance(raw, str):
+        return raw
+    raise TypeError(f"Cannot derive a cache key from {type(obj).__name__}")
+
+
+def _strings(obj: Any) -> list[str]:
+    if isinstance(obj, str):
+        return [obj]
+    if isinstance(obj, (list, tuple)):
+        return [string for value in obj for string in _strings(value)]
+    return []
+
+
+def credentials_cache_key(obj: Any) -> tuple[str, float | None] | None:
+    """
+    Returns a digest of credentials (such as the result of a FastAPI security scheme)
+    to be used as a cache key, together with the earliest expiry time of the JWTs
+    within them, if any. Returns None if the credentials contain values other than
+    JSON-like values, pydantic models and validated tokens, as an arbitrary object
+    might not be turned into a key that tells apart different credentials.
+    """
+    try:
+        credentials = _credentials(obj)
+    except TypeError:
+        return None
+    expiry_times = [
+        expires_at
+        for expires_at in map(jwt_expiry, _strings(credentials))
+        if expires_at is not None
+    ]
+    return digest(credentials), min(expiry_times, default=None)
+
+
+class TTLCache[K: Hashable, V]:
+    """
+    A bounded cache which drops the least recently used entry when full.
+    Entries expire after ttl_seconds, or at the time given when setting them,
+    whichever comes first.
+    """
+
+    def __init__(self: Self, *, max_size: int, ttl_seconds: float | None) -> None:
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        # Values are (expiry time, value)
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self: Self) -> int:
+        return len(self._entries)
+
+    def get(self: Self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if time.time() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self: Self, key: K, value: V, *, expires_at: float | None = None) -> None:
+        if self._max_size <= 0:
+            return
+        if self._ttl_seconds is not None:
+            ttl_expires_at = time.time() + self._ttl_seconds
+            expires_at = (
+                ttl_expires_at
+                if expires_at is None
+                else min(expires_at, ttl_expires_at)
+            )
+        self._entries[key] = (float("inf") if expires_at is None else expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self: Self, key: K) -> V | None:
+        entry = self._entries.pop(key, None)
+        return None if entry is None else entry[1]
+
+    def clear(self: Self) -> None:
+        self._entries.clear()
+
+
+def cache_metrics_text(caches: dict[str, TTLCache[Any, Any]], prefix: str = "") -> str:
+    """
+    The hits and misses of the caches by name in the Prometheus text exposition format,
+    with prefix before the metric names
+    """
+    lines: list[str] = []
+    for counter, description in [
+        ("hits", "How many lookups found a value in the cache"),
+        ("misses", "How many lookups found no value in the cache"),
+    ]:
+        metric = f"{prefix}cache_{counter}_total"
+        lines.extend([f"# HELP {metric} {description}", f"# TYPE {metric} counter"])
+        for name, cache in sorted(caches.items()):
+            lines.append(f'{metric}{{cache="{name}"}} {getattr(cache, counter)}')
+    return "\n".join(lines) + "\n"
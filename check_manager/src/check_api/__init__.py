@@ -1,5 +1,7 @@
+from contextlib import asynccontextmanager
+import copy
 import json
-from typing import Annotated, Any
+from typing import Annotated, Any, AsyncIterator, Awaitable, Callable
 import pathlib
 import os
 from fastapi import (
@@ -12,13 +14,16 @@ from fastapi import (
     Depends,
 )
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from os import environ
 
+from cache_utils import TTLCache, cache_metrics_text, credentials_cache_key
 from check_hooks import (
-    call_hooks_check_if_allow,
+    access_mask,
+    hook_metrics,
     load_hooks,
 )
-from plugin_utils.runner import call_hooks_until_not_none, call_hooks_ignore_results
+from check_hooks.hook_utils import is_auth_cacheable
 from api_interface import (
     GET_CHECK_PATH,
     GET_CHECK_TEMPLATE_PATH,
@@ -27,12 +32,22 @@ from api_interface import (
     CREATE_CHECK_PATH,
     REMOVE_CHECK_PATH,
     RUN_CHECK_PATH,
+    UPDATE_CHECK_PATH,
+    METRICS_PATH,
+    BULK_CREATE_CHECKS_PATH,
+    BULK_REMOVE_CHECKS_PATH,
+    BULK_RUN_CHECKS_PATH,
+    RECONCILE_CHECKS_PATH,
+    bulk_item_error,
 )
 from eoepca_api_utils.api_utils import (
+    PAGE_CURSOR_QUERY_PARAM,
+    PAGE_SIZE_QUERY_PARAM,
     JSONAPIResponse,
     add_exception_handlers,
     get_api_router_with_defaults,
     get_env_var_or_throw,
+    get_page_links,
     get_request_url_str,
     get_url_str,
     set_custom_json_schema,
@@ -49,18 +64,35 @@ from check_backends.check_backend import (
     OutCheckAttributes,
     InCheck,
     CheckTemplateIdError,
+    CheckIdentifier,
+    CheckIdentifiers,
+    InCheckAttributes,
+    InCheckData,
+    InChecks,
+    InCheckUpdate,
+    InCheckUpdateAttributes,
+    ListMeta,
+    BULK_CONCURRENCY,
+    collect_backend_errors,
+    gather_each,
+    updated_attributes,
 )
+from check_backends.caching_backend import CachingBackend
 from check_backends.mock_backend import MockBackend
+from check_backends.reconcile import ReconcileMeta, apply_reconcile, plan_reconcile
 
 # from check_backends.rest_backend import RestBackend
 from check_backends.rest_backend import RestBackend
+from eoepca_api_utils.exceptions import APIUserInputError, get_status_code_and_errors
 from exceptions import (
     APIException,
+    CheckIdMismatchError,
     NewCheckClientSpecifiedId,
 )
 from eoepca_api_utils.json_api_types import (
     APIOKResponse,
     APIOKResponseList,
+    Error,
     Link,
     LinkObject,
     Links,
@@ -69,7 +101,15 @@ from eoepca_api_utils.json_api_types import (
 
 BASE_URL = get_env_var_or_throw("RH_CHECK_API_BASE_URL")
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    # Release the connections kept by the backend, such as its pooled cluster clients
+    await check_backend.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 # A solution to make CORS headers appear in error responses too, based on
 # https://github.com/fastapi/fastapi/discussions/8027#discussioncomment-5146484
 wrapped_app = CORSMiddleware(
@@ -87,9 +127,22 @@ add_exception_handlers(app)
 loaded_hooks = load_hooks()
 
 
+# Cache the listed checks and templates for this long, no caching if 0
+BACKEND_CACHE_TTL_SECONDS: float = float(
+    os.environ.get("RH_CHECK_BACKEND_CACHE_TTL_SECONDS") or "0"
+)
+
+
+def _configure_backend(backend: CheckBackend) -> CheckBackend:
+    """The backend the API uses, wrapped in a CachingBackend if caching is on"""
+    if BACKEND_CACHE_TTL_SECONDS > 0:
+        return CachingBackend(backend, ttl_seconds=BACKEND_CACHE_TTL_SECONDS)
+    return backend
+
+
 # Use CheckBackend type so mypy warns is any specifics of MockBackend are used
-check_backend: CheckBackend = MockBackend(
-    template_id_prefix="remote_", hooks=loaded_hooks
+check_backend: CheckBackend = _configure_backend(
+    MockBackend(template_id_prefix="remote_", hooks=loaded_hooks.hooks)
 )
 
 GET_FASTAPI_SECURITY_HOOK_NAME = (
@@ -102,26 +155,109 @@ ON_TEMPLATE_ACCESS_HOOK_NAME = (
 ON_CHECK_ACCESS_HOOK_NAME = (
     os.environ.get("RH_CHECK_ON_CHECK_ACCESS_HOOK_NAME") or "on_check_access"
 )
+# Batch variants of the access hooks take a list of templates/checks and return
+# whether each is allowed. Items must be allowed by both variants if both are set.
+ON_TEMPLATE_ACCESS_BATCH_HOOK_NAME = (
+    os.environ.get("RH_CHECK_ON_TEMPLATE_ACCESS_BATCH_HOOK_NAME")
+    or "on_template_access_batch"
+)
+ON_CHECK_ACCESS_BATCH_HOOK_NAME = (
+    os.environ.get("RH_CHECK_ON_CHECK_ACCESS_BATCH_HOOK_NAME")
+    or "on_check_access_batch"
+)
 ON_CHECK_CREATE_HOOK_NAME = (
     os.environ.get("RH_CHECK_ON_CHECK_CREATE_HOOK_NAME") or "on_check_create"
 )
 ON_CHECK_REMOVE_HOOK_NAME = (
     os.environ.get("RH_CHECK_ON_CHECK_REMOVE_HOOK_NAME") or "on_check_remove"
 )
+# Takes the authentication object, the check and its attributes after the update
+ON_CHECK_UPDATE_HOOK_NAME = (
+    os.environ.get("RH_CHECK_ON_CHECK_UPDATE_HOOK_NAME") or "on_check_update"
+)
 ON_CHECK_RUN_HOOK_NAME = (
     os.environ.get("RH_CHECK_ON_CHECK_RUN_HOOK_NAME") or "on_check_run"
 )
 
+# The hooks called on every request, bound once. Hooks without functions do nothing
+get_fastapi_security_hook = loaded_hooks.until_not_none(GET_FASTAPI_SECURITY_HOOK_NAME)
+on_auth_hook = loaded_hooks.until_not_none(ON_AUTH_HOOK_NAME)
+on_template_access_hook = loaded_hooks.ignore_results(ON_TEMPLATE_ACCESS_HOOK_NAME)
+on_template_access_batch_hook = loaded_hooks.check_if_allow_batch(
+    ON_TEMPLATE_ACCESS_BATCH_HOOK_NAME
+)
+on_check_access_hook = loaded_hooks.ignore_results(ON_CHECK_ACCESS_HOOK_NAME)
+on_check_access_batch_hook = loaded_hooks.check_if_allow_batch(
+    ON_CHECK_ACCESS_BATCH_HOOK_NAME
+)
+on_check_create_hook = loaded_hooks.ignore_results(ON_CHECK_CREATE_HOOK_NAME)
+on_check_update_hook = loaded_hooks.ignore_results(ON_CHECK_UPDATE_HOOK_NAME)
+on_check_remove_hook = loaded_hooks.ignore_results(ON_CHECK_REMOVE_HOOK_NAME)
+on_check_run_hook = loaded_hooks.ignore_results(ON_CHECK_RUN_HOOK_NAME)
+
+# Lists are paginated when page[size] or page[cursor] is given, otherwise everything
+# is returned at once. Pages may have fewer items than the page size as the items
+# the user has no access to are left out.
+DEFAULT_PAGE_SIZE: int = int(os.environ.get("RH_CHECK_API_DEFAULT_PAGE_SIZE") or "100")
+MAX_PAGE_SIZE: int = int(os.environ.get("RH_CHECK_API_MAX_PAGE_SIZE") or "1000")
+
+# The bulk endpoints take at most this many items (and the reconcile endpoint at most
+# MAX_RECONCILE_SIZE), calling the hooks for up to BULK_CONCURRENCY of them at the
+# same time (see check_backends.check_backend)
+MAX_BULK_SIZE: int = int(os.environ.get("RH_CHECK_API_MAX_BULK_SIZE") or "1000")
+MAX_RECONCILE_SIZE: int = int(
+    os.environ.get("RH_CHECK_API_MAX_RECONCILE_SIZE") or "10000"
+)
+
+# The results of the on_auth hooks are reused for requests with the same credentials
+# until the credentials expire (if they contain JWTs) or for at most the TTL
+AUTH_CACHE_MAX_SIZE: int = int(os.environ.get("RH_CHECK_AUTH_CACHE_SIZE") or "1024")
+AUTH_CACHE_TTL_SECONDS: float = float(
+    os.environ.get("RH_CHECK_AUTH_CACHE_TTL_SECONDS") or "300"
+)
+
 ## TODO: Make this configurable/optional
 
 
 async def security_scheme(request: Request) -> Any | None:
-    if GET_FASTAPI_SECURITY_HOOK_NAME in loaded_hooks:
-        return await call_hooks_until_not_none(
-            loaded_hooks[GET_FASTAPI_SECURITY_HOOK_NAME], request
-        )
-    else:
-        return None
+    return await get_fastapi_security_hook(request)
+
+
+auth_cache: TTLCache[str, Any] = TTLCache(
+    max_size=AUTH_CACHE_MAX_SIZE, ttl_seconds=AUTH_CACHE_TTL_SECONDS
+)
+
+
+async def authenticate(auth_info: Any) -> Any:
+    """
+    Turns the credentials returned by security_scheme into the authentication object
+    passed to the other hooks and the backend, using the on_auth hooks. The result is
+    cached unless some on_auth hook opts out with hook_utils.no_auth_cache. Each
+    request gets its own deep copy of a cached result, so hooks may change it, and
+    results which can't be copied aren't cached.
+    """
+    if ON_AUTH_HOOK_NAME not in loaded_hooks:
+        return auth_info
+    funcs = loaded_hooks.hooks[ON_AUTH_HOOK_NAME]
+
+    cache_key = (
+        credentials_cache_key(auth_info)
+        if all(is_auth_cacheable(func) for func in funcs)
+        else None
+    )
+    if cache_key is not None:
+        cached = auth_cache.get(cache_key[0])
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+    result = await on_auth_hook(auth_info)
+    if cache_key is not None and result is not None:
+        try:
+            cached = copy.deepcopy(result)
+        except (TypeError, copy.Error):
+            return result
+        auth_cache.set(cache_key[0], cached, expires_at=cache_key[1])
+    return result
 
 
 router = get_api_router_with_defaults()
@@ -137,10 +273,7 @@ router = get_api_router_with_defaults()
 async def root(
     auth_info: Annotated[Any, Depends(security_scheme)],
 ) -> APIOKResponseList[None, None]:
-    if ON_AUTH_HOOK_NAME in loaded_hooks:
-        auth_info = await call_hooks_until_not_none(
-            loaded_hooks[ON_AUTH_HOOK_NAME], auth_info
-        )
+    auth_info = await authenticate(auth_info)
 
     ## NOTE: Maybe add on_root hook?
 
@@ -175,6 +308,16 @@ async def root(
     )
 
 
+@app.get(METRICS_PATH, include_in_schema=False, response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """How long the hooks take and how often on_auth results are reused, in the Prometheus text format"""
+    return PlainTextResponse(
+        hook_metrics.prometheus_text("rh_check_")
+        + cache_metrics_text({"auth": auth_cache}, "rh_check_"),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 def check_template_url(check_template_id: CheckTemplateId) -> str:
     return get_url_str(
         BASE_URL,
@@ -207,32 +350,70 @@ async def get_check_templates(
         list[CheckTemplateId] | None,
         Query(description="restrict IDs to include"),
     ] = None,
-) -> APIOKResponseList[CheckTemplateAttributes, None]:
-    if ON_AUTH_HOOK_NAME in loaded_hooks:
-        auth_info = await call_hooks_until_not_none(
-            loaded_hooks[ON_AUTH_HOOK_NAME], auth_info
+    page_size: Annotated[
+        int | None,
+        Query(
+            alias=PAGE_SIZE_QUERY_PARAM,
+            ge=1,
+            le=MAX_PAGE_SIZE,
+            description="maximum number of check templates per page",
+        ),
+    ] = None,
+    page_cursor: Annotated[
+        str | None,
+        Query(
+            alias=PAGE_CURSOR_QUERY_PARAM,
+            description="cursor from the next link of the previous page",
+        ),
+    ] = None,
+) -> APIOKResponseList[CheckTemplateAttributes, ListMeta | None]:
+    auth_info = await authenticate(auth_info)
+
+    backend_errors: list[Error] = []
+    if page_size is None and page_cursor is None:
+        # Leave out the items of the services that fail rather than failing altogether
+        with collect_backend_errors() as backend_errors:
+            templates = [
+                template
+                async for template in check_backend.get_check_templates(auth_info, ids)
+            ]
+        links = Links(
+            self=get_request_url_str(BASE_URL, request),
+            root=BASE_URL,
+        )
+    else:
+        page = await check_backend.get_check_templates_page(
+            auth_info,
+            ids,
+            page_size=page_size or DEFAULT_PAGE_SIZE,
+            cursor=page_cursor,
         )
+        templates = page.items
+        links = get_page_links(BASE_URL, request, page.next_cursor)
+
+    allowed = await access_mask(
+        templates,
+        batch_funcs=loaded_hooks.get(ON_TEMPLATE_ACCESS_BATCH_HOOK_NAME),
+        funcs=loaded_hooks.get(ON_TEMPLATE_ACCESS_HOOK_NAME),
+        batch_args=(auth_info,),
+        item_args=lambda template: (auth_info, template),
+    )
+    templates = [template for template, allow in zip(templates, allowed) if allow]
 
     response.headers["Allow"] = "GET"
-    return APIOKResponseList[CheckTemplateAttributes, None](
-        data=[
-            check_template_to_resource(template)
-            async for template in check_backend.get_check_templates(auth_info, ids)
-            if (
-                ON_TEMPLATE_ACCESS_HOOK_NAME not in loaded_hooks
-                or await call_hooks_check_if_allow(
-                    loaded_hooks[ON_TEMPLATE_ACCESS_HOOK_NAME], auth_info, template
-                )
-            )
-        ],
-        links=Links(
-            self=get_request_url_str(BASE_URL, request),
-            root=BASE_URL,
-        ),
-        meta=None,
+    return APIOKResponseList[CheckTemplateAttributes, ListMeta | None](
+        data=[check_template_to_resource(template) for template in templates],
+        links=links,
+        meta=ListMeta(errors=backend_errors) if backend_errors else None,
     )
 
 
+async def _check_template_access(auth_info: Any, check_template: CheckTemplate) -> None:
+    await on_template_access_hook(auth_info, check_template)
+    if not (await on_template_access_batch_hook([check_template], auth_info))[0]:
+        raise CheckTemplateIdError(check_template.id)
+
+
 async def _get_specific_check_template(
     auth_info: Any, check_template_id: CheckTemplateId
 ) -> CheckTemplate:
@@ -241,10 +422,7 @@ async def _get_specific_check_template(
     async for check_template in check_backend.get_check_templates(
         auth_info, ids=[check_template_id]
     ):
-        if ON_TEMPLATE_ACCESS_HOOK_NAME in loaded_hooks:
-            await call_hooks_ignore_results(
-                loaded_hooks[ON_TEMPLATE_ACCESS_HOOK_NAME], auth_info, check_template
-            )
+        await _check_template_access(auth_info, check_template)
         check_templates.append(check_template)
 
     match check_templates:
@@ -272,10 +450,7 @@ async def get_check_template(
     response: Response,
     check_template_id: CheckTemplateId,
 ) -> APIOKResponse[CheckTemplateAttributes]:
-    if ON_AUTH_HOOK_NAME in loaded_hooks:
-        auth_info = await call_hooks_until_not_none(
-            loaded_hooks[ON_AUTH_HOOK_NAME], auth_info
-        )
+    auth_info = await authenticate(auth_info)
 
     check_template = await _get_specific_check_template(auth_info, check_template_id)
 
@@ -307,6 +482,17 @@ def check_to_resource(check: OutCheck) -> Resource[OutCheckAttributes]:
     )
 
 
+async def _accessible_checks(auth_info: Any, checks: list[OutCheck]) -> list[OutCheck]:
+    allowed = await access_mask(
+        checks,
+        batch_funcs=loaded_hooks.get(ON_CHECK_ACCESS_BATCH_HOOK_NAME),
+        funcs=loaded_hooks.get(ON_CHECK_ACCESS_HOOK_NAME),
+        batch_args=(auth_info,),
+        item_args=lambda check: (auth_info, check),
+    )
+    return [check for check, allow in zip(checks, allowed) if allow]
+
+
 @router.get(
     GET_CHECKS_PATH,
     status_code=status.HTTP_200_OK,
@@ -320,26 +506,48 @@ async def get_checks(
         list[CheckId] | None,
         Query(description="restrict IDs to include"),
     ] = None,
-) -> APIOKResponseList[OutCheckAttributes, None]:
-    if ON_AUTH_HOOK_NAME in loaded_hooks:
-        auth_info = await call_hooks_until_not_none(
-            loaded_hooks[ON_AUTH_HOOK_NAME], auth_info
+    page_size: Annotated[
+        int | None,
+        Query(
+            alias=PAGE_SIZE_QUERY_PARAM,
+            ge=1,
+            le=MAX_PAGE_SIZE,
+            description="maximum number of checks per page",
+        ),
+    ] = None,
+    page_cursor: Annotated[
+        str | None,
+        Query(
+            alias=PAGE_CURSOR_QUERY_PARAM,
+            description="cursor from the next link of the previous page",
+        ),
+    ] = None,
+) -> APIOKResponseList[OutCheckAttributes, ListMeta | None]:
+    auth_info = await authenticate(auth_info)
+
+    backend_errors: list[Error] = []
+    if page_size is None and page_cursor is None:
+        # Leave out the items of the services that fail rather than failing altogether
+        with collect_backend_errors() as backend_errors:
+            checks = [check async for check in check_backend.get_checks(auth_info, ids)]
+        links = Links(self=get_request_url_str(BASE_URL, request), root=BASE_URL)
+    else:
+        page = await check_backend.get_checks_page(
+            auth_info,
+            ids,
+            page_size=page_size or DEFAULT_PAGE_SIZE,
+            cursor=page_cursor,
         )
+        checks = page.items
+        links = get_page_links(BASE_URL, request, page.next_cursor)
 
-    response.headers["Allow"] = "GET,POST"
-    return APIOKResponseList[OutCheckAttributes, None](
-        data=[
-            check_to_resource(check)
-            async for check in check_backend.get_checks(auth_info, ids)
-            if (
-                ON_CHECK_ACCESS_HOOK_NAME not in loaded_hooks
-                or await call_hooks_check_if_allow(
-                    loaded_hooks[ON_CHECK_ACCESS_HOOK_NAME], auth_info, check
-                )
-            )
-        ],
-        links=Links(self=get_request_url_str(BASE_URL, request), root=BASE_URL),
-        meta=None,
+    checks = await _accessible_checks(auth_info, checks)
+
+    response.headers["Allow"] = "GET,POST,PUT"
+    return APIOKResponseList[OutCheckAttributes, ListMeta | None](
+        data=[check_to_resource(check) for check in checks],
+        links=links,
+        meta=ListMeta(errors=backend_errors) if backend_errors else None,
     )
 
 
@@ -354,37 +562,28 @@ async def create_check(
     response: Response,
     in_check: InCheck,
 ) -> APIOKResponse[OutCheckAttributes]:
-    if ON_AUTH_HOOK_NAME in loaded_hooks:
-        auth_info = await call_hooks_until_not_none(
-            loaded_hooks[ON_AUTH_HOOK_NAME], auth_info
-        )
+    auth_info = await authenticate(auth_info)
 
     if hasattr(in_check.data, "id"):
         raise NewCheckClientSpecifiedId()
     assert in_check.data.type == "check"
 
-    if ON_TEMPLATE_ACCESS_HOOK_NAME in loaded_hooks:
-        check_template = await _get_specific_check_template(
+    if (
+        ON_TEMPLATE_ACCESS_HOOK_NAME in loaded_hooks
+        or ON_TEMPLATE_ACCESS_BATCH_HOOK_NAME in loaded_hooks
+    ):
+        # Checks the access to the template too
+        await _get_specific_check_template(
             auth_info, in_check.data.attributes.metadata.template_id
         )
 
-        await call_hooks_ignore_results(
-            loaded_hooks[ON_TEMPLATE_ACCESS_HOOK_NAME], auth_info, check_template
-        )
-
-    if ON_CHECK_CREATE_HOOK_NAME in loaded_hooks:
-        await call_hooks_ignore_results(
-            loaded_hooks[ON_CHECK_CREATE_HOOK_NAME], auth_info, in_check.data.attributes
-        )
+    await on_check_create_hook(auth_info, in_check.data.attributes)
 
     check = await check_backend.create_check(auth_info, in_check.data.attributes)
 
-    if ON_CHECK_ACCESS_HOOK_NAME in loaded_hooks:
-        await call_hooks_ignore_results(
-            loaded_hooks[ON_CHECK_ACCESS_HOOK_NAME], auth_info, check
-        )
+    await _check_access(auth_info, check)
 
-    response.headers["Allow"] = "GET,POST"
+    response.headers["Allow"] = "GET,POST,PUT"
     response.headers["Location"] = check_url(check.id)
     return APIOKResponse[OutCheckAttributes](
         data=check_to_resource(check),
@@ -392,21 +591,16 @@ async def create_check(
     )
 
 
+async def _check_access(auth_info: Any, check: OutCheck) -> None:
+    await on_check_access_hook(auth_info, check)
+    if not (await on_check_access_batch_hook([check], auth_info))[0]:
+        raise CheckIdError(check.id)
+
+
 async def get_check_from_backend(auth_info: Any, check_id: CheckId) -> OutCheck:
-    checks = [
-        check async for check in check_backend.get_checks(auth_info, ids=[check_id])
-    ]
-    match checks:
-        case []:
-            raise CheckIdError(check_id)
-        case [check]:
-            if ON_CHECK_ACCESS_HOOK_NAME in loaded_hooks:
-                await call_hooks_ignore_results(
-                    loaded_hooks[ON_CHECK_ACCESS_HOOK_NAME], auth_info, check
-                )
-            return check
-        case _:
-            raise CheckIdNonUniqueError(f"Check id {check_id} is not unique")
+    check = await check_backend.get_check(auth_info, check_id)
+    await _check_access(auth_info, check)
+    return check
 
 
 @router.get(
@@ -420,14 +614,11 @@ async def get_check(
     response: Response,
     check_id: CheckId,
 ) -> APIOKResponse[OutCheckAttributes]:
-    if ON_AUTH_HOOK_NAME in loaded_hooks:
-        auth_info = await call_hooks_until_not_none(
-            loaded_hooks[ON_AUTH_HOOK_NAME], auth_info
-        )
+    auth_info = await authenticate(auth_info)
 
     check = await get_check_from_backend(auth_info, check_id)
 
-    response.headers["Allow"] = "GET,DELETE"
+    response.headers["Allow"] = "GET,PATCH,DELETE"
     return APIOKResponse[OutCheckAttributes](
         data=check_to_resource(check),
         links=Links(
@@ -437,17 +628,52 @@ async def get_check(
     )
 
 
-# @router.patch(UPDATE_CHECK_PATH, status_code=status.HTTP_200_OK,
-#    response_model_exclude_unset=True)
-# async def update_check(
-#     check_id: Annotated[CheckId, Path()],
-#     template_id: Annotated[CheckTemplateId | None, Body()] = None,
-#     template_args: Annotated[Json | None, Body()] = None,
-#     schedule: Annotated[CronExpression | None, Body()] = None,
-# ) -> Check:
-#     return await check_backend.update_check(
-#         tokens, check_id, template_id, template_args, schedule
-#     )
+async def _prepare_update(
+    auth_info: Any, check: OutCheck, attributes: InCheckUpdateAttributes
+) -> tuple[CheckId, InCheckUpdateAttributes]:
+    if ON_CHECK_UPDATE_HOOK_NAME in loaded_hooks:
+        await on_check_update_hook(
+            auth_info, check, updated_attributes(check, attributes)
+        )
+    return check.id, attributes
+
+
+@router.patch(
+    UPDATE_CHECK_PATH,
+    status_code=status.HTTP_200_OK,
+    response_model_exclude_unset=True,
+)
+async def update_check(
+    auth_info: Annotated[Any, Depends(security_scheme)],
+    response: Response,
+    check_id: Annotated[CheckId, Path()],
+    in_check: InCheckUpdate,
+) -> APIOKResponse[OutCheckAttributes]:
+    """
+    Changes the given attributes of the check, keeping its id. Attributes which are
+    not given are left as they are.
+    """
+    auth_info = await authenticate(auth_info)
+
+    if in_check.data.id != check_id:
+        raise CheckIdMismatchError(
+            f"Check id {in_check.data.id} does not match check id {check_id} of the path"
+        )
+
+    check = await get_check_from_backend(auth_info, check_id)
+    await _prepare_update(auth_info, check, in_check.data.attributes)
+
+    check = await check_backend.update_check(
+        auth_info, check_id, in_check.data.attributes
+    )
+
+    await _check_access(auth_info, check)
+
+    response.headers["Allow"] = "GET,PATCH,DELETE"
+    return APIOKResponse[OutCheckAttributes](
+        data=check_to_resource(check),
+        links=Links(root=BASE_URL),
+    )
 
 
 @router.delete(
@@ -460,19 +686,13 @@ async def remove_check(
     response: Response,
     check_id: Annotated[CheckId, Path()],
 ) -> None:
-    if ON_AUTH_HOOK_NAME in loaded_hooks:
-        auth_info = await call_hooks_until_not_none(
-            loaded_hooks[ON_AUTH_HOOK_NAME], auth_info
-        )
+    auth_info = await authenticate(auth_info)
 
     check = await get_check_from_backend(auth_info, check_id)
 
-    if ON_CHECK_REMOVE_HOOK_NAME in loaded_hooks:
-        await call_hooks_ignore_results(
-            loaded_hooks[ON_CHECK_REMOVE_HOOK_NAME], auth_info, check
-        )
+    await on_check_remove_hook(auth_info, check)
 
-    response.headers["Allow"] = "GET,DELETE"
+    response.headers["Allow"] = "GET,PATCH,DELETE"
     return await check_backend.remove_check(auth_info, check_id)
 
 
@@ -486,22 +706,297 @@ async def run_check(
     response: Response,
     check_id: Annotated[CheckId, Path()],
 ) -> None:
-    if ON_AUTH_HOOK_NAME in loaded_hooks:
-        auth_info = await call_hooks_until_not_none(
-            loaded_hooks[ON_AUTH_HOOK_NAME], auth_info
-        )
+    auth_info = await authenticate(auth_info)
 
     check = await get_check_from_backend(auth_info, check_id)
 
-    if ON_CHECK_RUN_HOOK_NAME in loaded_hooks:
-        await call_hooks_ignore_results(
-            loaded_hooks[ON_CHECK_RUN_HOOK_NAME], auth_info, check
-        )
+    await on_check_run_hook(auth_info, check)
 
     response.headers["Allow"] = "POST"
     return await check_backend.run_check(auth_info, check_id)
 
 
+async def _bulk[T, U](
+    items: list[T],
+    prepare: Callable[[T], Awaitable[U]],
+    operation: Callable[[list[U]], Awaitable[list[Any]]],
+) -> list[Any]:
+    """
+    Prepares each item (checking access and calling the hooks), then runs the backend
+    operation for all items which were prepared successfully. Returns the result or
+    the exception of each item, in order.
+    """
+    results: list[Any] = await gather_each(items, prepare, BULK_CONCURRENCY)
+    indices = [
+        index
+        for index, result in enumerate(results)
+        if not isinstance(result, Exception)
+    ]
+    for index, result in zip(
+        indices, await operation([results[index] for index in indices])
+    ):
+        results[index] = result
+    return results
+
+
+def _check_bulk_size(count: int, max_size: int) -> None:
+    if count > max_size:
+        raise APIUserInputError(
+            title="Too many items",
+            detail=f"At most {max_size} items can be given at once",
+        )
+
+
+def _bulk_meta(results: list[Any]) -> ListMeta | None:
+    errors = [
+        bulk_item_error(index, error)
+        for index, result in enumerate(results)
+        if isinstance(result, Exception)
+        for error in get_status_code_and_errors(result)[1]
+    ]
+    return ListMeta(errors=errors) if errors else None
+
+
+def _bulk_check_identifiers(
+    check_ids: list[CheckId], results: list[Any]
+) -> APIOKResponseList[None, ListMeta | None]:
+    return APIOKResponseList[None, ListMeta | None](
+        data=[
+            Resource[None](
+                id=check_id,
+                type="check",
+                attributes=None,
+                links={"self": check_url(check_id)},
+            )
+            for check_id, result in zip(check_ids, results)
+            if not isinstance(result, Exception)
+        ],
+        links=Links(root=BASE_URL),
+        meta=_bulk_meta(results),
+    )
+
+
+async def _create_checks(auth_info: Any, in_checks: list[InCheckData]) -> list[Any]:
+    """The created check or the exception for each of in_checks, in order"""
+    template_errors: dict[CheckTemplateId, Exception] = {}
+    if (
+        ON_TEMPLATE_ACCESS_HOOK_NAME in loaded_hooks
+        or ON_TEMPLATE_ACCESS_BATCH_HOOK_NAME in loaded_hooks
+    ):
+        # Checks the access to each template only once
+        template_ids = list(
+            {in_check.attributes.metadata.template_id for in_check in in_checks}
+        )
+        for template_id, result in zip(
+            template_ids,
+            await gather_each(
+                template_ids,
+                lambda template_id: _get_specific_check_template(
+                    auth_info, template_id
+                ),
+                BULK_CONCURRENCY,
+            ),
+        ):
+            if isinstance(result, Exception):
+                template_errors[template_id] = result
+
+    async def prepare(in_check: InCheckData) -> InCheckAttributes:
+        if hasattr(in_check, "id"):
+            raise NewCheckClientSpecifiedId()
+        if in_check.attributes.metadata.template_id in template_errors:
+            raise template_errors[in_check.attributes.metadata.template_id]
+        await on_check_create_hook(auth_info, in_check.attributes)
+        return in_check.attributes
+
+    async def create(attributes_list: list[InCheckAttributes]) -> list[Any]:
+        checks = await check_backend.create_checks(auth_info, attributes_list)
+
+        async def check_access(check: OutCheck | Exception) -> OutCheck:
+            if isinstance(check, Exception):
+                raise check
+            await _check_access(auth_info, check)
+            return check
+
+        return await gather_each(checks, check_access, BULK_CONCURRENCY)
+
+    return await _bulk(in_checks, prepare, create)
+
+
+async def _prepare_remove(auth_info: Any, check: OutCheck) -> CheckId:
+    await on_check_remove_hook(auth_info, check)
+    return check.id
+
+
+@router.post(
+    BULK_CREATE_CHECKS_PATH,
+    status_code=status.HTTP_200_OK,
+    response_model_exclude_unset=True,
+)
+async def create_checks(
+    auth_info: Annotated[Any, Depends(security_scheme)],
+    response: Response,
+    in_checks: InChecks,
+) -> APIOKResponseList[OutCheckAttributes, ListMeta | None]:
+    """
+    Creates many checks at once. The created checks are returned in the order given,
+    and the errors of the checks which were not created are in meta, pointing to them.
+    """
+    auth_info = await authenticate(auth_info)
+    _check_bulk_size(len(in_checks.data), MAX_BULK_SIZE)
+
+    results = await _create_checks(auth_info, in_checks.data)
+
+    response.headers["Allow"] = "POST"
+    return APIOKResponseList[OutCheckAttributes, ListMeta | None](
+        data=[
+            check_to_resource(result)
+            for result in results
+            if not isinstance(result, Exception)
+        ],
+        links=Links(root=BASE_URL),
+        meta=_bulk_meta(results),
+    )
+
+
+@router.post(
+    BULK_REMOVE_CHECKS_PATH,
+    status_code=status.HTTP_200_OK,
+    response_model_exclude_unset=True,
+)
+async def remove_checks(
+    auth_info: Annotated[Any, Depends(security_scheme)],
+    response: Response,
+    check_identifiers: CheckIdentifiers,
+) -> APIOKResponseList[None, ListMeta | None]:
+    """
+    Removes many checks at once. The removed checks are returned in the order given,
+    and the errors of the checks which were not removed are in meta, pointing to them.
+    """
+    auth_info = await authenticate(auth_info)
+    _check_bulk_size(len(check_identifiers.data), MAX_BULK_SIZE)
+
+    async def prepare(check_identifier: CheckIdentifier) -> CheckId:
+        return await _prepare_remove(
+            auth_info, await get_check_from_backend(auth_info, check_identifier.id)
+        )
+
+    check_ids = [check_identifier.id for check_identifier in check_identifiers.data]
+    results = await _bulk(
+        check_identifiers.data,
+        prepare,
+        lambda check_ids: check_backend.remove_checks(auth_info, check_ids),
+    )
+
+    response.headers["Allow"] = "POST"
+    return _bulk_check_identifiers(check_ids, results)
+
+
+@router.post(
+    BULK_RUN_CHECKS_PATH,
+    status_code=status.HTTP_200_OK,
+    response_model_exclude_unset=True,
+)
+async def run_checks(
+    auth_info: Annotated[Any, Depends(security_scheme)],
+    response: Response,
+    check_identifiers: CheckIdentifiers,
+) -> APIOKResponseList[None, ListMeta | None]:
+    """
+    Runs many checks at once. The checks which were run are returned in the order given,
+    and the errors of the checks which were not run are in meta, pointing to them.
+    """
+    auth_info = await authenticate(auth_info)
+    _check_bulk_size(len(check_identifiers.data), MAX_BULK_SIZE)
+
+    async def prepare(check_identifier: CheckIdentifier) -> CheckId:
+        check = await get_check_from_backend(auth_info, check_identifier.id)
+        await on_check_run_hook(auth_info, check)
+        return check.id
+
+    check_ids = [check_identifier.id for check_identifier in check_identifiers.data]
+    results = await _bulk(
+        check_identifiers.data,
+        prepare,
+        lambda check_ids: check_backend.run_checks(auth_info, check_ids),
+    )
+
+    response.headers["Allow"] = "POST"
+    return _bulk_check_identifiers(check_ids, results)
+
+
+@router.put(
+    RECONCILE_CHECKS_PATH,
+    status_code=status.HTTP_200_OK,
+    response_model_exclude_unset=True,
+)
+async def reconcile_checks(
+    auth_info: Annotated[Any, Depends(security_scheme)],
+    response: Response,
+    in_checks: InChecks,
+) -> APIOKResponseList[OutCheckAttributes, ReconcileMeta]:
+    """
+    Makes the checks with a client key be the given ones, matching them by client key.
+    Only the checks which differ are created, updated or removed. Checks without a
+    client key are left as they are. The resulting checks are returned in the order
+    given, and the errors of the given checks are in meta, pointing to them.
+    """
+    auth_info = await authenticate(auth_info)
+    _check_bulk_size(len(in_checks.data), MAX_RECONCILE_SIZE)
+
+    # Any error when listing is raised, as reconciling against a partial list would
+    # create duplicates of the checks that were left out
+    current = await _accessible_checks(
+        auth_info, [check async for check in check_backend.get_checks(auth_info)]
+    )
+    desired = [in_check.attributes for in_check in in_checks.data]
+    result = await apply_reconcile(
+        desired,
+        plan_reconcile(desired, current),
+        create_checks=lambda attributes_list: _create_checks(
+            auth_info,
+            [InCheckData(attributes=attributes) for attributes in attributes_list],
+        ),
+        update_checks=lambda updates: _bulk(
+            updates,
+            lambda update: _prepare_update(auth_info, update[0], update[1]),
+            lambda check_updates: check_backend.update_checks(auth_info, check_updates),
+        ),
+        remove_checks=lambda checks: _bulk(
+            checks,
+            lambda check: _prepare_remove(auth_info, check),
+            lambda check_ids: check_backend.remove_checks(auth_info, check_ids),
+        ),
+    )
+
+    errors = _bulk_meta(result.checks)
+    response.headers["Allow"] = "GET,POST,PUT"
+    return APIOKResponseList[OutCheckAttributes, ReconcileMeta](
+        data=[
+            check_to_resource(check)
+            for check in result.checks
+            if not isinstance(check, Exception)
+        ],
+        links=Links(root=BASE_URL),
+        meta=ReconcileMeta(
+            created=result.created,
+            updated=result.updated,
+            unchanged=result.unchanged,
+            removed=[
+                check.id for check, exception in result.removed if exception is None
+            ],
+            errors=(errors.errors if errors else [])
+            + [
+                error.model_copy(
+                    update={"meta": {**(error.meta or {}), "check_id": check.id}}
+                )
+                for check, exception in result.removed
+                if exception is not None
+                for error in get_status_code_and_errors(exception)[1]
+            ],
+        ),
+    )
+
+
 app.include_router(router)
 
 set_custom_json_schema(app, "Check Manager API", "v1")
@@ -516,7 +1011,7 @@ def uvicorn_dev() -> None:
 
     global check_backend
     if environ.get("BACKEND") == "REST":
-        check_backend = RestBackend("http://127.0.0.1:8000/")
+        check_backend = _configure_backend(RestBackend("http://127.0.0.1:8000/"))
 
     import uvicorn
 
@@ -551,11 +1046,13 @@ def uvicorn_k8s() -> None:
 
     global check_backend
 
-    check_backend = K8sBackend[Any](
-        template_dirs=[templates_path],
-        hooks=loaded_hooks,
-        # load_authentication(Settings().auth_hooks),
-        # load_authentication(pathlib.Path("hooks/hooks.py")),
+    check_backend = _configure_backend(
+        K8sBackend[Any](
+            template_dirs=[templates_path],
+            hooks=loaded_hooks.hooks,
+            # load_authentication(Settings().auth_hooks),
+            # load_authentication(pathlib.Path("hooks/hooks.py")),
+        )
     )
 
     import uvicorn
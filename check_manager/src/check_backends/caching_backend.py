@@ -0,0 +1,189 @@
+from typing import AsyncIterable, Callable, Self, Sequence, TypeVar, override
+
+from cache_utils import TTLCache, credentials_cache_key, digest
+from check_backends.check_backend import (
+    CheckBackend,
+    CheckId,
+    CheckIdError,
+    CheckTemplate,
+    CheckTemplateId,
+    InCheckAttributes,
+    InCheckUpdateAttributes,
+    OutCheck,
+    collected_backend_error_count,
+)
+
+AuthenticationObject = TypeVar("AuthenticationObject")
+
+
+class CachingBackend(CheckBackend[AuthenticationObject]):
+    """
+    Caches the check templates and checks listed by another backend, separately for
+    each authentication object (and requested ids), for ttl_seconds or until the JWTs
+    in the authentication object expire. Nothing is cached for authentication objects
+    which credentials_cache_key can't tell apart. At most max_size listings of each
+    are kept. Creating, updating or removing a check through this
+    backend drops all cached checks, as other users may see the same checks. Changes
+    made to the checks in other ways are seen only once the cached listings expire.
+    """
+
+    def __init__(
+        self: Self,
+        backend: CheckBackend[AuthenticationObject],
+        *,
+        ttl_seconds: float = 30,
+        max_size: int = 1024,
+    ) -> None:
+        self._backend = backend
+        self._templates: TTLCache[str, list[CheckTemplate]] = TTLCache(
+            max_size=max_size, ttl_seconds=ttl_seconds
+        )
+        self._checks: TTLCache[str, list[OutCheck]] = TTLCache(
+            max_size=max_size, ttl_seconds=ttl_seconds
+        )
+
+    @staticmethod
+    def _cache_key(
+        auth_obj: AuthenticationObject, ids: Sequence[str] | None
+    ) -> tuple[str, float | None] | None:
+        credentials_key = credentials_cache_key(auth_obj)
+        if credentials_key is None:
+            return None
+        credentials_digest, expires_at = credentials_key
+        return digest([credentials_digest, ids]), expires_at
+
+    @staticmethod
+    async def _cached_list[T](
+        cache: TTLCache[str, list[T]],
+        key: tuple[str, float | None] | None,
+        get_items: Callable[[], AsyncIterable[T]],
+    ) -> list[T]:
+        if key is None:
+            return [item async for item in get_items()]
+        items = cache.get(key[0])
+        if items is not None:
+            return items
+        error_count = collected_backend_error_count()
+        items = [item async for item in get_items()]
+        # Don't cache lists missing the items of failed services (see AggregationBackend)
+        if collected_backend_error_count() == error_count:
+            cache.set(key[0], items, expires_at=key[1])
+        return items
+
+    @override
+    async def aclose(self: Self) -> None:
+        await self._backend.aclose()
+
+    @override
+    async def get_check_templates(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        ids: list[CheckTemplateId] | None = None,
+    ) -> AsyncIterable[CheckTemplate]:
+        for template in await self._cached_list(
+            self._templates,
+            self._cache_key(auth_obj, ids),
+            lambda: self._backend.get_check_templates(auth_obj, ids),
+        ):
+            yield template
+
+    @override
+    async def create_check(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        attributes: InCheckAttributes,
+    ) -> OutCheck:
+        try:
+            return await self._backend.create_check(auth_obj, attributes)
+        finally:
+            self._checks.clear()
+
+    @override
+    async def update_check(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        check_id: CheckId,
+        attributes: InCheckUpdateAttributes,
+    ) -> OutCheck:
+        try:
+            return await self._backend.update_check(auth_obj, check_id, attributes)
+        finally:
+            self._checks.clear()
+
+    @override
+    async def remove_check(
+        self: Self, auth_obj: AuthenticationObject, check_id: CheckId
+    ) -> None:
+        try:
+            await self._backend.remove_check(auth_obj, check_id)
+        finally:
+            self._checks.clear()
+
+    @override
+    async def get_checks(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        ids: list[CheckId] | None = None,
+    ) -> AsyncIterable[OutCheck]:
+        for check in await self._cached_list(
+            self._checks,
+            self._cache_key(auth_obj, ids),
+            lambda: self._backend.get_checks(auth_obj, ids),
+        ):
+            yield check
+
+    @override
+    async def get_check(
+        self: Self, auth_obj: AuthenticationObject, check_id: CheckId
+    ) -> OutCheck:
+        key = self._cache_key(auth_obj, None)
+        checks = None if key is None else self._checks.get(key[0])
+        if checks is None:
+            return await self._backend.get_check(auth_obj, check_id)
+        for check in checks:
+            if check.id == check_id:
+                return check
+        raise CheckIdError(check_id)
+
+    @override
+    async def run_check(
+        self: Self, auth_obj: AuthenticationObject, check_id: CheckId
+    ) -> None:
+        await self._backend.run_check(auth_obj, check_id)
+
+    @override
+    async def create_checks(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        attributes_list: list[InCheckAttributes],
+    ) -> list[OutCheck | Exception]:
+        try:
+            return await self._backend.create_checks(auth_obj, attributes_list)
+        finally:
+            self._checks.clear()
+
+    @override
+    async def update_checks(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        updates: list[tuple[CheckId, InCheckUpdateAttributes]],
+    ) -> list[OutCheck | Exception]:
+        try:
+            return await self._backend.update_checks(auth_obj, updates)
+        finally:
+            self._checks.clear()
+
+    @override
+    async def remove_checks(
+        self: Self, auth_obj: AuthenticationObject, check_ids: list[CheckId]
+    ) -> list[None | Exception]:
+        try:
+            return await self._backend.remove_checks(auth_obj, check_ids)
+        finally:
+            self._checks.clear()
+
+    @override
+    async def run_checks(
+        self: Self, auth_obj: AuthenticationObject, check_ids: list[CheckId]
+    ) -> list[None | Exception]:
+        return await self._backend.run_checks(auth_obj, check_ids)
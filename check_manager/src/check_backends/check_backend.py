@@ -1,9 +1,17 @@
 from abc import ABC, abstractmethod
 import asyncio
+from contextlib import aclosing, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+import os
 from types import TracebackType
 from typing import (
+    AsyncGenerator,
     AsyncIterable,
+    Awaitable,
+    Callable,
     Generic,
+    Iterator,
     TypeVar,
     Literal,
     NewType,
@@ -11,14 +19,28 @@ from typing import (
     Type,
     override,
 )
-from pydantic import BaseModel, TypeAdapter
+from jsonschema.exceptions import best_match
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from referencing.jsonschema import Schema
 
-from exceptions import APIException
-from eoepca_api_utils.json_api_types import Json
+from cache_utils import TTLCache
+from exceptions import APIException, CheckBackendTimeoutError
+from eoepca_api_utils.api_utils import (
+    decode_cursor,
+    encode_cursor,
+    invalid_cursor_error,
+)
+from eoepca_api_utils.exceptions import APIUserInputError, get_status_code_and_errors
+from eoepca_api_utils.json_api_types import Error, Json
 
 AuthenticationObject = TypeVar("AuthenticationObject")
 
+# How many items of a bulk request are handled at the same time, both by the API (when
+# calling the hooks) and by the default implementations of the bulk operations
+BULK_CONCURRENCY: int = int(os.environ.get("RH_CHECK_BULK_CONCURRENCY") or "16")
+
 CronExpression = NewType("CronExpression", str)
 CheckTemplateId = NewType("CheckTemplateId", str)
 CheckId = NewType("CheckId", str)
@@ -66,6 +88,23 @@ class CheckTemplate(BaseModel):
     attributes: CheckTemplateAttributes
 
 
+def make_arguments_validator(schema: Schema) -> Validator:
+    """
+    Checks the schema of the template arguments and makes a validator for it, so
+    arguments can be validated repeatedly without checking the schema again.
+    """
+    validator_class = validator_for(schema)
+    validator_class.check_schema(schema)  # type: ignore
+    return validator_class(schema)
+
+
+def validate_arguments(validator: Validator, template_args: Json) -> None:
+    """Same as jsonschema.validate, with a validator made by make_arguments_validator"""
+    error = best_match(validator.iter_errors(template_args))
+    if error is not None:
+        raise error
+
+
 class InCheckMetadata(BaseModel):
     # SHOULD have name and description
     name: str
@@ -73,6 +112,8 @@ class InCheckMetadata(BaseModel):
     # MAY have template_id and template_args
     template_id: CheckTemplateId
     template_args: Json
+    # Key chosen by the client to match the check when reconciling the checks
+    client_key: str | None = None
 
 
 class OutCheckMetadata(BaseModel, extra="allow"):
@@ -82,6 +123,7 @@ class OutCheckMetadata(BaseModel, extra="allow"):
     # MAY have template_id and template_args
     template_id: CheckTemplateId | None = None
     template_args: Json | None = None
+    client_key: str | None = None
 
 
 class InCheckAttributes(BaseModel):
@@ -106,6 +148,20 @@ class OutCheckAttributes(BaseModel):
     ## NOTE: For now the above can just be a set of equality conditions on Span/Resource attributes
 
 
+class InCheckUpdateMetadata(BaseModel):
+    name: str | None = None
+    description: str | None = None
+    template_id: CheckTemplateId | None = None
+    template_args: Json | None = None
+    client_key: str | None = None
+
+
+class InCheckUpdateAttributes(BaseModel):
+    # Only the fields which are set are changed
+    metadata: InCheckUpdateMetadata = InCheckUpdateMetadata()
+    schedule: CronExpression | None = None
+
+
 class InCheckData(BaseModel):
     type: str = "check"
     attributes: InCheckAttributes
@@ -120,6 +176,162 @@ class InCheck(BaseModel):
     data: InCheckData
 
 
+class InCheckUpdateData(BaseModel):
+    type: str = "check"
+    id: CheckId
+    attributes: InCheckUpdateAttributes
+
+
+class InCheckUpdate(BaseModel):
+    data: InCheckUpdateData
+
+
+def updated_attributes(
+    check: OutCheck, update: InCheckUpdateAttributes
+) -> InCheckAttributes:
+    """The attributes of the check after changing the fields set in the update"""
+    metadata = check.attributes.metadata.model_dump(
+        include=set(InCheckMetadata.model_fields)
+    )
+    metadata.update(update.metadata.model_dump(exclude_unset=True))
+    try:
+        in_metadata = InCheckMetadata.model_validate(metadata)
+    except ValidationError as e:
+        # Such as checks which were not created through the API
+        raise APIUserInputError(
+            title="Check metadata is incomplete",
+            detail=f"Check {check.id} is missing "
+            + ", ".join(str(error["loc"][0]) for error in e.errors())
+            + ", so it must be given",
+        )
+    return InCheckAttributes(
+        metadata=in_metadata,
+        schedule=(
+            update.schedule
+            if update.schedule is not None
+            else check.attributes.schedule
+        ),
+    )
+
+
+class InChecks(BaseModel):
+    data: list[InCheckData]
+
+
+class CheckIdentifier(BaseModel):
+    type: str = "check"
+    id: CheckId
+
+
+class CheckIdentifiers(BaseModel):
+    data: list[CheckIdentifier]
+
+
+class Page[T](BaseModel):
+    items: list[T]
+    # Opaque cursor to pass when getting the next page, None on the last page
+    next_cursor: str | None = None
+
+
+async def offset_page[T](
+    items: AsyncIterable[T], page_size: int, cursor: str | None
+) -> Page[T]:
+    """
+    Pages through items by skipping the items of the earlier pages.
+    Backends which can continue a listing from where the previous page ended
+    should do that instead.
+    """
+    offset = 0
+    if cursor is not None:
+        offset = decode_cursor(cursor, int)
+        if offset < 0:
+            raise invalid_cursor_error(cursor)
+    page_items: list[T] = []
+    has_more = False
+    iterator = aiter(items)
+    try:
+        index = 0
+        async for item in iterator:
+            if index >= offset + page_size:
+                has_more = True
+                break
+            if index >= offset:
+                page_items.append(item)
+            index += 1
+    finally:
+        # Release the resources of the listing (such as connections) right away
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
+    return Page[T](
+        items=page_items,
+        next_cursor=encode_cursor(offset + page_size) if has_more else None,
+    )
+
+
+class ListMeta(BaseModel):
+    # Errors of the services whose items are missing from the list
+    errors: list[Error]
+
+
+_backend_errors: ContextVar[list[Error] | None] = ContextVar(
+    "backend_errors", default=None
+)
+
+
+@contextmanager
+def collect_backend_errors() -> Iterator[list[Error]]:
+    """
+    Within this context, backends combining several services leave out the items of
+    the services which fail when listing, and add their errors to the returned list,
+    instead of failing the whole listing.
+    """
+    errors: list[Error] = []
+    token = _backend_errors.set(errors)
+    try:
+        yield errors
+    finally:
+        _backend_errors.reset(token)
+
+
+def report_backend_errors(errors: list[Error]) -> bool:
+    """
+    Adds the errors to the ones being collected by collect_backend_errors.
+    Returns False if they aren't being collected.
+    """
+    collected = _backend_errors.get()
+    if collected is None:
+        return False
+    collected.extend(errors)
+    return True
+
+
+def collected_backend_error_count() -> int:
+    """How many errors collect_backend_errors has collected so far, 0 if none"""
+    collected = _backend_errors.get()
+    return 0 if collected is None else len(collected)
+
+
+async def gather_each[T, R](
+    items: list[T],
+    func: Callable[[T], Awaitable[R]],
+    max_concurrency: int = BULK_CONCURRENCY,
+) -> list[R | Exception]:
+    """
+    Calls func for each item, for up to max_concurrency items at the same time, and
+    returns the result or the exception raised for each item, in order.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def call(item: T) -> R | Exception:
+        async with semaphore:
+            try:
+                return await func(item)
+            except Exception as e:
+                return e
+
+    return await asyncio.gather(*(call(item) for item in items))
+
+
 # Inherit from this class and implement the abstract methods for each new backend
 class CheckBackend(ABC, Generic[AuthenticationObject]):
     # Close connections, release resources and such
@@ -140,6 +352,19 @@ class CheckBackend(ABC, Generic[AuthenticationObject]):
         if False:
             yield
 
+    # At most page_size templates, continuing from the cursor returned with the previous page
+    async def get_check_templates_page(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        ids: list[CheckTemplateId] | None = None,
+        *,
+        page_size: int,
+        cursor: str | None = None,
+    ) -> Page[CheckTemplate]:
+        return await offset_page(
+            self.get_check_templates(auth_obj, ids), page_size, cursor
+        )
+
     # Raise CheckIdError if template_id doesn't exist.
     # Otherwise don't use that error code
     @abstractmethod
@@ -150,18 +375,16 @@ class CheckBackend(ABC, Generic[AuthenticationObject]):
     ) -> OutCheck:
         pass
 
-    # # Raise CheckIdError if check_id doesn't exist.
-    # # Otherwise don't use that error code
-    # @abstractmethod
-    # async def update_check(
-    #     self: Self,
-    #     auth_obj: AuthenticationObject,
-    #     check_id: CheckId,
-    #     template_id: CheckTemplateId | None = None,
-    #     template_args: Json | None = None,
-    #     schedule: CronExpression | None = None,
-    # ) -> Check:
-    #     pass
+    # Raise CheckIdError if check_id doesn't exist.
+    # Otherwise don't use that error code
+    @abstractmethod
+    async def update_check(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        check_id: CheckId,
+        attributes: InCheckUpdateAttributes,
+    ) -> OutCheck:
+        pass
 
     # Raise CheckIdError if check_id doesn't exist.
     # Otherwise don't use that error code
@@ -183,6 +406,25 @@ class CheckBackend(ABC, Generic[AuthenticationObject]):
         if False:
             yield
 
+    # At most page_size checks, continuing from the cursor returned with the previous page
+    async def get_checks_page(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        ids: list[CheckId] | None = None,
+        *,
+        page_size: int,
+        cursor: str | None = None,
+    ) -> Page[OutCheck]:
+        return await offset_page(self.get_checks(auth_obj, ids), page_size, cursor)
+
+    # Raise CheckIdError if check_id doesn't exist.
+    # Otherwise don't use that error code
+    @abstractmethod
+    async def get_check(
+        self: Self, auth_obj: AuthenticationObject, check_id: CheckId
+    ) -> OutCheck:
+        pass
+
     # Raise CheckIdError if check_id doesn't exist.
     # Otherwise don't use that error code
     @abstractmethod
@@ -191,10 +433,161 @@ class CheckBackend(ABC, Generic[AuthenticationObject]):
     ) -> None:
         pass
 
+    # The bulk operations below return the result of each item, or the exception which
+    # would have been raised for it by the single item operation, in order.
+    # Override them if the backend can handle many checks at once more efficiently.
+    async def create_checks(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        attributes_list: list[InCheckAttributes],
+    ) -> list[OutCheck | Exception]:
+        return await gather_each(
+            attributes_list,
+            lambda attributes: self.create_check(auth_obj, attributes),
+        )
+
+    async def update_checks(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        updates: list[tuple[CheckId, InCheckUpdateAttributes]],
+    ) -> list[OutCheck | Exception]:
+        return await gather_each(
+            updates,
+            lambda update: self.update_check(auth_obj, update[0], update[1]),
+        )
+
+    async def remove_checks(
+        self: Self, auth_obj: AuthenticationObject, check_ids: list[CheckId]
+    ) -> list[None | Exception]:
+        return await gather_each(
+            check_ids, lambda check_id: self.remove_check(auth_obj, check_id)
+        )
+
+    async def run_checks(
+        self: Self, auth_obj: AuthenticationObject, check_ids: list[CheckId]
+    ) -> list[None | Exception]:
+        return await gather_each(
+            check_ids, lambda check_id: self.run_check(auth_obj, check_id)
+        )
+
+
+@dataclass
+class _StreamEnd:
+    index: int
+    exception: Exception | None
+
 
 class AggregationBackend(CheckBackend[AuthenticationObject]):
-    def __init__(self, backends: list[CheckBackend]) -> None:
+    def __init__(
+        self,
+        backends: list[CheckBackend],
+        *,
+        timeout_seconds: float | None = None,
+        max_index_size: int = 10000,
+    ) -> None:
+        """
+        Lists the items of all backends at the same time, waiting at most timeout_seconds
+        (no limit if None) for each backend.
+        Remembers which backend has which check and check template (up to max_index_size
+        of each), so that operations on a single check go only to the backend that has it.
+        """
         self._backends = backends
+        self._timeout_seconds = timeout_seconds
+        # Index of the backend that has the check or template with the given id
+        self._check_owners: TTLCache[str, int] = TTLCache(
+            max_size=max_index_size, ttl_seconds=None
+        )
+        self._template_owners: TTLCache[str, int] = TTLCache(
+            max_size=max_index_size, ttl_seconds=None
+        )
+
+    def _owners(self: Self, item: CheckTemplate | OutCheck) -> TTLCache[str, int]:
+        return (
+            self._template_owners
+            if isinstance(item, CheckTemplate)
+            else self._check_owners
+        )
+
+    async def _merge[T: (
+        CheckTemplate,
+        OutCheck,
+    )](
+        self: Self, get_items: Callable[[CheckBackend], AsyncIterable[T]]
+    ) -> AsyncGenerator[T, None]:
+        """
+        Yields the items of all backends in the order they arrive. If a backend fails or
+        times out, its error is reported if errors are being collected (see
+        collect_backend_errors) and the items of the other backends are still yielded,
+        unless all backends fail. Otherwise the error is raised.
+        """
+        queue: asyncio.Queue[T | _StreamEnd] = asyncio.Queue()
+
+        async def pump(index: int, items: AsyncIterable[T]) -> None:
+            try:
+                async with asyncio.timeout(self._timeout_seconds):
+                    async for item in items:
+                        self._owners(item).set(item.id, index)
+                        queue.put_nowait(item)
+            except TimeoutError:
+                queue.put_nowait(_StreamEnd(index, CheckBackendTimeoutError()))
+            except Exception as e:
+                queue.put_nowait(_StreamEnd(index, e))
+            else:
+                queue.put_nowait(_StreamEnd(index, None))
+            finally:
+                # Release the resources of the listing (such as connections) right away
+                if hasattr(items, "aclose"):
+                    await items.aclose()
+
+        tasks = [
+            asyncio.create_task(pump(index, get_items(backend)))
+            for index, backend in enumerate(self._backends)
+        ]
+        failures: list[_StreamEnd] = []
+        try:
+            remaining = len(tasks)
+            while remaining > 0:
+                item = await queue.get()
+                if not isinstance(item, _StreamEnd):
+                    yield item
+                    continue
+                remaining -= 1
+                if item.exception is None:
+                    continue
+                if _backend_errors.get() is None:
+                    raise item.exception
+                failures.append(item)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        self._report_failures(failures)
+
+    def _report_failures(self: Self, failures: list[_StreamEnd]) -> None:
+        """
+        Reports the errors of the failed backends with the index of each backend, or
+        raises the first error if all backends failed
+        """
+        if failures and len(failures) == len(self._backends):
+            assert failures[0].exception is not None
+            raise failures[0].exception
+        for failure in failures:
+            assert failure.exception is not None
+            _, errors = get_status_code_and_errors(failure.exception)
+            report_backend_errors(
+                [
+                    error.model_copy(
+                        update={
+                            "meta": {
+                                **(error.meta or {}),
+                                "service_index": failure.index,
+                            }
+                        }
+                    )
+                    for error in errors
+                ]
+            )
 
     @staticmethod
     def _process_results[T](
@@ -226,6 +619,59 @@ class AggregationBackend(CheckBackend[AuthenticationObject]):
                 # match any list, for example
                 assert False
 
+    async def _merge_pages[T: (
+        CheckTemplate,
+        OutCheck,
+    )](
+        self: Self,
+        get_page: Callable[[CheckBackend, int, str | None], Awaitable[Page[T]]],
+        page_size: int,
+        cursor: str | None,
+    ) -> Page[T]:
+        # The cursor is the index of the backend to continue from and its own cursor
+        index, backend_cursor = (
+            decode_cursor(cursor, tuple[int, str | None])
+            if cursor is not None
+            else (0, None)
+        )
+        if index < 0 and cursor is not None:
+            raise invalid_cursor_error(cursor)
+        items: list[T] = []
+        failures: list[_StreamEnd] = []
+        while index < len(self._backends) and len(items) < page_size:
+            try:
+                async with asyncio.timeout(self._timeout_seconds):
+                    page = await get_page(
+                        self._backends[index], page_size - len(items), backend_cursor
+                    )
+            except Exception as e:
+                # Like _merge, the failed backend is reported and the page continues
+                # with the next one
+                exception = (
+                    CheckBackendTimeoutError() if isinstance(e, TimeoutError) else e
+                )
+                if _backend_errors.get() is None:
+                    raise exception
+                failures.append(_StreamEnd(index, exception))
+                index, backend_cursor = index + 1, None
+                continue
+            for item in page.items:
+                self._owners(item).set(item.id, index)
+            items.extend(page.items)
+            if page.next_cursor is None:
+                index, backend_cursor = index + 1, None
+            else:
+                backend_cursor = page.next_cursor
+        self._report_failures(failures)
+        return Page[T](
+            items=items,
+            next_cursor=(
+                encode_cursor([index, backend_cursor])
+                if index < len(self._backends)
+                else None
+            ),
+        )
+
     @override
     async def aclose(self: Self) -> None:
         await asyncio.gather(*(backend.aclose() for backend in self._backends))
@@ -236,18 +682,128 @@ class AggregationBackend(CheckBackend[AuthenticationObject]):
         auth_obj: AuthenticationObject,
         ids: list[CheckTemplateId] | None = None,
     ) -> AsyncIterable[CheckTemplate]:
-        for backend in self._backends:
-            async for template in backend.get_check_templates(auth_obj, ids):
+        async with aclosing(
+            self._merge(lambda backend: backend.get_check_templates(auth_obj, ids))
+        ) as templates:
+            async for template in templates:
                 yield template
 
+    @override
+    async def get_check_templates_page(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        ids: list[CheckTemplateId] | None = None,
+        *,
+        page_size: int,
+        cursor: str | None = None,
+    ) -> Page[CheckTemplate]:
+        return await self._merge_pages(
+            lambda backend, page_size, cursor: backend.get_check_templates_page(
+                auth_obj, ids, page_size=page_size, cursor=cursor
+            ),
+            page_size,
+            cursor,
+        )
+
+    async def _template_owner(
+        self: Self, auth_obj: AuthenticationObject, template_id: CheckTemplateId
+    ) -> int:
+        index = self._template_owners.get(template_id)
+        if index is not None:
+            return index
+        results = await asyncio.gather(
+            *(
+                self._list(backend.get_check_templates(auth_obj, [template_id]))
+                for backend in self._backends
+            ),
+            return_exceptions=True,
+        )
+        owners = [
+            index
+            for index, result in enumerate(results)
+            if isinstance(result, list) and result
+        ]
+        if not owners:
+            if all(isinstance(result, BaseException) for result in results):
+                # No backend could tell, and creating the check would fail the same way
+                assert isinstance(results[0], BaseException)
+                raise results[0]
+            # Let the first backend report that the template doesn't exist
+            return 0
+        self._template_owners.set(template_id, owners[0])
+        return owners[0]
+
+    @staticmethod
+    async def _list[T](items: AsyncIterable[T]) -> list[T]:
+        return [item async for item in items]
+
+    async def _call_check_owner[T](
+        self: Self,
+        check_id: CheckId,
+        call: Callable[[CheckBackend], Awaitable[T]],
+    ) -> T:
+        """
+        Calls the backend which has the check, if known, otherwise all backends and
+        returns the result of the backend which has the check.
+        """
+        index = self._check_owners.get(check_id)
+        stale_error: CheckIdError | None = None
+        if index is not None:
+            try:
+                return await call(self._backends[index])
+            except CheckIdError as e:
+                # The check has been removed or the index is out of date, so only the
+                # other backends are asked
+                self._check_owners.pop(check_id)
+                stale_error = e
+
+        indices = [
+            other
+            for other in range(len(self._backends))
+            if stale_error is None or other != index
+        ]
+        results: list[T | BaseException] = list(
+            await asyncio.gather(
+                *(call(self._backends[other]) for other in indices),
+                return_exceptions=True,
+            )
+        )
+        owners = [
+            other
+            for other, result in zip(indices, results)
+            if not isinstance(result, BaseException)
+        ]
+        if len(owners) == 1:
+            self._check_owners.set(check_id, owners[0])
+        if stale_error is not None:
+            results.append(stale_error)
+        return AggregationBackend._process_results(
+            results, f"Check id {check_id} exists in multiple backends"
+        )
+
     @override
     async def create_check(
         self: Self, auth_obj: AuthenticationObject, attributes: InCheckAttributes
     ) -> OutCheck:
-        index: int = TypeAdapter(int).validate_python(
-            attributes.metadata.template_args.pop("service_index", 0)
+        # service_index may still be given to choose the backend explicitly. The
+        # attributes are copied without it, as they belong to the caller
+        template_args = dict(attributes.metadata.template_args)
+        service_index = template_args.pop("service_index", None)
+        attributes = attributes.model_copy(
+            update={
+                "metadata": attributes.metadata.model_copy(
+                    update={"template_args": template_args}
+                )
+            }
+        )
+        index: int = (
+            TypeAdapter(int).validate_python(service_index)
+            if service_index is not None
+            else await self._template_owner(auth_obj, attributes.metadata.template_id)
         )
-        return await self._backends[index].create_check(auth_obj, attributes)
+        check = await self._backends[index].create_check(auth_obj, attributes)
+        self._check_owners.set(check.id, index)
+        return check
         # results = await asyncio.gather(
         #     *(
         #         backend.new_check(auth_obj, template_id, template_args, schedule)
@@ -259,39 +815,26 @@ class AggregationBackend(CheckBackend[AuthenticationObject]):
         #     results, f"Check template id {template_id} exists in multiple backends"
         # )
 
-    # @override
-    # async def update_check(
-    #     self: Self,
-    #     auth_obj: AuthenticationObject,
-    #     check_id: CheckId,
-    #     template_id: CheckTemplateId | None = None,
-    #     template_args: Json | None = None,
-    #     schedule: CronExpression | None = None,
-    # ) -> Check:
-    #     results = await asyncio.gather(
-    #         *(
-    #             backend.update_check(
-    #                 auth_obj, check_id, template_id, template_args, schedule
-    #             )
-    #             for backend in self._backends
-    #         ),
-    #         return_exceptions=True,
-    #     )
-    #     return AggregationBackend._process_results(
-    #         results, f"Check id {check_id} exists in multiple backends"
-    #     )
+    @override
+    async def update_check(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        check_id: CheckId,
+        attributes: InCheckUpdateAttributes,
+    ) -> OutCheck:
+        return await self._call_check_owner(
+            check_id,
+            lambda backend: backend.update_check(auth_obj, check_id, attributes),
+        )
 
     @override
     async def remove_check(
         self: Self, auth_obj: AuthenticationObject, check_id: CheckId
     ) -> None:
-        results = await asyncio.gather(
-            *(backend.remove_check(auth_obj, check_id) for backend in self._backends),
-            return_exceptions=True,
-        )
-        return AggregationBackend._process_results(
-            results, f"Check id {check_id} exists in multiple backends"
+        await self._call_check_owner(
+            check_id, lambda backend: backend.remove_check(auth_obj, check_id)
         )
+        self._check_owners.pop(check_id)
 
     @override
     async def get_checks(
@@ -299,20 +842,43 @@ class AggregationBackend(CheckBackend[AuthenticationObject]):
         auth_obj: AuthenticationObject,
         ids: list[CheckId] | None = None,
     ) -> AsyncIterable[OutCheck]:
-        for backend in self._backends:
-            async for check in backend.get_checks(auth_obj, ids):
+        async with aclosing(
+            self._merge(lambda backend: backend.get_checks(auth_obj, ids))
+        ) as checks:
+            async for check in checks:
                 yield check
 
+    @override
+    async def get_checks_page(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        ids: list[CheckId] | None = None,
+        *,
+        page_size: int,
+        cursor: str | None = None,
+    ) -> Page[OutCheck]:
+        return await self._merge_pages(
+            lambda backend, page_size, cursor: backend.get_checks_page(
+                auth_obj, ids, page_size=page_size, cursor=cursor
+            ),
+            page_size,
+            cursor,
+        )
+
+    @override
+    async def get_check(
+        self: Self, auth_obj: AuthenticationObject, check_id: CheckId
+    ) -> OutCheck:
+        return await self._call_check_owner(
+            check_id, lambda backend: backend.get_check(auth_obj, check_id)
+        )
+
     @override
     async def run_check(
         self: Self, auth_obj: AuthenticationObject, check_id: CheckId
     ) -> None:
-        results = await asyncio.gather(
-            *(backend.run_check(auth_obj, check_id) for backend in self._backends),
-            return_exceptions=True,
-        )
-        return AggregationBackend._process_results(
-            results, f"Check id {check_id} exists in multiple backends"
+        return await self._call_check_owner(
+            check_id, lambda backend: backend.run_check(auth_obj, check_id)
         )
 
 
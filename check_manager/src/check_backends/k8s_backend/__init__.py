@@ -1,20 +1,29 @@
+import asyncio
+from contextlib import contextmanager
+import json
 import logging
 import re
-from typing import AsyncIterable, Callable, Self, override
+from typing import Any, AsyncIterable, Callable, Iterable, Iterator, Self, override
 import uuid
 import os
 
-from jsonschema import validate
 import aiohttp
 from kubernetes_asyncio import client  # , config
 from kubernetes_asyncio.client.api_client import ApiClient
+from kubernetes_asyncio.client.configuration import Configuration
 from kubernetes_asyncio.client.rest import ApiException
 from kubernetes_asyncio.client.models.v1_cron_job import V1CronJob
+from kubernetes_asyncio.client.models.v1_cron_job_list import V1CronJobList
 from kubernetes_asyncio.client.models.v1_job import V1Job
 from kubernetes_asyncio.client.models.v1_object_meta import V1ObjectMeta
 from kubernetes_asyncio.client.models.v1_owner_reference import V1OwnerReference
 
 from plugin_utils.runner import call_hooks_until_not_none, call_hooks_ignore_results
+from eoepca_api_utils.api_utils import (
+    decode_cursor,
+    encode_cursor,
+    invalid_cursor_error,
+)
 from eoepca_api_utils.exceptions import APIInternalError
 from check_backends.check_backend import (
     AuthenticationObject,
@@ -25,17 +34,32 @@ from check_backends.check_backend import (
     CheckTemplateId,
     CheckTemplateIdError,
     InCheckAttributes,
+    InCheckUpdateAttributes,
     OutCheck,
+    Page,
+    report_backend_errors,
+    updated_attributes,
+)
+from check_backends.k8s_backend.client_pool import ApiClientPool, credential_expiry
+from check_backends.k8s_backend.cronjob_cache import (
+    CronjobCache,
+    CronjobInformer,
+    InvalidCronjob,
 )
 from check_backends.k8s_backend.templates import (
+    INVALID_CRONJOB_ERRORS,
     CronjobMaker,
     load_templates,
     default_make_check,
+    json_make_check,
+    metadata_annotations,
 )
-from check_hooks import call_hooks_check_if_allow
+from check_hooks import access_mask, call_batch_hooks_check_if_allow
+from cache_utils import TTLCache, credentials_cache_key
 from exceptions import (
     CheckConnectionError,
     CronExpressionValidationError,
+    PageCursorExpiredError,
 )
 
 NAMESPACE: str = "resource-health"
@@ -59,6 +83,40 @@ cron_pattern = " ".join(
 )
 
 
+def _auth_cache_key(auth_obj: Any) -> str | None:
+    """
+    The key of the results cached per user, or None if the authentication object
+    can't be told apart from others reliably, in which case nothing is cached
+    """
+    key = credentials_cache_key(auth_obj)
+    return None if key is None else key[0]
+
+
+def report_invalid_cronjob(name: str | None, e: Exception) -> None:
+    """
+    Reports a cron job which can't be made into a check with report_backend_errors,
+    so that listings leave it out rather than fail
+    """
+    logger.error(f"Cron job {name} is not a valid check: {e!r}")
+    report_backend_errors(
+        [APIInternalError(f"Cron job {name} is not a valid check").error]
+    )
+
+
+def json_make_checks(cronjobs: Iterable[dict[str, Any]]) -> list[OutCheck]:
+    """
+    The checks of the cron jobs as JSON. Cron jobs which can't be made into checks are
+    left out and reported with report_invalid_cronjob.
+    """
+    checks: list[OutCheck] = []
+    for cronjob in cronjobs:
+        try:
+            checks.append(json_make_check(cronjob))
+        except INVALID_CRONJOB_ERRORS as e:
+            report_invalid_cronjob((cronjob.get("metadata") or {}).get("name"), e)
+    return checks
+
+
 def validate_kubernetes_cron(cron_expr: str) -> None:
     if not re.match(cron_pattern, cron_expr):
         raise CronExpressionValidationError(
@@ -84,20 +142,61 @@ def job_from(cronjob: V1CronJob):
     )
 
 
+# Kubernetes label values: at most 63 characters, alphanumeric at both ends
+label_value_pattern = re.compile(r"(([A-Za-z0-9][-A-Za-z0-9_.]{0,61})?[A-Za-z0-9])?")
+
+TEMPLATE_ID_LABEL: str = "resource-health.eoepca.org/template-id"
+
+
+def is_valid_label_value(value: str) -> bool:
+    return label_value_pattern.fullmatch(value) is not None
+
+
+def field_selector_value(value: str) -> str:
+    # Escaped so that the value can't add further requirements to the selector
+    return value.replace("\\", "\\\\").replace(",", "\\,").replace("=", "\\=")
+
+
+def label_selector_from(labels: dict[str, str]) -> str:
+    # An empty selector matches everything
+    return ",".join(f"{key}={value}" for key, value in sorted(labels.items()))
+
+
+def has_labels(cronjob: V1CronJob, labels: dict[str, str]) -> bool:
+    cronjob_labels = (cronjob.metadata and cronjob.metadata.labels) or {}
+    return all(cronjob_labels.get(key) == value for key, value in labels.items())
+
+
 GET_K8S_CONFIG_HOOK_NAME = (
     os.environ.get("RH_CHECK_GET_K8S_CONFIG_HOOK_NAME") or "get_k8s_config"
 )
 GET_K8S_NAMESPACE_HOOK_NAME = (
     os.environ.get("RH_CHECK_GET_K8S_NAMESPACE_HOOK_NAME") or "get_k8s_namespace"
 )
+GET_K8S_CRONJOB_LABELS_HOOK_NAME = (
+    os.environ.get("RH_CHECK_GET_K8S_CRONJOB_LABELS_HOOK_NAME")
+    or "get_k8s_cronjob_labels"
+)
 ON_K8S_CRONJOB_ACCESS_HOOK_NAME = (
     os.environ.get("RH_CHECK_ON_K8S_CRONJOB_ACCESS_HOOK_NAME")
     or "on_k8s_cronjob_access"
 )
+# Takes the authentication object, the client and a list of cron jobs, and returns
+# whether each cron job is accessible
+ON_K8S_CRONJOB_ACCESS_BATCH_HOOK_NAME = (
+    os.environ.get("RH_CHECK_ON_K8S_CRONJOB_ACCESS_BATCH_HOOK_NAME")
+    or "on_k8s_cronjob_access_batch"
+)
 ON_K8S_CRONJOB_CREATE_HOOK_NAME = (
     os.environ.get("RH_CHECK_ON_K8S_CRONJOB_CREATE_HOOK_NAME")
     or "on_k8s_cronjob_create"
 )
+# Takes the authentication object, the client, the cron job and the strategic merge
+# patch about to be applied to it
+ON_K8S_CRONJOB_UPDATE_HOOK_NAME = (
+    os.environ.get("RH_CHECK_ON_K8S_CRONJOB_UPDATE_HOOK_NAME")
+    or "on_k8s_cronjob_update"
+)
 ON_K8S_CRONJOB_REMOVE_HOOK_NAME = (
     os.environ.get("RH_CHECK_ON_K8S_CRONJOB_REMOVE_HOOK_NAME")
     or "on_k8s_cronjob_remove"
@@ -106,19 +205,169 @@ ON_K8S_CRONJOB_RUN_HOOK_NAME = (
     os.environ.get("RH_CHECK_ON_K8S_CRONJOB_RUN_HOOK_NAME") or "on_k8s_cronjob_run"
 )
 
+# Serve check listings from an in-memory copy of the cronjobs kept up to date by
+# watching the cluster, instead of listing the namespace on every request. There is
+# one watch per cluster credentials, namespace and labels, so when the users have
+# their own credentials, set the maximum number of watches to at least the number of
+# users active at the same time, or the watches keep being stopped and started again.
+CRONJOB_CACHE_ENABLED: bool = (
+    os.environ.get("RH_CHECK_K8S_CRONJOB_CACHE") or "false"
+).lower() in ("1", "true", "yes")
+CRONJOB_CACHE_MAX_INFORMERS: int = int(
+    os.environ.get("RH_CHECK_K8S_CRONJOB_CACHE_MAX_INFORMERS") or "32"
+)
+CRONJOB_CACHE_WATCH_TIMEOUT_SECONDS: int = int(
+    os.environ.get("RH_CHECK_K8S_CRONJOB_CACHE_WATCH_TIMEOUT_SECONDS") or "300"
+)
+
+# Results of the get_k8s_config, get_k8s_namespace and get_k8s_cronjob_labels hooks
+# are reused for the same authentication object until the TTL passes or the bearer
+# token in the configuration is about to expire. Set the TTL to 0 to call the hooks
+# on every request.
+K8S_CONFIG_CACHE_TTL_SECONDS: float = float(
+    os.environ.get("RH_CHECK_K8S_CONFIG_CACHE_TTL_SECONDS") or "60"
+)
+K8S_CONFIG_CACHE_MAX_SIZE: int = int(
+    os.environ.get("RH_CHECK_K8S_CONFIG_CACHE_SIZE") or "1024"
+)
+K8S_CONFIG_CACHE_EXPIRY_MARGIN_SECONDS: float = 30
+
+# Cron jobs are listed in pages of at most this many, so that checks are yielded as
+# each page arrives rather than after the whole namespace has been read. Set to 0 to
+# list everything in one request.
+LIST_PAGE_SIZE: int = int(os.environ.get("RH_CHECK_K8S_LIST_PAGE_SIZE") or "500")
+
+# Checks asked for by id are looked up by name, one request per id made at the same
+# time, when there are at most this many ids. For more ids, the cron jobs are listed
+# as when getting all checks and only the asked for ones are kept.
+ID_FIELD_SELECTOR_MAX_IDS: int = int(
+    os.environ.get("RH_CHECK_K8S_ID_FIELD_SELECTOR_MAX_IDS") or "16"
+)
+
+CLIENT_POOL_MAX_SIZE: int = int(os.environ.get("RH_CHECK_K8S_CLIENT_POOL_SIZE") or "16")
+CLIENT_POOL_IDLE_TIMEOUT_SECONDS: float = float(
+    os.environ.get("RH_CHECK_K8S_CLIENT_IDLE_TIMEOUT_SECONDS") or "300"
+)
+
 
 class K8sBackend(CheckBackend[AuthenticationObject]):
     def __init__(
         self: Self,
         template_dirs: list[str],
         hooks: dict[str, list[Callable]],
+        cronjob_cache: bool = CRONJOB_CACHE_ENABLED,
     ) -> None:
         self._templates: dict[str, CronjobMaker] = load_templates(template_dirs)
         self._hooks = hooks
+        self._k8s_config_cache: TTLCache[str, tuple[Configuration, str]] = TTLCache(
+            max_size=K8S_CONFIG_CACHE_MAX_SIZE,
+            ttl_seconds=K8S_CONFIG_CACHE_TTL_SECONDS,
+        )
+        self._k8s_labels_cache: TTLCache[str, dict[str, str]] = TTLCache(
+            max_size=K8S_CONFIG_CACHE_MAX_SIZE,
+            ttl_seconds=K8S_CONFIG_CACHE_TTL_SECONDS,
+        )
+        self._client_pool = ApiClientPool(
+            max_size=CLIENT_POOL_MAX_SIZE,
+            idle_timeout_seconds=CLIENT_POOL_IDLE_TIMEOUT_SECONDS,
+        )
+        self._cronjob_cache: CronjobCache | None = (
+            CronjobCache(
+                self._make_check,
+                max_informers=CRONJOB_CACHE_MAX_INFORMERS,
+                watch_timeout_seconds=CRONJOB_CACHE_WATCH_TIMEOUT_SECONDS,
+            )
+            if cronjob_cache
+            else None
+        )
 
     @override
     async def aclose(self: Self) -> None:
-        pass
+        if self._cronjob_cache is not None:
+            await self._cronjob_cache.aclose()
+        await self._client_pool.aclose()
+
+    async def _k8s_config_and_namespace(
+        self: Self, auth_obj: AuthenticationObject
+    ) -> tuple[Configuration, str]:
+        key = _auth_cache_key(auth_obj)
+        if key is not None:
+            cached = self._k8s_config_cache.get(key)
+            if cached is not None:
+                return cached
+
+        if GET_K8S_CONFIG_HOOK_NAME not in self._hooks:
+            raise ValueError(
+                f"Must set hook {GET_K8S_CONFIG_HOOK_NAME} ($RH_CHECK_GET_K8S_CONFIG) when using the k8s backend"
+            )
+
+        if GET_K8S_NAMESPACE_HOOK_NAME not in self._hooks:
+            raise ValueError(
+                f"Must set hook {GET_K8S_NAMESPACE_HOOK_NAME} ($RH_CHECK_GET_K8S_NAMESPACE_HOOK_NAME) when using the k8s backend"
+            )
+
+        configuration = await call_hooks_until_not_none(
+            self._hooks[GET_K8S_CONFIG_HOOK_NAME], auth_obj
+        )
+        namespace = await call_hooks_until_not_none(
+            self._hooks[GET_K8S_NAMESPACE_HOOK_NAME], auth_obj
+        )
+
+        if key is not None:
+            expires_at = credential_expiry(configuration)
+            if expires_at is not None:
+                expires_at -= K8S_CONFIG_CACHE_EXPIRY_MARGIN_SECONDS
+            self._k8s_config_cache.set(
+                key, (configuration, namespace), expires_at=expires_at
+            )
+        return configuration, namespace
+
+    async def _k8s_cronjob_labels(
+        self: Self, auth_obj: AuthenticationObject
+    ) -> dict[str, str]:
+        """
+        Labels which the cronjobs visible to the user must have. They are added to the
+        cronjobs created by the user and passed to the cluster as a label selector
+        when listing, so that the cluster only returns the cronjobs of the user.
+        """
+        if GET_K8S_CRONJOB_LABELS_HOOK_NAME not in self._hooks:
+            return {}
+
+        key = _auth_cache_key(auth_obj)
+        labels = None if key is None else self._k8s_labels_cache.get(key)
+        if labels is None:
+            labels = (
+                await call_hooks_until_not_none(
+                    self._hooks[GET_K8S_CRONJOB_LABELS_HOOK_NAME], auth_obj
+                )
+                or {}
+            )
+            for value in labels.values():
+                if not is_valid_label_value(value):
+                    raise ValueError(
+                        f"Hook {GET_K8S_CRONJOB_LABELS_HOOK_NAME} returned invalid label value '{value}'"
+                    )
+            if key is not None:
+                self._k8s_labels_cache.set(key, labels)
+        return labels
+
+    def _forget_k8s_config_if_unauthorized(
+        self: Self, auth_obj: AuthenticationObject, e: ApiException
+    ) -> None:
+        # The credentials might have expired or been revoked, fetch them anew next time
+        key = _auth_cache_key(auth_obj)
+        if e.status == 401 and key is not None:
+            self._k8s_config_cache.pop(key)
+
+    def _make_check(self: Self, cronjob: V1CronJob) -> OutCheck:
+        template_id: str | None = None
+        if cronjob.metadata and cronjob.metadata.annotations:
+            template_id = cronjob.metadata.annotations.get("template_id")
+        template = self._templates.get(template_id or "")
+        if template is not None:
+            return template.make_check(cronjob)
+        else:
+            return default_make_check(cronjob)
 
     @override
     async def get_check_templates(
@@ -143,22 +392,8 @@ class K8sBackend(CheckBackend[AuthenticationObject]):
         auth_obj: AuthenticationObject,
         attributes: InCheckAttributes,
     ) -> OutCheck:
-        if GET_K8S_CONFIG_HOOK_NAME not in self._hooks:
-            raise ValueError(
-                f"Must set hook {GET_K8S_CONFIG_HOOK_NAME} ($RH_CHECK_GET_K8S_CONFIG) when using the k8s backend"
-            )
-
-        if GET_K8S_NAMESPACE_HOOK_NAME not in self._hooks:
-            raise ValueError(
-                f"Must set hook {GET_K8S_NAMESPACE_HOOK_NAME} ($RH_CHECK_GET_K8S_NAMESPACE_HOOK_NAME) when using the k8s backend"
-            )
-
-        configuration = await call_hooks_until_not_none(
-            self._hooks[GET_K8S_CONFIG_HOOK_NAME], auth_obj
-        )
-        namespace = await call_hooks_until_not_none(
-            self._hooks[GET_K8S_NAMESPACE_HOOK_NAME], auth_obj
-        )
+        configuration, namespace = await self._k8s_config_and_namespace(auth_obj)
+        labels = await self._k8s_cronjob_labels(auth_obj)
 
         template_id = attributes.metadata.template_id
         template = self._templates.get(template_id)
@@ -166,19 +401,20 @@ class K8sBackend(CheckBackend[AuthenticationObject]):
         if template is None:
             raise CheckTemplateIdError(template_id)
 
-        check_template = template.get_check_template()
-        validate(
-            attributes.metadata.template_args,
-            check_template.attributes.arguments,
-        )
+        template.validate_template_args(attributes.metadata.template_args)
         validate_kubernetes_cron(attributes.schedule)
 
-        async with ApiClient(configuration) as api_client:
+        async with self._client_pool.client(configuration) as api_client:
             cronjob = template.make_cronjob(
                 metadata=attributes.metadata,
                 schedule=attributes.schedule,
                 userinfo=auth_obj,
             )
+            if cronjob.metadata.labels is None:
+                cronjob.metadata.labels = {}
+            if is_valid_label_value(template_id):
+                cronjob.metadata.labels[TEMPLATE_ID_LABEL] = template_id
+            cronjob.metadata.labels.update(labels)
 
             if ON_K8S_CRONJOB_CREATE_HOOK_NAME in self._hooks:
                 await call_hooks_ignore_results(
@@ -196,6 +432,7 @@ class K8sBackend(CheckBackend[AuthenticationObject]):
                 )
                 logger.info(f"Succesfully created new cron job: {api_response}")
             except ApiException as e:
+                self._forget_k8s_config_if_unauthorized(auth_obj, e)
                 logger.error(f"Failed to create new cron job: {e}")
                 if e.status == 422:
                     raise APIInternalError("Unprocessable content")
@@ -204,95 +441,185 @@ class K8sBackend(CheckBackend[AuthenticationObject]):
                 logger.error(f"Failed to create new cron job: {e}")
                 raise CheckConnectionError("Cannot connect to cluster")
             check = template.make_check(api_response)
-        return check
 
-    # @override
-    # async def update_check(
-    #     self: Self,
-    #     auth_obj: AuthenticationObject,
-    #     check_id: CheckId,
-    #     template_id: CheckTemplateId | None = None,
-    #     template_args: Json | None = None,
-    #     schedule: CronExpression | None = None,
-    # ) -> Check:
-    #     script = None
-    #     requirements = None
-    #     if template_args is not None:
-    #         if template_id is not None:
-    #             check_template = self._get_check_template(template_id)
-    #             validate(template_args, check_template.arguments)
-    #         script = TypeAdapter(str | None).validate_python(
-    #             template_args.get("script")
-    #         )
-    #         requirements = TypeAdapter(str | None).validate_python(
-    #             template_args.get("requirements")
-    #         )
-    #     await load_config()
-    #     async with self._api_client() as api_client:
-    #         api_instance = client.BatchV1Api(api_client)
-    #         try:
-    #             api_response = await api_instance.patch_namespaced_cron_job(
-    #                 name=check_id,
-    #                 namespace=NAMESPACE,
-    #                 body=make_cronjob(
-    #                     name=check_id,
-    #                     schedule=schedule,
-    #                     script=script,
-    #                     requirements=requirements,
-    #                 ),
-    #             )
-    #             logger.info(f"Succesfully patched cron job: {api_response}")
-    #         except ApiException as e:
-    #             logger.error(f"Failed to patch cron job: {e}")
-    #             if e.status == 422:
-    #                 raise CheckInternalError(f"Unprocessable content")
-    #             raise e
-    #         except aiohttp.ClientConnectionError as e:
-    #             logger.error(f"Failed to patch cron job: {e}")
-    #             raise CheckConnectionError("Cannot connect to cluster")
-    #         check = self._make_check(api_response)
-    #     return check
+        if self._cronjob_cache is not None and has_labels(api_response, labels):
+            informer = self._cronjob_cache.peek(
+                configuration, namespace, label_selector_from(labels)
+            )
+            if informer is not None:
+                informer.upsert(api_response)
+        return check
 
-    @override
-    async def remove_check(
+    def _cronjob_patch(
         self: Self,
         auth_obj: AuthenticationObject,
-        check_id: CheckId,
-    ) -> None:
-        if GET_K8S_CONFIG_HOOK_NAME not in self._hooks:
-            raise ValueError(
-                f"Must set hook {GET_K8S_CONFIG_HOOK_NAME} ($RH_CHECK_GET_K8S_CONFIG) when using the k8s backend"
-            )
+        api_client: ApiClient,
+        cronjob: V1CronJob,
+        attributes: InCheckUpdateAttributes,
+    ) -> dict[str, Any]:
+        """
+        Strategic merge patch changing the cron job as the update asks. The job
+        template is rendered anew only when the template, its arguments or the name of
+        the check change; otherwise only the schedule and annotations are patched.
+        """
+        check = self._make_check(cronjob)
+        new_attributes = updated_attributes(check, attributes)
+        new_metadata = new_attributes.metadata
+        metadata = check.attributes.metadata
 
-        if GET_K8S_NAMESPACE_HOOK_NAME not in self._hooks:
-            raise ValueError(
-                f"Must set hook {GET_K8S_NAMESPACE_HOOK_NAME} ($RH_CHECK_GET_K8S_NAMESPACE_HOOK_NAME) when using the k8s backend"
+        template_id = new_metadata.template_id
+        template = self._templates.get(template_id)
+        if template is None:
+            raise CheckTemplateIdError(template_id)
+
+        spec: dict[str, Any] = {}
+        if new_attributes.schedule != check.attributes.schedule:
+            validate_kubernetes_cron(new_attributes.schedule)
+            spec["schedule"] = new_attributes.schedule
+
+        annotations: dict[str, str | None] = dict(metadata_annotations(new_metadata))
+        labels: dict[str, str | None] = {}
+        if (
+            new_metadata.template_id != metadata.template_id
+            or new_metadata.template_args != metadata.template_args
+            or new_metadata.name != metadata.name
+        ):
+            template.validate_template_args(new_metadata.template_args)
+            rendered = template.make_cronjob(
+                metadata=new_metadata,
+                schedule=new_attributes.schedule,
+                userinfo=auth_obj,
+                check_id=check.id,
+            )
+            # Replace rather than merge, so that what the template no longer renders
+            # is dropped from the job
+            spec["jobTemplate"] = {
+                "$patch": "replace",
+                **api_client.sanitize_for_serialization(rendered.spec.job_template),
+            }
+            annotations.update(rendered.metadata.annotations or {})
+            labels.update(rendered.metadata.labels or {})
+        if new_metadata.template_id != metadata.template_id:
+            # A null value removes the label
+            labels[TEMPLATE_ID_LABEL] = (
+                template_id if is_valid_label_value(template_id) else None
             )
 
-        configuration = await call_hooks_until_not_none(
-            self._hooks[GET_K8S_CONFIG_HOOK_NAME], auth_obj
-        )
-        namespace = await call_hooks_until_not_none(
-            self._hooks[GET_K8S_NAMESPACE_HOOK_NAME], auth_obj
-        )
+        current_annotations = cronjob.metadata.annotations or {}
+        if new_metadata.client_key is None and "client_key" in current_annotations:
+            annotations["client_key"] = None
+        current_labels = cronjob.metadata.labels or {}
+        metadata_patch = {
+            "annotations": {
+                key: value
+                for key, value in annotations.items()
+                if current_annotations.get(key) != value
+            },
+            "labels": {
+                key: value
+                for key, value in labels.items()
+                if current_labels.get(key) != value
+            },
+        }
+
+        patch: dict[str, Any] = {}
+        if spec:
+            patch["spec"] = spec
+        metadata_patch = {key: value for key, value in metadata_patch.items() if value}
+        if metadata_patch:
+            patch["metadata"] = metadata_patch
+        return patch
+
+    @override
+    async def update_check(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        check_id: CheckId,
+        attributes: InCheckUpdateAttributes,
+    ) -> OutCheck:
+        configuration, namespace = await self._k8s_config_and_namespace(auth_obj)
+        labels = await self._k8s_cronjob_labels(auth_obj)
 
-        async with ApiClient(configuration) as api_client:
+        async with self._client_pool.client(configuration) as api_client:
             api_instance = client.BatchV1Api(api_client)
             try:
                 cronjob = await api_instance.read_namespaced_cron_job(
                     name=check_id,
                     namespace=namespace,
                 )
+                if not has_labels(cronjob, labels):
+                    raise CheckIdError(check_id)
+
+                await self._ensure_accessible(auth_obj, api_client, check_id, cronjob)
 
-                if ON_K8S_CRONJOB_ACCESS_HOOK_NAME in self._hooks:
+                patch = self._cronjob_patch(auth_obj, api_client, cronjob, attributes)
+                if not patch:
+                    return self._make_check(cronjob)
+
+                if ON_K8S_CRONJOB_UPDATE_HOOK_NAME in self._hooks:
                     await call_hooks_ignore_results(
-                        self._hooks[ON_K8S_CRONJOB_ACCESS_HOOK_NAME],
+                        self._hooks[ON_K8S_CRONJOB_UPDATE_HOOK_NAME],
                         auth_obj,
-                        check_id,
                         api_client,
                         cronjob,
+                        patch,
                     )
 
+                if cronjob.metadata.resource_version is not None:
+                    # Fails with a conflict if the cron job changed since it was read
+                    patch["metadata"] = {
+                        **patch.get("metadata", {}),
+                        "resourceVersion": cronjob.metadata.resource_version,
+                    }
+                api_response = await api_instance.patch_namespaced_cron_job(
+                    name=check_id,
+                    namespace=namespace,
+                    body=patch,
+                )
+                logger.info(f"Succesfully patched cron job: {api_response}")
+            except aiohttp.ClientConnectionError as e:
+                logger.error(f"Failed to patch cron job: {e}")
+                raise CheckConnectionError("Cannot connect to cluster")
+            except ApiException as e:
+                self._forget_k8s_config_if_unauthorized(auth_obj, e)
+                logger.info(f"Failed to patch check with id '{check_id}': {e}")
+                if e.status == 404:
+                    raise CheckIdError(check_id)
+                elif e.status == 422:
+                    raise APIInternalError("Unprocessable content")
+                else:
+                    raise e
+            check = self._make_check(api_response)
+
+        if self._cronjob_cache is not None:
+            informer = self._cronjob_cache.peek(
+                configuration, namespace, label_selector_from(labels)
+            )
+            if informer is not None:
+                informer.upsert(api_response)
+        return check
+
+    @override
+    async def remove_check(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        check_id: CheckId,
+    ) -> None:
+        configuration, namespace = await self._k8s_config_and_namespace(auth_obj)
+        labels = await self._k8s_cronjob_labels(auth_obj)
+
+        async with self._client_pool.client(configuration) as api_client:
+            api_instance = client.BatchV1Api(api_client)
+            try:
+                cronjob = await api_instance.read_namespaced_cron_job(
+                    name=check_id,
+                    namespace=namespace,
+                )
+                if not has_labels(cronjob, labels):
+                    raise CheckIdError(check_id)
+
+                await self._ensure_accessible(auth_obj, api_client, check_id, cronjob)
+
                 if ON_K8S_CRONJOB_REMOVE_HOOK_NAME in self._hooks:
                     await call_hooks_ignore_results(
                         self._hooks[ON_K8S_CRONJOB_REMOVE_HOOK_NAME],
@@ -310,70 +637,437 @@ class K8sBackend(CheckBackend[AuthenticationObject]):
                 logger.error(f"Failed to delete cron job: {e}")
                 raise CheckConnectionError("Cannot connect to cluster")
             except ApiException as e:
+                self._forget_k8s_config_if_unauthorized(auth_obj, e)
                 logger.info(f"Failed to delete check with id '{check_id}': {e}")
                 if e.status == 404:
                     raise CheckIdError(check_id)
                 else:
                     raise e
+
+        if self._cronjob_cache is not None:
+            informer = self._cronjob_cache.peek(
+                configuration, namespace, label_selector_from(labels)
+            )
+            if informer is not None:
+                informer.remove(check_id)
         return None
 
+    async def _ensure_accessible(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        api_client: ApiClient,
+        check_id: CheckId,
+        cronjob: V1CronJob,
+    ) -> None:
+        """Raises the exception from the access hooks if the cron job is not accessible"""
+        if ON_K8S_CRONJOB_ACCESS_HOOK_NAME in self._hooks:
+            await call_hooks_ignore_results(
+                self._hooks[ON_K8S_CRONJOB_ACCESS_HOOK_NAME],
+                auth_obj,
+                check_id,
+                api_client,
+                cronjob,
+            )
+        if (
+            ON_K8S_CRONJOB_ACCESS_BATCH_HOOK_NAME in self._hooks
+            and not (
+                await call_batch_hooks_check_if_allow(
+                    self._hooks[ON_K8S_CRONJOB_ACCESS_BATCH_HOOK_NAME],
+                    [cronjob],
+                    auth_obj,
+                    api_client,
+                )
+            )[0]
+        ):
+            raise CheckIdError(check_id)
+
+    async def _accessible_mask(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        api_client: ApiClient,
+        cronjobs: list[V1CronJob],
+    ) -> list[bool]:
+        """Whether the user may access each of the cron jobs"""
+        return await access_mask(
+            cronjobs,
+            batch_funcs=self._hooks.get(ON_K8S_CRONJOB_ACCESS_BATCH_HOOK_NAME),
+            funcs=self._hooks.get(ON_K8S_CRONJOB_ACCESS_HOOK_NAME),
+            batch_args=(auth_obj, api_client),
+            item_args=lambda cronjob: (
+                auth_obj,
+                CheckId(cronjob.metadata.name),
+                api_client,
+                cronjob,
+            ),
+        )
+
+    async def _report_invalid_cronjobs(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        api_client: ApiClient,
+        invalid_cronjobs: list[InvalidCronjob],
+    ) -> None:
+        """Reports the invalid cron jobs the user may access, like listings do"""
+        if not invalid_cronjobs:
+            return
+        allowed = await self._accessible_mask(
+            auth_obj, api_client, [invalid.cronjob for invalid in invalid_cronjobs]
+        )
+        for invalid, allow in zip(invalid_cronjobs, allowed):
+            if allow:
+                report_invalid_cronjob(invalid.cronjob.metadata.name, invalid.error)
+
+    async def _informer(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        configuration: Configuration,
+        namespace: str,
+        label_selector: str,
+    ) -> CronjobInformer:
+        assert self._cronjob_cache is not None
+        try:
+            return await self._cronjob_cache.informer(
+                configuration, namespace, label_selector
+            )
+        except ApiException as e:
+            self._forget_k8s_config_if_unauthorized(auth_obj, e)
+            logger.error(f"Failed to list cron jobs: {e}")
+            raise e
+        except aiohttp.ClientConnectionError as e:
+            logger.error(f"Failed to list cron jobs: {e}")
+            raise CheckConnectionError("Cannot connect to cluster")
+
     @override
     async def get_checks(
         self: Self,
         auth_obj: AuthenticationObject,
         ids: list[CheckId] | None = None,
     ) -> AsyncIterable[OutCheck]:
-        if GET_K8S_CONFIG_HOOK_NAME not in self._hooks:
-            raise ValueError(
-                f"Must set hook {GET_K8S_CONFIG_HOOK_NAME} ($RH_CHECK_GET_K8S_CONFIG) when using the k8s backend"
+        configuration, namespace = await self._k8s_config_and_namespace(auth_obj)
+        label_selector = label_selector_from(await self._k8s_cronjob_labels(auth_obj))
+
+        if self._cronjob_cache is not None:
+            informer = await self._informer(
+                auth_obj, configuration, namespace, label_selector
             )
+            cached_cronjobs = informer.list(ids)
+            async with self._client_pool.client(configuration) as api_client:
+                allowed = await self._accessible_mask(
+                    auth_obj, api_client, [cached.cronjob for cached in cached_cronjobs]
+                )
+                await self._report_invalid_cronjobs(
+                    auth_obj, api_client, informer.list_invalid(ids)
+                )
+            for cached, allow in zip(cached_cronjobs, allowed):
+                if allow:
+                    yield cached.check
+            return
 
-        if GET_K8S_NAMESPACE_HOOK_NAME not in self._hooks:
-            raise ValueError(
-                f"Must set hook {GET_K8S_NAMESPACE_HOOK_NAME} ($RH_CHECK_GET_K8S_NAMESPACE_HOOK_NAME) when using the k8s backend"
+        async with self._client_pool.client(configuration) as api_client:
+            if ids is not None and len(ids) <= ID_FIELD_SELECTOR_MAX_IDS:
+                # Let the cluster find each of the few cron jobs by name rather than
+                # reading through the whole namespace
+                for checks, _ in await asyncio.gather(
+                    *(
+                        self._list_checks_page(
+                            auth_obj,
+                            api_client,
+                            namespace,
+                            label_selector,
+                            [check_id],
+                            0,
+                            "",
+                            field_selector="metadata.name="
+                            + field_selector_value(check_id),
+                        )
+                        for check_id in dict.fromkeys(ids)
+                    )
+                ):
+                    for check in checks:
+                        yield check
+                return
+
+            continue_token: str | None = ""
+            while continue_token is not None:
+                checks, continue_token = await self._list_checks_page(
+                    auth_obj,
+                    api_client,
+                    namespace,
+                    label_selector,
+                    ids,
+                    LIST_PAGE_SIZE,
+                    continue_token,
+                )
+                for check in checks:
+                    yield check
+
+    @override
+    async def get_checks_page(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        ids: list[CheckId] | None = None,
+        *,
+        page_size: int,
+        cursor: str | None = None,
+    ) -> Page[OutCheck]:
+        configuration, namespace = await self._k8s_config_and_namespace(auth_obj)
+        label_selector = label_selector_from(await self._k8s_cronjob_labels(auth_obj))
+        checks: list[OutCheck] = []
+
+        if self._cronjob_cache is not None:
+            # The cursor is the last check id of the previous page, cron jobs are
+            # ordered by name like when listing them from the cluster
+            last_id = decode_cursor(cursor, str) if cursor is not None else ""
+            informer = await self._informer(
+                auth_obj, configuration, namespace, label_selector
+            )
+            cached_cronjobs = sorted(
+                (cached for cached in informer.list(ids) if cached.check.id > last_id),
+                key=lambda cached: cached.check.id,
+            )
+            # Check just enough cron jobs at a time to fill the page
+            examined = 0
+            async with self._client_pool.client(configuration) as api_client:
+                while len(checks) < page_size and examined < len(cached_cronjobs):
+                    chunk = cached_cronjobs[
+                        examined : examined + page_size - len(checks)
+                    ]
+                    allowed = await self._accessible_mask(
+                        auth_obj, api_client, [cached.cronjob for cached in chunk]
+                    )
+                    checks.extend(
+                        cached.check for cached, allow in zip(chunk, allowed) if allow
+                    )
+                    examined += len(chunk)
+                last_examined_id = (
+                    cached_cronjobs[examined - 1].check.id
+                    if examined < len(cached_cronjobs)
+                    else None
+                )
+                # Reported on the page the cron jobs would have been listed in
+                await self._report_invalid_cronjobs(
+                    auth_obj,
+                    api_client,
+                    [
+                        invalid
+                        for invalid in informer.list_invalid(ids)
+                        if last_id < invalid.cronjob.metadata.name
+                        and (
+                            last_examined_id is None
+                            or invalid.cronjob.metadata.name <= last_examined_id
+                        )
+                    ],
+                )
+            return Page[OutCheck](
+                items=checks,
+                next_cursor=(
+                    encode_cursor(last_examined_id)
+                    if last_examined_id is not None
+                    else None
+                ),
             )
 
-        configuration = await call_hooks_until_not_none(
-            self._hooks[GET_K8S_CONFIG_HOOK_NAME], auth_obj
+        # The cursor holds the continue token of the cluster, so that cursors look the
+        # same with and without the cron job cache
+        continue_token = decode_cursor(cursor, str) if cursor is not None else ""
+        async with self._client_pool.client(configuration) as api_client:
+            try:
+                checks, next_continue_token = await self._list_checks_page(
+                    auth_obj,
+                    api_client,
+                    namespace,
+                    label_selector,
+                    ids,
+                    page_size,
+                    continue_token,
+                )
+            except ApiException as e:
+                if e.status == 410:
+                    raise PageCursorExpiredError()
+                if e.status == 400 and cursor is not None:
+                    # The cluster rejects continue tokens it didn't make
+                    raise invalid_cursor_error(cursor)
+                raise e
+        return Page[OutCheck](
+            items=checks,
+            next_cursor=(
+                encode_cursor(next_continue_token)
+                if next_continue_token is not None
+                else None
+            ),
         )
-        namespace = await call_hooks_until_not_none(
-            self._hooks[GET_K8S_NAMESPACE_HOOK_NAME], auth_obj
+
+    async def _list_checks_page(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        api_client: ApiClient,
+        namespace: str,
+        label_selector: str,
+        ids: list[CheckId] | None,
+        limit: int,
+        continue_token: str,
+        field_selector: str = "",
+    ) -> tuple[list[OutCheck], str | None]:
+        """The accessible checks of a page of cron jobs, and the token of the next page"""
+        api_instance = client.BatchV1Api(api_client)
+        id_set = set(ids) if ids is not None else None
+        if (
+            ON_K8S_CRONJOB_ACCESS_HOOK_NAME not in self._hooks
+            and ON_K8S_CRONJOB_ACCESS_BATCH_HOOK_NAME not in self._hooks
+        ):
+            # Nothing needs the cron jobs as models, so only the fields of the checks
+            # are read from the JSON instead of deserializing everything
+            cronjob_list = await self._list_cronjob_page_json(
+                auth_obj,
+                api_instance,
+                namespace,
+                label_selector,
+                limit,
+                continue_token,
+                field_selector,
+            )
+            return (
+                json_make_checks(
+                    cronjob
+                    for cronjob in cronjob_list.get("items") or []
+                    if id_set is None
+                    or (cronjob.get("metadata") or {}).get("name") in id_set
+                ),
+                (cronjob_list.get("metadata") or {}).get("continue") or None,
+            )
+
+        cronjobs = await self._list_cronjob_page(
+            auth_obj,
+            api_instance,
+            namespace,
+            label_selector,
+            limit,
+            continue_token,
+            field_selector,
         )
+        candidates = [
+            cronjob
+            for cronjob in cronjobs.items
+            if id_set is None or cronjob.metadata.name in id_set
+        ]
+        allowed = await self._accessible_mask(auth_obj, api_client, candidates)
+        checks: list[OutCheck] = []
+        for cronjob, allow in zip(candidates, allowed):
+            if not allow:
+                continue
+            try:
+                checks.append(self._make_check(cronjob))
+            except INVALID_CRONJOB_ERRORS as e:
+                report_invalid_cronjob(cronjob.metadata.name, e)
+        return checks, (cronjobs.metadata and cronjobs.metadata._continue) or None
 
-        async with ApiClient(configuration) as api_client:
-            api_instance = client.BatchV1Api(api_client)
+    @contextmanager
+    def _listing_errors(self: Self, auth_obj: AuthenticationObject) -> Iterator[None]:
+        try:
+            yield
+        except ApiException as e:
+            self._forget_k8s_config_if_unauthorized(auth_obj, e)
+            logger.error(f"Failed to list cron jobs: {e}")
+            raise e
+        except aiohttp.ClientConnectionError as e:
+            logger.error(f"Failed to list cron jobs: {e}")
+            raise CheckConnectionError("Cannot connect to cluster")
+
+    async def _list_cronjob_page(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        api_instance: client.BatchV1Api,
+        namespace: str,
+        label_selector: str,
+        limit: int,
+        continue_token: str,
+        field_selector: str = "",
+    ) -> V1CronJobList:
+        with self._listing_errors(auth_obj):
+            # A limit of 0 means no limit to the cluster, as does an empty token
+            return await api_instance.list_namespaced_cron_job(
+                namespace=namespace,
+                label_selector=label_selector,
+                field_selector=field_selector,
+                limit=limit,
+                _continue=continue_token,
+            )
+
+    async def _list_cronjob_page_json(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        api_instance: client.BatchV1Api,
+        namespace: str,
+        label_selector: str,
+        limit: int,
+        continue_token: str,
+        field_selector: str = "",
+    ) -> dict[str, Any]:
+        """Same as _list_cronjob_page, but returns the cron job list as JSON"""
+        with self._listing_errors(auth_obj):
+            response: Any = await api_instance.list_namespaced_cron_job(
+                namespace=namespace,
+                label_selector=label_selector,
+                field_selector=field_selector,
+                limit=limit,
+                _continue=continue_token,
+                _preload_content=False,
+            )
             try:
-                cronjobs = await api_instance.list_namespaced_cron_job(
-                    namespace=namespace,
-                )
-            except ApiException as e:
-                logger.error(f"Failed to list cron jobs: {e}")
+                data = await response.read()
+            finally:
+                response.release()
+            if not 200 <= response.status <= 299:
+                e = ApiException(status=response.status, reason=response.reason)
+                e.body = data
                 raise e
+            cronjob_list: dict[str, Any] = json.loads(data)
+            return cronjob_list
+
+    @override
+    async def get_check(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        check_id: CheckId,
+    ) -> OutCheck:
+        configuration, namespace = await self._k8s_config_and_namespace(auth_obj)
+        labels = await self._k8s_cronjob_labels(auth_obj)
+
+        async with self._client_pool.client(configuration) as api_client:
+            try:
+                if self._cronjob_cache is not None:
+                    informer = await self._cronjob_cache.informer(
+                        configuration, namespace, label_selector_from(labels)
+                    )
+                    cached = informer.get(check_id)
+                    if cached is None:
+                        raise CheckIdError(check_id)
+                    cronjob, check = cached.cronjob, cached.check
+                else:
+                    api_instance = client.BatchV1Api(api_client)
+                    cronjob = await api_instance.read_namespaced_cron_job(
+                        name=check_id,
+                        namespace=namespace,
+                    )
+                    if not has_labels(cronjob, labels):
+                        raise CheckIdError(check_id)
+                    check = self._make_check(cronjob)
             except aiohttp.ClientConnectionError as e:
-                logger.error(f"Failed to list cron jobs: {e}")
+                logger.error(f"Failed to read cron job: {e}")
                 raise CheckConnectionError("Cannot connect to cluster")
-            template_id: str | None
-
-            for cronjob in cronjobs.items:
-                check_id = cronjob.metadata.name
-                if (ids is None or cronjob.metadata.name in ids) and (
-                    ON_K8S_CRONJOB_ACCESS_HOOK_NAME not in self._hooks
-                    or await call_hooks_check_if_allow(
-                        self._hooks[ON_K8S_CRONJOB_ACCESS_HOOK_NAME],
-                        auth_obj,
-                        check_id,
-                        api_client,
-                        cronjob,
-                    )
-                ):
-                    template_id = None
-                    if cronjob.metadata and cronjob.metadata.annotations:
-                        template_id = cronjob.metadata.annotations.get("template_id")
-                    template = self._templates.get(template_id or "")
-                    if template is not None:
-                        yield template.make_check(cronjob)
-                    else:
-                        yield default_make_check(cronjob)
+            except ApiException as e:
+                self._forget_k8s_config_if_unauthorized(auth_obj, e)
+                logger.info(f"Failed to read check with id '{check_id}': {e}")
+                if e.status == 404:
+                    raise CheckIdError(check_id)
+                else:
+                    raise e
+
+            # Checks hidden by the access hooks are reported as missing, the
+            # same as when listing checks
+            if not (await self._accessible_mask(auth_obj, api_client, [cronjob]))[0]:
+                raise CheckIdError(check_id)
+        return check
 
     @override
     async def run_check(
@@ -381,39 +1075,20 @@ class K8sBackend(CheckBackend[AuthenticationObject]):
         auth_obj: AuthenticationObject,
         check_id: CheckId,
     ) -> None:
-        if GET_K8S_CONFIG_HOOK_NAME not in self._hooks:
-            raise ValueError(
-                f"Must set hook {GET_K8S_CONFIG_HOOK_NAME} ($RH_CHECK_GET_K8S_CONFIG) when using the k8s backend"
-            )
+        configuration, namespace = await self._k8s_config_and_namespace(auth_obj)
+        labels = await self._k8s_cronjob_labels(auth_obj)
 
-        if GET_K8S_NAMESPACE_HOOK_NAME not in self._hooks:
-            raise ValueError(
-                f"Must set hook {GET_K8S_NAMESPACE_HOOK_NAME} ($RH_CHECK_GET_K8S_NAMESPACE_HOOK_NAME) when using the k8s backend"
-            )
-
-        configuration = await call_hooks_until_not_none(
-            self._hooks[GET_K8S_CONFIG_HOOK_NAME], auth_obj
-        )
-        namespace = await call_hooks_until_not_none(
-            self._hooks[GET_K8S_NAMESPACE_HOOK_NAME], auth_obj
-        )
-
-        async with ApiClient(configuration) as api_client:
+        async with self._client_pool.client(configuration) as api_client:
             api_instance = client.BatchV1Api(api_client)
             try:
                 cronjob = await api_instance.read_namespaced_cron_job(
                     name=check_id,
                     namespace=namespace,
                 )
+                if not has_labels(cronjob, labels):
+                    raise CheckIdError(check_id)
 
-                if ON_K8S_CRONJOB_ACCESS_HOOK_NAME in self._hooks:
-                    await call_hooks_ignore_results(
-                        self._hooks[ON_K8S_CRONJOB_ACCESS_HOOK_NAME],
-                        auth_obj,
-                        check_id,
-                        api_client,
-                        cronjob,
-                    )
+                await self._ensure_accessible(auth_obj, api_client, check_id, cronjob)
 
                 if ON_K8S_CRONJOB_RUN_HOOK_NAME in self._hooks:
                     await call_hooks_ignore_results(
@@ -432,6 +1107,7 @@ class K8sBackend(CheckBackend[AuthenticationObject]):
                 logger.error(f"Failed to delete cron job: {e}")
                 raise CheckConnectionError("Cannot connect to cluster")
             except ApiException as e:
+                self._forget_k8s_config_if_unauthorized(auth_obj, e)
                 logger.info(f"Failed to delete check with id '{check_id}': {e}")
                 if e.status == 404:
                     raise CheckIdError(check_id)
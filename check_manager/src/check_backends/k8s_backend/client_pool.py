@@ -0,0 +1,116 @@
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+import time
+from typing import AsyncIterator, Hashable, Self
+
+from kubernetes_asyncio.client.api_client import ApiClient
+from kubernetes_asyncio.client.configuration import Configuration
+
+from cache_utils import jwt_expiry
+
+
+def configuration_key(configuration: Configuration) -> Hashable:
+    """
+    Returns a hashable value identifying the cluster and credentials of a
+    configuration. Hooks usually build a new Configuration object per request,
+    so the object identity itself can't be used for this.
+    """
+    return (
+        configuration.host,
+        tuple(sorted((configuration.api_key or {}).items())),
+        tuple(sorted((configuration.api_key_prefix or {}).items())),
+        configuration.username,
+        configuration.password,
+        configuration.cert_file,
+        configuration.key_file,
+        configuration.ssl_ca_cert,
+        configuration.verify_ssl,
+        configuration.proxy,
+    )
+
+
+def credential_expiry(configuration: Configuration) -> float | None:
+    """
+    Returns the expiry time (seconds since epoch) of the bearer token in the
+    configuration if it is a JWT, otherwise None. The signature is not checked,
+    the cluster does that.
+    """
+    for value in (configuration.api_key or {}).values():
+        expires_at = jwt_expiry(value)
+        if expires_at is not None:
+            return expires_at
+    return None
+
+
+@dataclass
+class _PooledClient:
+    api_client: ApiClient
+    in_use: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ApiClientPool:
+    """
+    Long-lived ApiClients shared between requests, one per cluster credentials,
+    so that the connections to the cluster are kept alive between requests.
+    Whenever a client is taken or given back, clients idle for longer than
+    idle_timeout_seconds are closed, as are the least recently used idle clients
+    when there are more than max_size of them.
+    """
+
+    def __init__(
+        self: Self,
+        *,
+        max_size: int = 16,
+        idle_timeout_seconds: float = 300.0,
+    ) -> None:
+        self._max_size = max_size
+        self._idle_timeout_seconds = idle_timeout_seconds
+        self._clients: OrderedDict[Hashable, _PooledClient] = OrderedDict()
+
+    def __len__(self: Self) -> int:
+        return len(self._clients)
+
+    @asynccontextmanager
+    async def client(
+        self: Self, configuration: Configuration
+    ) -> AsyncIterator[ApiClient]:
+        key = configuration_key(configuration)
+        pooled = self._clients.get(key)
+        if pooled is None:
+            pooled = _PooledClient(api_client=ApiClient(configuration))
+            self._clients[key] = pooled
+        else:
+            self._clients.move_to_end(key)
+
+        pooled.in_use += 1
+        try:
+            # Also when taking a client, so that the pool is back within max_size as
+            # soon as a client is added, rather than once some client is given back
+            await self._evict()
+            yield pooled.api_client
+        finally:
+            pooled.in_use -= 1
+            pooled.last_used = time.monotonic()
+            await self._evict()
+
+    async def _evict(self: Self) -> None:
+        now = time.monotonic()
+        idle_keys = [key for key, pooled in self._clients.items() if pooled.in_use == 0]
+        excess = len(self._clients) - self._max_size
+        evicted: list[ApiClient] = []
+        # Least recently used first, as clients are moved to the end when taken into use
+        for key in idle_keys:
+            pooled = self._clients[key]
+            if excess > 0 or now - pooled.last_used > self._idle_timeout_seconds:
+                del self._clients[key]
+                evicted.append(pooled.api_client)
+                excess -= 1
+        await asyncio.gather(*(api_client.close() for api_client in evicted))
+
+    async def aclose(self: Self) -> None:
+        clients = [pooled.api_client for pooled in self._clients.values()]
+        self._clients.clear()
+        await asyncio.gather(*(api_client.close() for api_client in clients))
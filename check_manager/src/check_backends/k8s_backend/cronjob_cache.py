@@ -0,0 +1,293 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any, Callable, Hashable, Iterable, Self
+
+import aiohttp
+from kubernetes_asyncio import client, watch
+from kubernetes_asyncio.client.api_client import ApiClient
+from kubernetes_asyncio.client.configuration import Configuration
+from kubernetes_asyncio.client.models.v1_cron_job import V1CronJob
+from kubernetes_asyncio.client.rest import ApiException
+
+from check_backends.check_backend import CheckId, OutCheck
+from check_backends.k8s_backend.client_pool import configuration_key, credential_expiry
+from check_backends.k8s_backend.templates import INVALID_CRONJOB_ERRORS
+
+logger = logging.getLogger("HEALTH_CHECK")
+
+
+@dataclass(frozen=True)
+class CachedCronjob:
+    cronjob: V1CronJob
+    check: OutCheck
+
+
+@dataclass(frozen=True)
+class InvalidCronjob:
+    cronjob: V1CronJob
+    # Raised when making the check of the cron job
+    error: Exception
+
+
+class CronjobInformer:
+    """
+    Keeps an in-memory copy of the cronjobs in one namespace (optionally only
+    those matching a label selector), together with the checks converted from
+    them. Cronjobs which can't be made into checks are kept apart, so that listings
+    can report them. The cronjobs are listed once, after which
+    changes are followed with a watch that resumes from the last seen
+    resourceVersion. The cronjobs are listed again only if the watch falls too
+    far behind (HTTP 410 Gone). The informer stops, dropping its copy, when the
+    cluster no longer accepts the credentials (HTTP 401 or 403) and once the bearer
+    token in the configuration expires, so that it can't outlive the user's access.
+    """
+
+    def __init__(
+        self: Self,
+        configuration: Configuration,
+        namespace: str,
+        make_check: Callable[[V1CronJob], OutCheck],
+        *,
+        label_selector: str = "",
+        watch_timeout_seconds: int = 300,
+        retry_delay_seconds: float = 5.0,
+    ) -> None:
+        self._configuration = configuration
+        self._namespace = namespace
+        self._label_selector = label_selector
+        self._make_check = make_check
+        self._watch_timeout_seconds = watch_timeout_seconds
+        self._retry_delay_seconds = retry_delay_seconds
+        self._expires_at = credential_expiry(configuration)
+
+        self._store: dict[CheckId, CachedCronjob] = {}
+        self._invalid: dict[CheckId, InvalidCronjob] = {}
+        self._resource_version: str | None = None
+        self._synced = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self: Self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def wait_synced(self: Self) -> None:
+        self.start()
+        assert self._task is not None
+        synced = asyncio.create_task(self._synced.wait())
+        done, _ = await asyncio.wait(
+            (synced, self._task), return_when=asyncio.FIRST_COMPLETED
+        )
+        if synced not in done:
+            synced.cancel()
+            # The informer task only stops when it fails in an unexpected way
+            self._task.result()
+
+    def is_stopped(self: Self) -> bool:
+        """Whether the informer stopped following the cronjobs, so that its copy can't be used"""
+        if self._expires_at is not None and time.time() >= self._expires_at:
+            return True
+        return self._task is not None and self._task.done()
+
+    def get(self: Self, check_id: CheckId) -> CachedCronjob | None:
+        return self._store.get(check_id)
+
+    def list_invalid(
+        self: Self, ids: Iterable[CheckId] | None = None
+    ) -> list[InvalidCronjob]:
+        """The cronjobs which list leaves out, as they can't be made into checks"""
+        if ids is None:
+            return list(self._invalid.values())
+        return [self._invalid[id] for id in ids if id in self._invalid]
+
+    def list(self: Self, ids: Iterable[CheckId] | None = None) -> list[CachedCronjob]:
+        if ids is None:
+            return list(self._store.values())
+        return [self._store[id] for id in ids if id in self._store]
+
+    def upsert(self: Self, cronjob: V1CronJob) -> None:
+        check_id = CheckId(cronjob.metadata.name)
+        try:
+            check = self._make_check(cronjob)
+        except INVALID_CRONJOB_ERRORS as e:
+            self._store.pop(check_id, None)
+            self._invalid[check_id] = InvalidCronjob(cronjob=cronjob, error=e)
+            return
+        self._invalid.pop(check_id, None)
+        self._store[check_id] = CachedCronjob(cronjob=cronjob, check=check)
+
+    def remove(self: Self, check_id: CheckId) -> None:
+        self._store.pop(check_id, None)
+        self._invalid.pop(check_id, None)
+
+    async def aclose(self: Self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                # Already raised to the requests waiting for the first listing
+                pass
+            self._task = None
+
+    async def _run(self: Self) -> None:
+        async with ApiClient(self._configuration) as api_client:
+            api_instance = client.BatchV1Api(api_client)
+            while True:
+                try:
+                    if self._resource_version is None:
+                        await self._list(api_instance)
+                    await self._watch(api_instance)
+                except ApiException as e:
+                    if e.status == 410:
+                        logger.info(
+                            f"Cron job watch in namespace {self._namespace} expired, listing again"
+                        )
+                        self._resource_version = None
+                        continue
+                    if not self._synced.is_set():
+                        # Let the requests waiting for the first listing see the error
+                        raise
+                    if e.status in (401, 403):
+                        logger.warning(
+                            f"Stopped watching cron jobs in namespace {self._namespace}, no longer authorized: {e}"
+                        )
+                        self._synced.clear()
+                        self._store = {}
+                        self._invalid = {}
+                        return
+                    logger.error(
+                        f"Failed to watch cron jobs in namespace {self._namespace}: {e}"
+                    )
+                    await asyncio.sleep(self._retry_delay_seconds)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if not self._synced.is_set():
+                        raise
+                    logger.error(
+                        f"Failed to watch cron jobs in namespace {self._namespace}: {e}"
+                    )
+                    await asyncio.sleep(self._retry_delay_seconds)
+
+    async def _list(self: Self, api_instance: client.BatchV1Api) -> None:
+        cronjobs = await api_instance.list_namespaced_cron_job(
+            namespace=self._namespace,
+            label_selector=self._label_selector,
+        )
+        self._store = {}
+        self._invalid = {}
+        for cronjob in cronjobs.items:
+            self.upsert(cronjob)
+        self._resource_version = cronjobs.metadata.resource_version
+        self._synced.set()
+
+    async def _watch(self: Self, api_instance: client.BatchV1Api) -> None:
+        async with watch.Watch().stream(
+            api_instance.list_namespaced_cron_job,
+            namespace=self._namespace,
+            label_selector=self._label_selector,
+            resource_version=self._resource_version,
+            timeout_seconds=self._watch_timeout_seconds,
+            allow_watch_bookmarks=True,
+        ) as stream:
+            async for event in stream:
+                try:
+                    self._handle_event(event)
+                except Exception as e:
+                    # Skipped rather than stopping the watch, which would leave the
+                    # copy of the cronjobs behind for good
+                    logger.error(
+                        f"Skipped cron job event in namespace {self._namespace}: {e!r}"
+                    )
+
+    def _handle_event(self: Self, event: dict[str, Any]) -> None:
+        match event["type"]:
+            case "ADDED" | "MODIFIED":
+                self.upsert(event["object"])
+            case "DELETED":
+                self.remove(CheckId(event["object"].metadata.name))
+            case "BOOKMARK":
+                pass
+            case _:
+                return
+        self._resource_version = event["raw_object"]["metadata"]["resourceVersion"]
+
+
+class CronjobCache:
+    """
+    A bounded collection of informers, one per cluster credentials, namespace
+    and label selector. The least recently used informer is stopped when the bound
+    is exceeded, so max_informers should be at least the number of users (with
+    distinct credentials or labels) expected to list checks within the watch
+    timeout, otherwise informers are stopped and started again all the time.
+    Informers which stopped (see CronjobInformer) are replaced by new ones, which
+    list the cronjobs from the cluster again.
+    """
+
+    def __init__(
+        self: Self,
+        make_check: Callable[[V1CronJob], OutCheck],
+        *,
+        max_informers: int = 32,
+        watch_timeout_seconds: int = 300,
+    ) -> None:
+        self._make_check = make_check
+        self._max_informers = max_informers
+        self._watch_timeout_seconds = watch_timeout_seconds
+        self._informers: OrderedDict[Hashable, CronjobInformer] = OrderedDict()
+
+    def peek(
+        self: Self,
+        configuration: Configuration,
+        namespace: str,
+        label_selector: str = "",
+    ) -> CronjobInformer | None:
+        """Returns the informer if one is already running, without starting one"""
+        informer = self._informers.get(
+            (configuration_key(configuration), namespace, label_selector)
+        )
+        return None if informer is None or informer.is_stopped() else informer
+
+    async def informer(
+        self: Self,
+        configuration: Configuration,
+        namespace: str,
+        label_selector: str = "",
+    ) -> CronjobInformer:
+        key = (configuration_key(configuration), namespace, label_selector)
+        informer = self._informers.get(key)
+        if informer is not None and informer.is_stopped():
+            del self._informers[key]
+            await informer.aclose()
+            informer = None
+        if informer is None:
+            informer = CronjobInformer(
+                configuration,
+                namespace,
+                self._make_check,
+                label_selector=label_selector,
+                watch_timeout_seconds=self._watch_timeout_seconds,
+            )
+            self._informers[key] = informer
+            while len(self._informers) > self._max_informers:
+                _, evicted = self._informers.popitem(last=False)
+                await evicted.aclose()
+        else:
+            self._informers.move_to_end(key)
+        try:
+            await informer.wait_synced()
+        except Exception:
+            # Start from scratch on the next request
+            if self._informers.get(key) is informer:
+                del self._informers[key]
+            await informer.aclose()
+            raise
+        return informer
+
+    async def aclose(self: Self) -> None:
+        informers = list(self._informers.values())
+        self._informers.clear()
+        await asyncio.gather(*(informer.aclose() for informer in informers))
@@ -1,4 +1,5 @@
 from typing import Optional, override, Generic, TypeVar, Any, Callable
+import functools
 import json
 from abc import abstractmethod
 import os
@@ -225,29 +226,34 @@ def cronjob_template[ArgumentType](
     containers: Callable[[ArgumentType, Any], list[V1Container]],
     volumes: Callable[[ArgumentType, Any], list[V1Volume]] | list[V1Volume] | None = None,
 ) -> type[CronjobTemplate]:
-    class SimpleCronjobTemplate(CronjobTemplate):
-        @override
-        def get_check_template(self) -> CheckTemplate:
-            if template_metadata is not None:
-                metadata: dict[str, str] = template_metadata.copy()
-            else:
-                metadata = {}
+    # The schema of the arguments is generated once per template class
+    @functools.cache
+    def check_template() -> CheckTemplate:
+        if template_metadata is not None:
+            metadata: dict[str, str] = template_metadata.copy()
+        else:
+            metadata = {}
 
-            if label is not None:
-                metadata["label"] = label
-            if description is not None:
-                metadata["description"] = description
+        if label is not None:
+            metadata["label"] = label
+        if description is not None:
+            metadata["description"] = description
 
-            schema_obj: dict[str, Any] = argument_type.model_json_schema()  # type: ignore
-            schema_obj["$schema"] = "http://json-schema.org/draft-07/schema"
+        schema_obj: dict[str, Any] = argument_type.model_json_schema()  # type: ignore
+        schema_obj["$schema"] = "http://json-schema.org/draft-07/schema"
 
-            return CheckTemplate(
-                id=CheckTemplateId(template_id),
-                attributes=CheckTemplateAttributes(
-                    metadata=CheckTemplateMetadata(**metadata),
-                    arguments=schema_obj,
-                ),
-            )
+        return CheckTemplate(
+            id=CheckTemplateId(template_id),
+            attributes=CheckTemplateAttributes(
+                metadata=CheckTemplateMetadata(**metadata),
+                arguments=schema_obj,
+            ),
+        )
+
+    class SimpleCronjobTemplate(CronjobTemplate):
+        @override
+        def get_check_template(self) -> CheckTemplate:
+            return check_template()
 
         @override
         def make_cronjob(
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
+import functools
 import inspect
 import json
+from jsonschema.protocols import Validator
 from kubernetes_asyncio.client.models.v1_cron_job import V1CronJob
 from kubernetes_asyncio.client.models.v1_env_var import V1EnvVar
 from kubernetes_asyncio.client.models.v1_object_meta import V1ObjectMeta
@@ -13,9 +15,10 @@ import logging
 import os
 import pathlib
 from pydantic import TypeAdapter
-from typing import Any, Protocol, runtime_checkable
+from typing import Any, Callable, Protocol, runtime_checkable
 import uuid
 
+from cache_utils import TTLCache
 from eoepca_api_utils.json_api_types import Json
 from check_backends.check_backend import (
     CheckId,
@@ -27,11 +30,17 @@ from check_backends.check_backend import (
     OutCheckAttributes,
     OutCheckMetadata,
     OutcomeFilter,
+    make_arguments_validator,
+    validate_arguments,
 )
 from plugin_utils.loader import load_plugins
 
 logger = logging.getLogger("HEALTH_CHECK")
 
+# Raised when making a check of a cron job which lacks the fields of one, such as a
+# cron job in the namespace which wasn't made from a check
+INVALID_CRONJOB_ERRORS = (AttributeError, KeyError, TypeError, ValueError)
+
 
 # Protocol class for cronjob templates
 @runtime_checkable
@@ -67,17 +76,27 @@ class CronjobTemplate(ABC):
         """Returns a cronjob from the arguments and schedule."""
 
 
+def metadata_annotations(metadata: InCheckMetadata) -> dict[str, str]:
+    """The annotations holding the metadata of the check on its cronjob"""
+    annotations = {
+        "name": metadata.name,
+        "description": metadata.description,
+        "template_id": metadata.template_id,
+        "template_args": json.dumps(metadata.template_args),
+    }
+    if metadata.client_key is not None:
+        annotations["client_key"] = metadata.client_key
+    return annotations
+
+
 # Helper functions for adding metadata and telemetry properties to cronjobs
-def _add_metadata(cronjob: V1CronJob, metadata: InCheckMetadata) -> None:
+def _add_metadata(
+    cronjob: V1CronJob, metadata: InCheckMetadata, check_id: CheckId | None
+) -> None:
     if cronjob.metadata is None:
         cronjob.metadata = V1ObjectMeta()
-    cronjob.metadata.annotations["name"] = metadata.name
-    cronjob.metadata.annotations["description"] = metadata.description
-    cronjob.metadata.annotations["template_id"] = metadata.template_id
-    cronjob.metadata.annotations["template_args"] = json.dumps(
-        metadata.template_args
-    )
-    cronjob.metadata.name = CheckId(str(uuid.uuid4()))
+    cronjob.metadata.annotations.update(metadata_annotations(metadata))
+    cronjob.metadata.name = check_id or CheckId(str(uuid.uuid4()))
 
 
 def _add_otel_resource_attributes(
@@ -148,8 +167,9 @@ def _tag_cronjob(
     cronjob: V1CronJob,
     metadata: InCheckMetadata,
     userinfo: Any,
+    check_id: CheckId | None = None,
 ) -> V1CronJob:
-    _add_metadata(cronjob, metadata)
+    _add_metadata(cronjob, metadata, check_id)
 
     _add_otel_resource_attributes(cronjob, userinfo)
 
@@ -158,11 +178,62 @@ def _tag_cronjob(
     return cronjob
 
 
+# Checks made from cronjobs, by the uid and resourceVersion of the cronjob. The
+# resourceVersion changes whenever the cronjob does, so unchanged cronjobs are
+# turned into checks only once.
+CHECK_CACHE_MAX_SIZE: int = int(
+    os.environ.get("RH_CHECK_K8S_CHECK_CACHE_SIZE") or "10000"
+)
+
+
+def _cached_check[T](
+    key: Callable[[T], tuple[str | None, str | None]]
+) -> Callable[[Callable[[T], OutCheck]], Callable[[T], OutCheck]]:
+    """
+    Reuses the checks made from the same version of a cronjob. Callers get a shallow
+    copy of the cached check, so the nested models are shared and callers which change
+    them must copy them first.
+    """
+
+    def decorator(make_check: Callable[[T], OutCheck]) -> Callable[[T], OutCheck]:
+        cache: TTLCache[tuple[str, str], OutCheck] = TTLCache(
+            max_size=CHECK_CACHE_MAX_SIZE, ttl_seconds=None
+        )
+
+        @functools.wraps(make_check)
+        def wrapper(cronjob: T) -> OutCheck:
+            uid, resource_version = key(cronjob)
+            if not uid or not resource_version:
+                return make_check(cronjob)
+            check = cache.get((uid, resource_version))
+            if check is None:
+                check = make_check(cronjob)
+                cache.set((uid, resource_version), check)
+            return check.model_copy()
+
+        return wrapper
+
+    return decorator
+
+
+def _cronjob_version(cronjob: V1CronJob) -> tuple[str | None, str | None]:
+    if cronjob.metadata is None:
+        return None, None
+    return cronjob.metadata.uid, cronjob.metadata.resource_version
+
+
+def _json_cronjob_version(cronjob: dict[str, Any]) -> tuple[str | None, str | None]:
+    metadata = cronjob.get("metadata") or {}
+    return metadata.get("uid"), metadata.get("resourceVersion")
+
+
+@_cached_check(_cronjob_version)
 def _make_check(cronjob: V1CronJob) -> OutCheck:
     name = cronjob.metadata.annotations.get("name")
     description = cronjob.metadata.annotations.get("description")
     template_id = cronjob.metadata.annotations.get("template_id")
     template_args = json.loads(cronjob.metadata.annotations.get("template_args", "{}"))
+    client_key = cronjob.metadata.annotations.get("client_key")
     return OutCheck(
         id=CheckId(cronjob.metadata.name),
         attributes=OutCheckAttributes(
@@ -171,6 +242,7 @@ def _make_check(cronjob: V1CronJob) -> OutCheck:
                 description=description,
                 template_id=template_id,
                 template_args=template_args,
+                client_key=client_key,
             ),
             schedule=CronExpression(cronjob.spec.schedule),
             outcome_filter=OutcomeFilter(
@@ -180,11 +252,13 @@ def _make_check(cronjob: V1CronJob) -> OutCheck:
     )
 
 
+@_cached_check(_cronjob_version)
 def default_make_check(cronjob: V1CronJob) -> OutCheck:
     name: str | None = None
     description: str | None = None
     template_id: CheckTemplateId | None = None
     template_args: dict = {}
+    client_key: str | None = None
     if cronjob.metadata and cronjob.metadata.annotations:
         name = cronjob.metadata.annotations.get("name")
         description = cronjob.metadata.annotations.get("description")
@@ -192,6 +266,7 @@ def default_make_check(cronjob: V1CronJob) -> OutCheck:
         template_args = json.loads(
             cronjob.metadata.annotations.get("template_args", "{}")
         )
+        client_key = cronjob.metadata.annotations.get("client_key")
     cronjob_name: str = (
         cronjob.metadata.name if cronjob.metadata and cronjob.metadata.name
         else ""
@@ -204,6 +279,7 @@ def default_make_check(cronjob: V1CronJob) -> OutCheck:
                 description=description,
                 template_id=template_id,
                 template_args=template_args,
+                client_key=client_key,
             ),
             schedule=CronExpression(cronjob.spec.schedule),
             outcome_filter=OutcomeFilter(
@@ -213,25 +289,64 @@ def default_make_check(cronjob: V1CronJob) -> OutCheck:
     )
 
 
+@_cached_check(_json_cronjob_version)
+def json_make_check(cronjob: dict[str, Any]) -> OutCheck:
+    """
+    Same as default_make_check, but from the cronjob as JSON returned by the cluster.
+    Reads only the fields the check needs, without deserializing the whole cronjob.
+    """
+    metadata: dict[str, Any] = cronjob.get("metadata") or {}
+    annotations: dict[str, str] = metadata.get("annotations") or {}
+    cronjob_name: str = metadata.get("name") or ""
+    template_id: CheckTemplateId | None = annotations.get("template_id")  # type: ignore
+    spec: dict[str, Any] = cronjob.get("spec") or {}
+    return OutCheck(
+        id=CheckId(cronjob_name),
+        attributes=OutCheckAttributes(
+            metadata=OutCheckMetadata(
+                name=annotations.get("name"),
+                description=annotations.get("description"),
+                template_id=template_id,
+                template_args=json.loads(annotations.get("template_args", "{}")),
+                client_key=annotations.get("client_key"),
+            ),
+            schedule=CronExpression(spec["schedule"]),
+            outcome_filter=OutcomeFilter(
+                resource_attributes={"k8s.cronjob.name": [cronjob_name]}
+            ),
+        ),
+    )
+
+
 class CronjobMaker:
     def __init__(self, cronjob_template: CronjobTemplateProtocol) -> None:
         self.cronjob_template: CronjobTemplateProtocol = cronjob_template
+        # Templates describe themselves the same way every time, so only ask once
+        self.check_template: CheckTemplate = cronjob_template.get_check_template()
+        self.arguments_validator: Validator = make_arguments_validator(
+            self.check_template.attributes.arguments
+        )
 
     def get_check_template(self) -> CheckTemplate:
-        return self.cronjob_template.get_check_template()
+        return self.check_template
+
+    def validate_template_args(self, template_args: Json) -> None:
+        validate_arguments(self.arguments_validator, template_args)
 
     def make_cronjob(
         self,
         metadata: InCheckMetadata,
         schedule: CronExpression,
         userinfo: Any,
+        check_id: CheckId | None = None,
     ) -> V1CronJob:
+        """Renders the cronjob of a new check, or of the existing check_id"""
         cronjob = self.cronjob_template.make_cronjob(
             metadata.template_args,
             schedule,
             userinfo,
         )
-        return _tag_cronjob(cronjob, metadata, userinfo)
+        return _tag_cronjob(cronjob, metadata, userinfo, check_id)
 
     def make_check(self, cronjob: V1CronJob) -> OutCheck:
         return _make_check(cronjob)
@@ -258,14 +373,17 @@ def make_template_value(obj: Any) -> CronjobMaker | None:
 
 def load_templates(dirs: str | list[str]) -> dict[str, CronjobMaker]:
     paths: list[str] = [dirs] if isinstance(dirs, str) else dirs
-    templates: dict[str, Any] = {}
+    templates: dict[str, CronjobMaker] = {}
     for path in paths:
-        templates.update(
-            load_plugins(
-                pathlib.Path(path),
-                key=(lambda c: c().get_check_template().id),
-                value=make_template_value,
-                logger=logger,
-            )
+        # Each template class is instantiated once, and keyed by the id of its
+        # check template afterwards
+        plugins: dict[str, dict[str, CronjobMaker]] = load_plugins(
+            pathlib.Path(path),
+            perfile=True,
+            value=make_template_value,
+            logger=logger,
         )
+        for makers in plugins.values():
+            for maker in makers.values():
+                templates[maker.check_template.id] = maker
     return templates
@@ -3,7 +3,8 @@ import re
 from typing import AsyncIterable, Self, override, TypeVar, Callable
 import uuid
 import os
-from jsonschema import ValidationError, validate
+from jsonschema import ValidationError
+from jsonschema.protocols import Validator
 
 from plugin_utils.runner import call_hooks_until_not_none
 from check_backends.check_backend import (
@@ -15,12 +16,16 @@ from check_backends.check_backend import (
     CheckBackend,
     CheckId,
     InCheckAttributes,
+    InCheckUpdateAttributes,
     OutCheck,
     OutCheckMetadata,
     OutCheckAttributes,
     CheckTemplateId,
     CheckTemplateAttributes,
     OutcomeFilter,
+    make_arguments_validator,
+    updated_attributes,
+    validate_arguments,
 )
 from exceptions import CronExpressionValidationError, JsonValidationError
 
@@ -88,6 +93,10 @@ class MockBackend(CheckBackend[AuthenticationObject]):
         self._check_template_id_to_attributes: dict[
             CheckTemplateId, CheckTemplateAttributes
         ] = {template_id: attributes for template_id, attributes in check_templates}
+        self._check_template_id_to_validator: dict[CheckTemplateId, Validator] = {
+            template_id: make_arguments_validator(attributes.arguments)
+            for template_id, attributes in check_templates
+        }
         # metadata={
         #     "template": "remote_check_template1",
         #     "template_args": {
@@ -166,6 +175,19 @@ class MockBackend(CheckBackend[AuthenticationObject]):
                 if template_attributes is not None:
                     yield CheckTemplate(id=template_id, attributes=template_attributes)
 
+    def _validate(self: Self, attributes: InCheckAttributes) -> None:
+        validate_kubernetes_cron(attributes.schedule)
+
+        validator = self._check_template_id_to_validator.get(
+            attributes.metadata.template_id
+        )
+        if validator is None:
+            raise CheckTemplateIdError(attributes.metadata.template_id)
+        try:
+            validate_arguments(validator, attributes.metadata.template_args)
+        except ValidationError as e:
+            raise JsonValidationError("/data/attributes/metadata/template_args/", e)
+
     @override
     async def create_check(
         self: Self, auth_obj: AuthenticationObject, attributes: InCheckAttributes
@@ -179,19 +201,7 @@ class MockBackend(CheckBackend[AuthenticationObject]):
             self._hooks[GET_MOCK_USERNAME_HOOK_NAME], auth_obj
         )
 
-        validate_kubernetes_cron(attributes.schedule)
-
-        check_template_attributes = self._get_check_template_attributes(
-            attributes.metadata.template_id
-        )
-        if check_template_attributes is None:
-            raise CheckTemplateIdError(attributes.metadata.template_id)
-        try:
-            validate(
-                attributes.metadata.template_args, check_template_attributes.arguments
-            )
-        except ValidationError as e:
-            raise JsonValidationError("/data/attributes/metadata/template_args/", e)
+        self._validate(attributes)
 
         check_id = CheckId(str(uuid.uuid4()))
         out_attributes = OutCheckAttributes(
@@ -200,6 +210,7 @@ class MockBackend(CheckBackend[AuthenticationObject]):
                 description=attributes.metadata.description,
                 template_id=attributes.metadata.template_id,
                 template_args=attributes.metadata.template_args,
+                client_key=attributes.metadata.client_key,
             ),
             schedule=attributes.schedule,
             # Just return some filter which I know will have some results
@@ -212,24 +223,28 @@ class MockBackend(CheckBackend[AuthenticationObject]):
         self._auth_to_check_id_to_attributes[username][check_id] = out_attributes
         return OutCheck(id=check_id, attributes=out_attributes)
 
-    # @override
-    # async def update_check(
-    #     self: Self,
-    #     auth_obj: AuthenticationObject,
-    #     check_id: CheckId,
-    #     template_id: CheckTemplateId | None = None,
-    #     template_args: Json | None = None,
-    #     schedule: CronExpression | None = None,
-    # ) -> Check:
-    #     check = self._get_check(auth_obj, check_id)
-    #     if template_id is not None:
-    #         check.metadata["template_id"] = template_id
-    #     if template_args is not None:
-    #         check.metadata["template_args"] = template_args
-    #     # TODO: check check if template_args and check_template are compatible
-    #     if schedule is not None:
-    #         check.schedule = schedule
-    #     return check
+    @override
+    async def update_check(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        check_id: CheckId,
+        attributes: InCheckUpdateAttributes,
+    ) -> OutCheck:
+        check = await self.get_check(auth_obj, check_id)
+        new_attributes = updated_attributes(check, attributes)
+        self._validate(new_attributes)
+
+        username = await call_hooks_until_not_none(
+            self._hooks[GET_MOCK_USERNAME_HOOK_NAME], auth_obj
+        )
+        out_attributes = check.attributes.model_copy(
+            update={
+                "metadata": OutCheckMetadata(**new_attributes.metadata.model_dump()),
+                "schedule": new_attributes.schedule,
+            }
+        )
+        self._auth_to_check_id_to_attributes[username][check_id] = out_attributes
+        return OutCheck(id=check_id, attributes=out_attributes)
 
     @override
     async def remove_check(
@@ -269,6 +284,15 @@ class MockBackend(CheckBackend[AuthenticationObject]):
                 if check_attributes is not None:
                     yield OutCheck(id=id, attributes=check_attributes)
 
+    @override
+    async def get_check(
+        self: Self, auth_obj: AuthenticationObject, check_id: CheckId
+    ) -> OutCheck:
+        check_attributes = await self._get_check_attributes(auth_obj, check_id)
+        if check_attributes is None:
+            raise CheckIdError(check_id)
+        return OutCheck(id=check_id, attributes=check_attributes)
+
     @override
     async def run_check(
         self: Self, auth_obj: AuthenticationObject, check_id: CheckId
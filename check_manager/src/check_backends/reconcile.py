@@ -0,0 +1,187 @@
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from eoepca_api_utils.exceptions import APIUserInputError
+from check_backends.check_backend import (
+    AuthenticationObject,
+    CheckBackend,
+    CheckId,
+    InCheckAttributes,
+    InCheckUpdateAttributes,
+    ListMeta,
+    OutCheck,
+)
+
+
+class ReconcileMeta(ListMeta):
+    created: int
+    updated: int
+    unchanged: int
+    # Ids of the checks removed because their client keys were not given anymore
+    removed: list[CheckId]
+
+
+class ClientKeyError(APIUserInputError):
+    def __init__(self, detail: str) -> None:
+        super().__init__(title="Invalid client key", detail=detail)
+
+
+@dataclass
+class ReconcilePlan:
+    # Indices of the desired checks to create
+    create: list[int] = field(default_factory=list)
+    # Indices of the desired checks which differ from the existing check with the same key
+    update: list[tuple[int, OutCheck]] = field(default_factory=list)
+    # Indices of the desired checks which already exist as they are
+    unchanged: list[tuple[int, OutCheck]] = field(default_factory=list)
+    # Existing checks with a client key which isn't desired anymore
+    remove: list[OutCheck] = field(default_factory=list)
+    # Indices of desired checks which can't be reconciled
+    errors: list[tuple[int, Exception]] = field(default_factory=list)
+
+
+@dataclass
+class ReconcileResult:
+    # For each desired check, the check or the exception raised when reconciling it
+    checks: list[OutCheck | Exception]
+    # The checks that were removed, with the exception raised when removing them, if any
+    removed: list[tuple[OutCheck, Exception | None]]
+    # How many checks were created and updated, not counting the failed ones
+    created: int
+    updated: int
+    unchanged: int
+
+
+def is_same_check(check: OutCheck, attributes: InCheckAttributes) -> bool:
+    metadata = check.attributes.metadata
+    return (
+        metadata.name == attributes.metadata.name
+        and metadata.description == attributes.metadata.description
+        and metadata.template_id == attributes.metadata.template_id
+        and (metadata.template_args or {}) == attributes.metadata.template_args
+        and check.attributes.schedule == attributes.schedule
+    )
+
+
+def plan_reconcile(
+    desired: list[InCheckAttributes], current: list[OutCheck]
+) -> ReconcilePlan:
+    """
+    Matches the desired checks to the current ones by their client keys. Current
+    checks without a client key are not managed through reconciling, so are kept.
+    """
+    plan = ReconcilePlan()
+    current_by_key: dict[str, OutCheck] = {}
+    for check in current:
+        key = check.attributes.metadata.client_key
+        if key is None:
+            continue
+        if key in current_by_key:
+            # Left behind by an earlier reconcile that failed halfway
+            plan.remove.append(check)
+        else:
+            current_by_key[key] = check
+
+    desired_keys: set[str] = set()
+    for index, attributes in enumerate(desired):
+        key = attributes.metadata.client_key
+        if key is None:
+            plan.errors.append(
+                (index, ClientKeyError("Each check must have a client key"))
+            )
+            continue
+        if key in desired_keys:
+            plan.errors.append(
+                (index, ClientKeyError(f"Client key {key} is not unique"))
+            )
+            continue
+        desired_keys.add(key)
+        current_check = current_by_key.get(key)
+        if current_check is None:
+            plan.create.append(index)
+        elif is_same_check(current_check, attributes):
+            plan.unchanged.append((index, current_check))
+        else:
+            plan.update.append((index, current_check))
+
+    plan.remove.extend(
+        check for key, check in current_by_key.items() if key not in desired_keys
+    )
+    return plan
+
+
+async def apply_reconcile(
+    desired: list[InCheckAttributes],
+    plan: ReconcilePlan,
+    *,
+    create_checks: Callable[
+        [list[InCheckAttributes]], Awaitable[list[OutCheck | Exception]]
+    ],
+    update_checks: Callable[
+        [list[tuple[OutCheck, InCheckUpdateAttributes]]],
+        Awaitable[list[OutCheck | Exception]],
+    ],
+    remove_checks: Callable[[list[OutCheck]], Awaitable[list[None | Exception]]],
+) -> ReconcileResult:
+    """
+    Creates the new checks and updates the changed ones in place, then removes the
+    checks which are not desired anymore. A failed reconcile can be retried.
+    """
+    checks: list[OutCheck | Exception | None] = [None] * len(desired)
+    for index, exception in plan.errors:
+        checks[index] = exception
+    for index, check in plan.unchanged:
+        checks[index] = check
+
+    created = await create_checks([desired[index] for index in plan.create])
+    for index, result in zip(plan.create, created):
+        checks[index] = result
+    updated = await update_checks(
+        [
+            (
+                check,
+                InCheckUpdateAttributes.model_validate(desired[index].model_dump()),
+            )
+            for index, check in plan.update
+        ]
+    )
+    for (index, _), result in zip(plan.update, updated):
+        checks[index] = result
+
+    removed = list(zip(plan.remove, await remove_checks(plan.remove)))
+
+    assert all(check is not None for check in checks)
+    return ReconcileResult(
+        checks=[check for check in checks if check is not None],
+        removed=removed,
+        created=sum(not isinstance(result, Exception) for result in created),
+        updated=sum(not isinstance(result, Exception) for result in updated),
+        unchanged=len(plan.unchanged),
+    )
+
+
+async def reconcile(
+    backend: CheckBackend[AuthenticationObject],
+    auth_obj: AuthenticationObject,
+    desired: list[InCheckAttributes],
+) -> ReconcileResult:
+    """
+    Makes the checks with a client key be the desired ones, creating and removing only
+    what differs. Costs one listing when nothing differs.
+    """
+    # Any error when listing is raised, as reconciling against a partial list would
+    # create duplicates of the checks that were left out
+    current = [check async for check in backend.get_checks(auth_obj)]
+    return await apply_reconcile(
+        desired,
+        plan_reconcile(desired, current),
+        create_checks=lambda attributes_list: backend.create_checks(
+            auth_obj, attributes_list
+        ),
+        update_checks=lambda updates: backend.update_checks(
+            auth_obj, [(check.id, attributes) for check, attributes in updates]
+        ),
+        remove_checks=lambda checks: backend.remove_checks(
+            auth_obj, [check.id for check in checks]
+        ),
+    )
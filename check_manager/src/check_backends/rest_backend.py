@@ -1,19 +1,33 @@
 from typing import (
+    Any,
     AsyncIterable,
     Self,
     override,
 )
 import httpx
+from pydantic import BaseModel
 
 from api_interface import (
+    GET_CHECK_PATH,
     GET_CHECK_TEMPLATES_PATH,
     GET_CHECKS_PATH,
     CREATE_CHECK_PATH,
     REMOVE_CHECK_PATH,
     RUN_CHECK_PATH,
+    UPDATE_CHECK_PATH,
+    BULK_CREATE_CHECKS_PATH,
+    BULK_REMOVE_CHECKS_PATH,
+    BULK_RUN_CHECKS_PATH,
+    bulk_item_index,
+    get_check_exception,
     get_check_exceptions,
 )
-from eoepca_api_utils.api_utils import get_url_str
+from eoepca_api_utils.api_utils import (
+    PAGE_CURSOR_QUERY_PARAM,
+    PAGE_SIZE_QUERY_PARAM,
+    get_next_page_cursor,
+    get_url_str,
+)
 from check_backends.check_backend import (
     AuthenticationObject,
     CheckBackend,
@@ -21,15 +35,24 @@ from check_backends.check_backend import (
     CheckTemplate,
     CheckTemplateId,
     CheckTemplateAttributes,
+    CheckIdentifier,
+    CheckIdentifiers,
     InCheck,
     InCheckAttributes,
     InCheckData,
+    InChecks,
+    InCheckUpdate,
+    InCheckUpdateAttributes,
+    InCheckUpdateData,
     OutCheck,
+    ListMeta,
     OutCheckAttributes,
+    Page,
+    report_backend_errors,
 )
 
 from exceptions import CheckConnectionError
-from eoepca_api_utils.json_api_types import APIOKResponse, APIOKResponseList
+from eoepca_api_utils.json_api_types import APIOKResponse, APIOKResponseList, Resource
 
 
 class RestBackend(CheckBackend[AuthenticationObject]):
@@ -55,11 +78,13 @@ class RestBackend(CheckBackend[AuthenticationObject]):
         except httpx.HTTPError as e:
             raise CheckConnectionError(str(e))
         if response.is_success:
-            for check_template in (
-                APIOKResponseList[CheckTemplateAttributes, None]
-                .model_validate(response.json())
-                .data
-            ):
+            response_list = APIOKResponseList[
+                CheckTemplateAttributes, ListMeta | None
+            ].model_validate(response.json())
+            # The service may itself have left out the items of the services it combines
+            if response_list.meta is not None:
+                report_backend_errors(response_list.meta.errors)
+            for check_template in response_list.data:
                 yield CheckTemplate(
                     id=CheckTemplateId(check_template.id),
                     attributes=check_template.attributes,
@@ -69,6 +94,59 @@ class RestBackend(CheckBackend[AuthenticationObject]):
                 status_code=response.status_code, content=response.json()
             )
 
+    async def _get_page[T](
+        self: Self,
+        path: str,
+        response_type: type[APIOKResponseList[T, ListMeta | None]],
+        ids: list[Any] | None,
+        page_size: int,
+        cursor: str | None,
+    ) -> APIOKResponseList[T, ListMeta | None]:
+        params: dict[str, Any] = {PAGE_SIZE_QUERY_PARAM: page_size}
+        if ids is not None:
+            params["ids"] = ids
+        if cursor is not None:
+            params[PAGE_CURSOR_QUERY_PARAM] = cursor
+        try:
+            response = await self._client.get(
+                get_url_str(self._url, path),
+                params=params,
+            )
+        except httpx.HTTPError as e:
+            raise CheckConnectionError(str(e))
+        if response.is_success:
+            return response_type.model_validate(response.json())
+        raise get_check_exceptions(
+            status_code=response.status_code, content=response.json()
+        )
+
+    @override
+    async def get_check_templates_page(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        ids: list[CheckTemplateId] | None = None,
+        *,
+        page_size: int,
+        cursor: str | None = None,
+    ) -> Page[CheckTemplate]:
+        response = await self._get_page(
+            GET_CHECK_TEMPLATES_PATH,
+            APIOKResponseList[CheckTemplateAttributes, ListMeta | None],
+            ids,
+            page_size,
+            cursor,
+        )
+        return Page[CheckTemplate](
+            items=[
+                CheckTemplate(
+                    id=CheckTemplateId(check_template.id),
+                    attributes=check_template.attributes,
+                )
+                for check_template in response.data
+            ],
+            next_cursor=get_next_page_cursor(response.links),
+        )
+
     @override
     async def create_check(
         self: Self, auth_obj: AuthenticationObject, attributes: InCheckAttributes
@@ -95,29 +173,36 @@ class RestBackend(CheckBackend[AuthenticationObject]):
                 status_code=response.status_code, content=response.json()
             )
 
-    # @override
-    # async def update_check(
-    #     self: Self,
-    #     auth_obj: AuthenticationObject,
-    #     check_id: CheckId,
-    #     template_id: CheckTemplateId | None = None,
-    #     template_args: Json | None = None,
-    #     schedule: CronExpression | None = None,
-    # ) -> Check:
-    #     try:
-    #         response = await self._client.patch(
-    #             get_url_str(self._url, UPDATE_CHECK_PATH, path_params={"check_id": check_id})),
-    #             json={
-    #                 "template_id": template_id,
-    #                 "template_args": template_args,
-    #                 "schedule": schedule,
-    #             },
-    #         )
-    #     except httpx.HTTPError as e:
-    #         raise CheckConnectionError(str(e))
-    #     if response.is_success:
-    #         return Check.model_validate(response.json())
-    #     raise get_exception(status_code=response.status_code, content=response.json())
+    @override
+    async def update_check(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        check_id: CheckId,
+        attributes: InCheckUpdateAttributes,
+    ) -> OutCheck:
+        try:
+            response = await self._client.patch(
+                get_url_str(
+                    self._url, UPDATE_CHECK_PATH, path_params={"check_id": check_id}
+                ),
+                json=InCheckUpdate(
+                    data=InCheckUpdateData(id=check_id, attributes=attributes)
+                ).model_dump(exclude_unset=True),
+            )
+        except httpx.HTTPError as e:
+            raise CheckConnectionError(str(e))
+        if response.is_success:
+            structured_response = APIOKResponse[OutCheckAttributes].model_validate(
+                response.json()
+            )
+            return OutCheck(
+                id=CheckId(structured_response.data.id),
+                attributes=structured_response.data.attributes,
+            )
+        else:
+            raise get_check_exceptions(
+                status_code=response.status_code, content=response.json()
+            )
 
     @override
     async def remove_check(
@@ -152,17 +237,67 @@ class RestBackend(CheckBackend[AuthenticationObject]):
             raise CheckConnectionError(str(e))
         # TODO: stream this instead of accumulating everything first
         if response.is_success:
-            for check in (
-                APIOKResponseList[OutCheckAttributes, None]
-                .model_validate(response.json())
-                .data
-            ):
+            response_list = APIOKResponseList[
+                OutCheckAttributes, ListMeta | None
+            ].model_validate(response.json())
+            # The service may itself have left out the items of the services it combines
+            if response_list.meta is not None:
+                report_backend_errors(response_list.meta.errors)
+            for check in response_list.data:
                 yield OutCheck(id=CheckId(check.id), attributes=check.attributes)
         else:
             raise get_check_exceptions(
                 status_code=response.status_code, content=response.json()
             )
 
+    @override
+    async def get_checks_page(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        ids: list[CheckId] | None = None,
+        *,
+        page_size: int,
+        cursor: str | None = None,
+    ) -> Page[OutCheck]:
+        response = await self._get_page(
+            GET_CHECKS_PATH,
+            APIOKResponseList[OutCheckAttributes, ListMeta | None],
+            ids,
+            page_size,
+            cursor,
+        )
+        return Page[OutCheck](
+            items=[
+                OutCheck(id=CheckId(check.id), attributes=check.attributes)
+                for check in response.data
+            ],
+            next_cursor=get_next_page_cursor(response.links),
+        )
+
+    @override
+    async def get_check(
+        self: Self, auth_obj: AuthenticationObject, check_id: CheckId
+    ) -> OutCheck:
+        try:
+            response = await self._client.get(
+                get_url_str(
+                    self._url, GET_CHECK_PATH, path_params={"check_id": check_id}
+                )
+            )
+        except httpx.HTTPError as e:
+            raise CheckConnectionError(str(e))
+        if response.is_success:
+            structured_response = APIOKResponse[OutCheckAttributes].model_validate(
+                response.json()
+            )
+            return OutCheck(
+                id=CheckId(structured_response.data.id),
+                attributes=structured_response.data.attributes,
+            )
+        raise get_check_exceptions(
+            status_code=response.status_code, content=response.json()
+        )
+
     @override
     async def run_check(
         self: Self, auth_obj: AuthenticationObject, check_id: CheckId
@@ -180,3 +315,99 @@ class RestBackend(CheckBackend[AuthenticationObject]):
         raise get_check_exceptions(
             status_code=response.status_code, content=response.json()
         )
+
+    async def _post_bulk[T](
+        self: Self,
+        path: str,
+        body: BaseModel,
+        response_type: type[APIOKResponseList[T, ListMeta | None]],
+        count: int,
+    ) -> list[Resource[T] | Exception]:
+        """
+        Posts a bulk request for count items and returns the resource returned for
+        each item, or the exception for its error, in order.
+        """
+        try:
+            response = await self._client.post(
+                get_url_str(self._url, path),
+                json=body.model_dump(exclude_unset=True),
+            )
+        except httpx.HTTPError as e:
+            raise CheckConnectionError(str(e))
+        if not response.is_success:
+            raise get_check_exceptions(
+                status_code=response.status_code, content=response.json()
+            )
+        response_list = response_type.model_validate(response.json())
+        errors: dict[int, Exception] = {}
+        for error in response_list.meta.errors if response_list.meta else []:
+            index = bulk_item_index(error)
+            if index is not None and 0 <= index < count:
+                errors.setdefault(index, get_check_exception(error))
+        # The resources of the successful items are returned in order
+        if len(response_list.data) != count - len(errors):
+            raise CheckConnectionError(
+                f"Bulk response from {path} has {len(response_list.data)} resources and {len(errors)} errors for {count} items"
+            )
+        resources = iter(response_list.data)
+        return [
+            errors[index] if index in errors else next(resources)
+            for index in range(count)
+        ]
+
+    @override
+    async def create_checks(
+        self: Self,
+        auth_obj: AuthenticationObject,
+        attributes_list: list[InCheckAttributes],
+    ) -> list[OutCheck | Exception]:
+        return [
+            (
+                result
+                if isinstance(result, Exception)
+                else OutCheck(id=CheckId(result.id), attributes=result.attributes)
+            )
+            for result in await self._post_bulk(
+                BULK_CREATE_CHECKS_PATH,
+                InChecks(
+                    data=[
+                        InCheckData(attributes=attributes)
+                        for attributes in attributes_list
+                    ]
+                ),
+                APIOKResponseList[OutCheckAttributes, ListMeta | None],
+                len(attributes_list),
+            )
+        ]
+
+    @override
+    async def remove_checks(
+        self: Self, auth_obj: AuthenticationObject, check_ids: list[CheckId]
+    ) -> list[None | Exception]:
+        return [
+            result if isinstance(result, Exception) else None
+            for result in await self._post_bulk(
+                BULK_REMOVE_CHECKS_PATH,
+                CheckIdentifiers(
+                    data=[CheckIdentifier(id=check_id) for check_id in check_ids]
+                ),
+                APIOKResponseList[None, ListMeta | None],
+                len(check_ids),
+            )
+        ]
+
+    @override
+    async def run_checks(
+        self: Self, auth_obj: AuthenticationObject, check_ids: list[CheckId]
+    ) -> list[None | Exception]:
+        return [
+            result if isinstance(result, Exception) else None
+            for result in await self._post_bulk(
+                BULK_RUN_CHECKS_PATH,
+                CheckIdentifiers(
+                    data=[CheckIdentifier(id=check_id) for check_id in check_ids]
+                ),
+                APIOKResponseList[None, ListMeta | None],
+                len(check_ids),
+            )
+        ]
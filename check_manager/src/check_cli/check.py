@@ -2,6 +2,7 @@ import asyncio
 from base64 import b64encode
 import importlib
 import json
+import os
 from pathlib import Path
 from typer import Argument, Context, Exit, Option, Typer
 from typing import Optional
@@ -18,14 +19,23 @@ from check_backends.check_backend import (
     CronExpression,
     InCheckAttributes,
     InCheckMetadata,
+    InChecks,
 )
 from check_backends.k8s_backend import K8sBackend
 from check_backends.mock_backend import MockBackend
+from check_backends.reconcile import reconcile
 from check_backends.rest_backend import RestBackend
 from exceptions import CheckConnectionError
 from check_cli.check_config import config_app, make_default_config, ServiceName
 
 
+# How long to wait for each service when listing from all of them, no limit if unset
+AGGREGATION_TIMEOUT_SECONDS: float | None = (
+    float(os.environ["RH_CHECK_AGGREGATION_TIMEOUT_SECONDS"])
+    if os.environ.get("RH_CHECK_AGGREGATION_TIMEOUT_SECONDS")
+    else None
+)
+
 app = Typer(no_args_is_help=True)
 app.add_typer(config_app, name="config")
 list_app = Typer(no_args_is_help=True)
@@ -118,7 +128,7 @@ def load_backend() -> AggregationBackend:
         print("Make sure your services are correctly configured.")
         raise Exit()
 
-    backend = AggregationBackend(services)
+    backend = AggregationBackend(services, timeout_seconds=AGGREGATION_TIMEOUT_SECONDS)
 
     return backend
 
@@ -315,3 +325,46 @@ def delete_check(
     except APIException as e:
         print(f"Error: {e}")
         raise Exit()
+
+
+@app.command("reconcile")
+def reconcile_checks(
+    file: str,
+    auth_obj: Annotated[str, Option(default_factory=get_auth_obj)],
+):
+    """
+    Make the health checks with a client key be the ones in a file, changing only what differs.
+    """
+    if not Path(file).is_file():
+        print(f"Could not find file: {file}")
+        raise Exit()
+    with open(file, "r") as f:
+        in_checks = InChecks.model_validate_json(f.read())
+
+    check_backend = load_backend()
+    try:
+        result = asyncio.run(
+            reconcile(
+                check_backend,
+                auth_obj,
+                [in_check.attributes for in_check in in_checks.data],
+            )
+        )
+    except CheckConnectionError as e:
+        print(f"Encountered an error when trying to connect to service: {str(e)}")
+        raise Exit()
+    except APIException as e:
+        print(f"Error: {e}")
+        raise Exit()
+
+    print(
+        f"Created {result.created}, updated {result.updated}, "
+        f"left {result.unchanged} unchanged and removed "
+        f"{sum(exception is None for _, exception in result.removed)} health checks"
+    )
+    for in_check, check in zip(in_checks.data, result.checks):
+        if isinstance(check, Exception):
+            print(f"- Client key {in_check.attributes.metadata.client_key}: {check}")
+    for removed_check, exception in result.removed:
+        if exception is not None:
+            print(f"- Could not remove check with id:{removed_check.id}: {exception}")
@@ -1,11 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
 from functools import cache
 from inspect import isfunction
 import logging
 import pathlib
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable, Iterable, Sequence
 import os
 
-import plugin_utils
+import plugin_utils.runner
+from plugin_utils.metrics import HookMetrics
 from plugin_utils.loader import (
     load_plugins,
     convert_file_based_hooks_to_name_based_hooks,
@@ -15,6 +17,27 @@ from check_backends.check_backend import CheckIdError, CheckTemplateIdError
 
 logger = logging.getLogger("HEALTH_CHECK")
 
+# How many items access hooks are called for at the same time when filtering lists
+HOOK_CONCURRENCY: int = int(os.environ.get("RH_CHECK_HOOK_CONCURRENCY") or "16")
+# At most how many items batch access hooks are called with at once, 0 for no limit
+HOOK_BATCH_SIZE: int = int(os.environ.get("RH_CHECK_HOOK_BATCH_SIZE") or "500")
+# How many sync hooks are run at the same time, in threads off the event loop
+HOOK_THREADS: int = int(os.environ.get("RH_CHECK_HOOK_THREADS") or "8")
+# Comma separated names of the hooks whose functions don't depend on each other, so
+# are called at the same time instead of one by one, such as notification hooks
+CONCURRENT_HOOKS: list[str] = [
+    name.strip()
+    for name in (os.environ.get("RH_CHECK_CONCURRENT_HOOKS") or "").split(",")
+    if name.strip()
+]
+# Hook functions taking longer than this are logged, 0 for no logging
+SLOW_HOOK_SECONDS: float = float(os.environ.get("RH_CHECK_SLOW_HOOK_SECONDS") or "1")
+
+# How long the loaded hooks take, by hook and hook function
+hook_metrics = HookMetrics(
+    slow_seconds=SLOW_HOOK_SECONDS if SLOW_HOOK_SECONDS > 0 else None, logger=logger
+)
+
 
 async def call_hooks_check_if_allow(
     funcs: list[Callable], *args: Any, **kwargs: Any
@@ -24,18 +47,140 @@ async def call_hooks_check_if_allow(
     )
 
 
+async def call_hooks_check_if_allow_many(
+    funcs: list[Callable], args_list: Iterable[tuple[Any, ...]]
+) -> list[bool]:
+    """
+    Whether each tuple of arguments is allowed, in order. The hooks are called
+    for up to HOOK_CONCURRENCY of them at the same time.
+    """
+    return await plugin_utils.runner.call_hooks_check_if_allow_many(
+        (APIForbiddenError, CheckTemplateIdError, CheckIdError),
+        funcs,
+        args_list,
+        max_concurrency=HOOK_CONCURRENCY,
+    )
+
+
+async def call_batch_hooks_check_if_allow(
+    funcs: list[Callable], items: Sequence[Any], *args: Any
+) -> list[bool]:
+    """
+    Whether each item is allowed by batch hooks, which are called with args and a list
+    of items, and return whether each of those items is allowed.
+    """
+    return await plugin_utils.runner.call_batch_hooks_check_if_allow(
+        (APIForbiddenError, CheckTemplateIdError, CheckIdError),
+        funcs,
+        items,
+        *args,
+        batch_size=HOOK_BATCH_SIZE,
+    )
+
+
+async def access_mask[T](
+    items: list[T],
+    *,
+    batch_funcs: list[Callable] | None,
+    funcs: list[Callable] | None,
+    batch_args: tuple[Any, ...],
+    item_args: Callable[[T], tuple[Any, ...]],
+) -> list[bool]:
+    """
+    Whether each item is allowed by both the batch access hooks (batch_funcs, called
+    with batch_args and a list of items) and the per item access hooks (funcs, called
+    with item_args(item)). The per item hooks are only called for the items the batch
+    hooks allow. Either kind of hook may be missing (None).
+    """
+    allowed = [True] * len(items)
+    if batch_funcs:
+        allowed = await call_batch_hooks_check_if_allow(batch_funcs, items, *batch_args)
+    if funcs:
+        indices = [index for index, allow in enumerate(allowed) if allow]
+        for index, allow in zip(
+            indices,
+            await call_hooks_check_if_allow_many(
+                funcs, [item_args(items[index]) for index in indices]
+            ),
+        ):
+            allowed[index] = allow
+    return allowed
+
+
+class HookDispatcher:
+    """
+    The loaded hook functions by hook name, and one async function per hook calling
+    them, made once when first asked for. The functions of hooks without any hook
+    functions do nothing.
+    """
+
+    def __init__(self, hooks: dict[str, list[Callable]]) -> None:
+        self.hooks = hooks
+        self._until_not_none: dict[str, Callable[..., Awaitable[Any]]] = {}
+        self._ignore_results: dict[str, Callable[..., Awaitable[None]]] = {}
+        self._check_if_allow_batch: dict[str, Callable[..., Awaitable[list[bool]]]] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.hooks
+
+    def get(self, name: str) -> list[Callable] | None:
+        return self.hooks.get(name)
+
+    def until_not_none(self, name: str) -> Callable[..., Awaitable[Any]]:
+        """Returns the first result of the hook functions which is not None"""
+        if name not in self._until_not_none:
+            self._until_not_none[name] = plugin_utils.runner.bind_hooks_until_not_none(
+                self.hooks.get(name) or []
+            )
+        return self._until_not_none[name]
+
+    def ignore_results(self, name: str) -> Callable[..., Awaitable[None]]:
+        """Calls all the hook functions, which deny by raising an exception"""
+        if name not in self._ignore_results:
+            self._ignore_results[name] = plugin_utils.runner.bind_hooks_ignore_results(
+                self.hooks.get(name) or []
+            )
+        return self._ignore_results[name]
+
+    def check_if_allow_batch(self, name: str) -> Callable[..., Awaitable[list[bool]]]:
+        """
+        Same as call_batch_hooks_check_if_allow with the functions of the batch hook,
+        taking the items and then the other arguments.
+        """
+        if name not in self._check_if_allow_batch:
+            funcs = self.hooks.get(name)
+            if funcs:
+
+                async def check_if_allow(
+                    items: Sequence[Any], *args: Any
+                ) -> list[bool]:
+                    return await call_batch_hooks_check_if_allow(funcs, items, *args)
+
+            else:
+
+                async def check_if_allow(
+                    items: Sequence[Any], *args: Any
+                ) -> list[bool]:
+                    return [True] * len(items)
+
+            self._check_if_allow_batch[name] = check_if_allow
+        return self._check_if_allow_batch[name]
+
+
 @cache
 def load_hooks(
     hooks_dir: pathlib.Path | str | None = None,
-) -> dict[str, list[Callable]]:
+) -> HookDispatcher:
     """
     Each hook might have multiple functions. The files with earlier alphanumeric names
-    will have their hooks called earlier.
+    will have their hooks called earlier. Sync hook functions are run in a pool of
+    HOOK_THREADS threads, unless decorated with hook_utils.run_inline. Each call is
+    timed in hook_metrics.
     """
     hooks_dir = hooks_dir or os.environ.get("RH_CHECK_HOOK_DIR_PATH")
 
     if hooks_dir is None:
-        return {}
+        return HookDispatcher({})
 
     file_to_hooks: dict[str, dict[str, Callable]] = load_plugins(
         pathlib.Path(hooks_dir),
@@ -43,4 +188,11 @@ def load_hooks(
         logger=logger,
         perfile=True,
     )
-    return convert_file_based_hooks_to_name_based_hooks(file_to_hooks)
+    return HookDispatcher(
+        plugin_utils.runner.prepare_hooks(
+            convert_file_based_hooks_to_name_based_hooks(file_to_hooks),
+            ThreadPoolExecutor(max_workers=HOOK_THREADS, thread_name_prefix="hook"),
+            hook_metrics,
+            concurrent=CONCURRENT_HOOKS,
+        )
+    )
@@ -5,6 +5,7 @@ from eoepca_api_utils.exceptions import (
     APIUserInputError,  # noqa: F401 used by hooks which import this
 )
 import typing
+from plugin_utils.runner import run_inline  # noqa: F401 used by hooks which import this
 from check_backends.check_backend import (
     CheckTemplate,  # noqa: F401 used by hooks which import this
     CheckId,  # noqa: F401 used by hooks which import this
@@ -14,6 +15,8 @@ from check_backends.check_backend import (
     CheckIdError,  # noqa: F401 used by hooks which import this
 )
 import os as _os
+import hashlib as _hashlib
+import re as _re
 from kubernetes_asyncio.client.models.v1_cron_job import V1CronJob as K8sCronJob  # noqa: F401 used by hooks which import this
 from kubernetes_asyncio.client.api_client import ApiClient as K8sClient
 from kubernetes_asyncio.client.models.v1_secret import V1Secret as K8sSecret
@@ -203,3 +206,30 @@ async def create_k8s_secret(
 
     assert isinstance(api_response, K8sSecret)
     return api_response
+
+
+def k8s_label_value(value: str) -> str:
+    """
+    Returns the value if it is a valid Kubernetes label value (such as most usernames),
+    otherwise a valid label value derived from a hash of it.
+    """
+    if _re.fullmatch(r"(([A-Za-z0-9][-A-Za-z0-9_.]{0,61})?[A-Za-z0-9])?", value):
+        return value
+    return "sha256-" + _hashlib.sha256(value.encode("utf-8")).hexdigest()[:56]
+
+
+_NO_AUTH_CACHE_ATTRIBUTE = "_rh_no_auth_cache"
+
+
+def no_auth_cache[F: typing.Callable](func: F) -> F:
+    """
+    Decorator for on_auth hooks whose result must not be reused for later requests
+    with the same credentials, for example because it depends on something other
+    than the credentials, such as the current time or a revocation list.
+    """
+    setattr(func, _NO_AUTH_CACHE_ATTRIBUTE, True)
+    return func
+
+
+def is_auth_cacheable(func: typing.Callable) -> bool:
+    return not getattr(func, _NO_AUTH_CACHE_ATTRIBUTE, False)
@@ -46,6 +46,15 @@ class NewCheckClientSpecifiedId(APIForbiddenError):
         )
 
 
+class CheckIdMismatchError(APIException):
+    def __init__(self, detail: str) -> None:
+        super().__init__(
+            status="409",
+            title="Check id does not match the path",
+            detail=detail,
+        )
+
+
 class CheckConnectionError(APIException, ConnectionError):
     def __init__(self, detail: str) -> None:
         super().__init__(
@@ -53,3 +62,21 @@ class CheckConnectionError(APIException, ConnectionError):
             title="HTTP request failed",
             detail=detail,
         )
+
+
+class PageCursorExpiredError(APIException):
+    def __init__(self) -> None:
+        super().__init__(
+            status="410",
+            title="Page cursor expired",
+            detail="The page cursor has expired, start again from the first page",
+        )
+
+
+class CheckBackendTimeoutError(APIException):
+    def __init__(self) -> None:
+        super().__init__(
+            status="504",
+            title="Service timed out",
+            detail="The service took too long to respond",
+        )
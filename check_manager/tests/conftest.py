@@ -0,0 +1,68 @@
+import asyncio
+from typing import Any, AsyncIterable, Callable
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from check_backends.check_backend import CheckBackend, OutCheck
+
+
+@pytest.fixture
+def make_check() -> Callable[[str], OutCheck]:
+    """Makes a check with the given id"""
+
+    def make_check(check_id: str) -> OutCheck:
+        return OutCheck.model_validate(
+            {
+                "id": check_id,
+                "attributes": {
+                    "metadata": {
+                        "name": check_id,
+                        "description": None,
+                        "template_id": "template",
+                        "template_args": {},
+                    },
+                    "schedule": "* * * * *",
+                    "outcome_filter": {},
+                },
+            }
+        )
+
+    return make_check
+
+
+@pytest.fixture
+def make_backend(make_check: Callable[[str], OutCheck]) -> Callable[..., Mock]:
+    """
+    Makes a mock backend which has the checks with the given ids, waiting delay_seconds
+    before each check and raising error (if any) after the last one when listing.
+    list_calls counts how many times the checks were listed.
+    """
+
+    def make_backend(
+        check_ids: list[str],
+        *,
+        delay_seconds: float = 0,
+        error: Exception | None = None,
+    ) -> Mock:
+        backend = Mock(spec=CheckBackend)
+        backend.list_calls = 0
+
+        async def get_checks(auth_obj: Any, ids: Any = None) -> AsyncIterable[OutCheck]:
+            backend.list_calls += 1
+            for check_id in check_ids:
+                if ids is None or check_id in ids:
+                    await asyncio.sleep(delay_seconds)
+                    yield make_check(check_id)
+            if error is not None:
+                raise error
+
+        backend.get_checks = get_checks
+        backend.get_check = AsyncMock(
+            side_effect=lambda auth_obj, check_id: make_check(check_id)
+        )
+        backend.create_check = AsyncMock(return_value=make_check("new"))
+        backend.remove_check = AsyncMock()
+        return backend
+
+    return make_backend
@@ -0,0 +1,305 @@
+import asyncio
+import functools
+from typing import Any, AsyncIterable, Callable
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from check_backends.check_backend import (
+    AggregationBackend,
+    CheckBackend,
+    CheckId,
+    CheckIdError,
+    CheckTemplate,
+    CheckTemplateId,
+    CronExpression,
+    InCheckAttributes,
+    InCheckMetadata,
+    OutCheck,
+    collect_backend_errors,
+    offset_page,
+)
+from eoepca_api_utils.api_utils import encode_cursor
+from eoepca_api_utils.exceptions import APIBadRequestError
+from exceptions import CheckConnectionError
+
+
+async def test_get_checks_merges_backends_concurrently(
+    make_backend: Callable[..., Mock],
+) -> None:
+    backend = AggregationBackend(
+        [
+            make_backend(["slow_1", "slow_2"], delay_seconds=0.02),
+            make_backend(["fast_1", "fast_2"]),
+        ]
+    )
+
+    checks = [check.id async for check in backend.get_checks({})]
+
+    # Items are yielded as they arrive, so the slow backend doesn't delay the fast one
+    assert checks == ["fast_1", "fast_2", "slow_1", "slow_2"]
+
+
+async def test_get_checks_reports_failed_backends(
+    make_backend: Callable[..., Mock],
+) -> None:
+    backend = AggregationBackend(
+        [
+            make_backend(["a"], error=CheckConnectionError("Connection refused")),
+            make_backend(["b"]),
+            make_backend(["c"], delay_seconds=10),
+        ],
+        timeout_seconds=0.05,
+    )
+
+    with collect_backend_errors() as errors:
+        checks = [check.id async for check in backend.get_checks({})]
+
+    assert checks == ["a", "b"]
+    assert sorted((error.meta or {})["service_index"] for error in errors) == [0, 2]
+    assert {error.code for error in errors} == {
+        "CheckConnectionError",
+        "CheckBackendTimeoutError",
+    }
+
+    # Errors are raised when nobody collects them
+    with pytest.raises(CheckConnectionError):
+        [check async for check in backend.get_checks({})]
+
+
+async def test_get_checks_page_reports_failed_backends(
+    make_backend: Callable[..., Mock],
+) -> None:
+    backends: list[CheckBackend] = [
+        make_backend(["a"]),
+        make_backend([], error=CheckConnectionError("Connection refused")),
+        make_backend(["c"], delay_seconds=10),
+        make_backend(["d"]),
+    ]
+    for sub_backend in backends:
+        sub_backend.get_checks_page = functools.partial(  # type: ignore
+            CheckBackend.get_checks_page, sub_backend
+        )
+    backend: AggregationBackend[Any] = AggregationBackend(
+        backends, timeout_seconds=0.05
+    )
+
+    with collect_backend_errors() as errors:
+        page = await backend.get_checks_page({}, page_size=10)
+
+    assert [check.id for check in page.items] == ["a", "d"]
+    assert page.next_cursor is None
+    assert [(error.meta or {})["service_index"] for error in errors] == [1, 2]
+    assert [error.code for error in errors] == [
+        "CheckConnectionError",
+        "CheckBackendTimeoutError",
+    ]
+
+    # Errors are raised when nobody collects them
+    with pytest.raises(CheckConnectionError):
+        await backend.get_checks_page({}, page_size=10)
+
+
+async def test_get_checks_raises_when_all_backends_fail(
+    make_backend: Callable[..., Mock],
+) -> None:
+    backend = AggregationBackend(
+        [make_backend([], error=CheckConnectionError("Connection refused"))]
+    )
+
+    with collect_backend_errors() as errors:
+        with pytest.raises(CheckConnectionError):
+            [check async for check in backend.get_checks({})]
+    assert errors == []
+
+
+async def test_get_checks_closes_backends_when_closed_early(
+    make_check: Callable[[str], OutCheck],
+) -> None:
+    closed = asyncio.Event()
+
+    async def get_checks(auth_obj: Any, ids: Any = None) -> AsyncIterable[OutCheck]:
+        try:
+            for i in range(100):
+                await asyncio.sleep(0.001)
+                yield make_check(f"check_{i}")
+        finally:
+            closed.set()
+
+    sub_backend = Mock(spec=CheckBackend)
+    sub_backend.get_checks = get_checks
+    backend = AggregationBackend([sub_backend])
+
+    checks = aiter(backend.get_checks({}))
+    assert (await anext(checks)).id == CheckId("check_0")
+    await checks.aclose()  # type: ignore
+    assert closed.is_set()
+
+
+async def test_single_check_operations_go_to_the_owner(
+    make_backend: Callable[..., Mock],
+) -> None:
+    backends: list[CheckBackend] = [make_backend(["a"]), make_backend(["b"])]
+    for backend, owned in zip(backends, ["a", "b"]):
+
+        async def run_check(
+            auth_obj: Any, check_id: CheckId, owned: str = owned
+        ) -> None:
+            if check_id != owned:
+                raise CheckIdError(check_id)
+
+        backend.run_check = AsyncMock(side_effect=run_check)  # type: ignore
+    backend = AggregationBackend(backends)
+
+    # Unknown checks are looked for in all backends
+    await backend.run_check({}, CheckId("b"))
+    assert [b.run_check.call_count for b in backends] == [1, 1]  # type: ignore
+
+    await backend.run_check({}, CheckId("b"))
+    assert [b.run_check.call_count for b in backends] == [1, 2]  # type: ignore
+
+    # Listing records the owners too
+    [check async for check in backend.get_checks({})]
+    await backend.run_check({}, CheckId("a"))
+    assert [b.run_check.call_count for b in backends] == [2, 2]  # type: ignore
+
+    with pytest.raises(CheckIdError):
+        await backend.run_check({}, CheckId("c"))
+
+
+async def test_stale_owner_not_asked_again(
+    make_backend: Callable[..., Mock],
+) -> None:
+    backends: list[CheckBackend] = [make_backend([]), make_backend(["a"])]
+    backends[0].run_check = AsyncMock(side_effect=CheckIdError(CheckId("a")))  # type: ignore
+    backends[1].run_check = AsyncMock()  # type: ignore
+    backend: AggregationBackend[Any] = AggregationBackend(backends)
+    # Such as when the check moved to another backend
+    backend._check_owners.set("a", 0)
+
+    await backend.run_check({}, CheckId("a"))
+    assert [b.run_check.call_count for b in backends] == [1, 1]  # type: ignore
+    assert backend._check_owners.get("a") == 1
+
+    # Only the stale owner is left to say that the check doesn't exist
+    single: AggregationBackend[Any] = AggregationBackend(backends[:1])
+    single._check_owners.set("a", 0)
+    with pytest.raises(CheckIdError):
+        await single.run_check({}, CheckId("a"))
+    assert backends[0].run_check.call_count == 2
+
+
+async def test_create_check_goes_to_the_template_owner(
+    make_check: Callable[[str], OutCheck], make_backend: Callable[..., Mock]
+) -> None:
+    backends: list[CheckBackend] = [make_backend([]), make_backend([])]
+    for backend, template_ids in zip(backends, [["template_a"], ["template_b"]]):
+
+        async def get_check_templates(
+            auth_obj: Any, ids: Any = None, template_ids: list[str] = template_ids
+        ) -> AsyncIterable[CheckTemplate]:
+            for template_id in template_ids:
+                if ids is None or template_id in ids:
+                    yield CheckTemplate.model_validate(
+                        {
+                            "id": template_id,
+                            "attributes": {
+                                "metadata": {"label": None, "description": None},
+                                "arguments": {},
+                            },
+                        }
+                    )
+
+        backend.get_check_templates = get_check_templates  # type: ignore
+        backend.create_check = AsyncMock(return_value=make_check("new"))  # type: ignore
+        backend.get_check = AsyncMock(return_value=make_check("new"))  # type: ignore
+    backend = AggregationBackend(backends)
+
+    await backend.create_check(
+        {},
+        InCheckAttributes(
+            metadata=InCheckMetadata(
+                name="name",
+                description="description",
+                template_id=CheckTemplateId("template_b"),
+                template_args={},
+            ),
+            schedule=CronExpression("* * * * *"),
+        ),
+    )
+    assert [b.create_check.call_count for b in backends] == [0, 1]  # type: ignore
+
+    await backend.get_check({}, CheckId("new"))
+    assert [b.get_check.call_count for b in backends] == [0, 1]  # type: ignore
+
+    # The backend can be chosen explicitly, without changing the given attributes
+    attributes = InCheckAttributes(
+        metadata=InCheckMetadata(
+            name="name",
+            description="description",
+            template_id=CheckTemplateId("template_b"),
+            template_args={"service_index": 0, "url": "https://example.com"},
+        ),
+        schedule=CronExpression("* * * * *"),
+    )
+    await backend.create_check({}, attributes)
+    assert [b.create_check.call_count for b in backends] == [1, 1]  # type: ignore
+    created = backends[0].create_check.call_args.args[1]  # type: ignore
+    assert created.metadata.template_args == {"url": "https://example.com"}
+    assert attributes.metadata.template_args == {
+        "service_index": 0,
+        "url": "https://example.com",
+    }
+
+
+async def test_create_check_raises_when_no_backend_has_templates(
+    make_backend: Callable[..., Mock],
+) -> None:
+    backends: list[CheckBackend] = [make_backend([]), make_backend([])]
+    for backend in backends:
+
+        async def get_check_templates(
+            auth_obj: Any, ids: Any = None
+        ) -> AsyncIterable[CheckTemplate]:
+            raise CheckConnectionError("Connection refused")
+            yield
+
+        backend.get_check_templates = get_check_templates  # type: ignore
+    backend = AggregationBackend(backends)
+
+    with pytest.raises(CheckConnectionError):
+        await backend.create_check(
+            {},
+            InCheckAttributes(
+                metadata=InCheckMetadata(
+                    name="name",
+                    description="description",
+                    template_id=CheckTemplateId("template"),
+                    template_args={},
+                ),
+                schedule=CronExpression("* * * * *"),
+            ),
+        )
+    assert [b.create_check.call_count for b in backends] == [0, 0]  # type: ignore
+
+
+@pytest.mark.parametrize("state", [-1, 1.5, "1", [0, None]])
+async def test_offset_page_rejects_invalid_offsets(
+    state: Any, make_check: Callable[[str], OutCheck]
+) -> None:
+    async def items() -> AsyncIterable[OutCheck]:
+        yield make_check("a")
+
+    with pytest.raises(APIBadRequestError):
+        await offset_page(items(), 10, encode_cursor(state))
+
+
+async def test_get_checks_page_rejects_negative_backend_index(
+    make_backend: Callable[..., Mock],
+) -> None:
+    backend: AggregationBackend[Any] = AggregationBackend([make_backend(["a"])])
+
+    with pytest.raises(APIBadRequestError):
+        await backend.get_checks_page(
+            {}, page_size=10, cursor=encode_cursor([-1, None])
+        )
@@ -0,0 +1,112 @@
+import json
+
+import httpx
+import pytest
+
+from api_interface import BULK_RUN_CHECKS_PATH, bulk_item_error, bulk_item_index
+from check_backends.check_backend import CheckId, CheckIdError, gather_each
+from check_backends.rest_backend import RestBackend
+from eoepca_api_utils.json_api_types import Error, ErrorSourcePointer
+from exceptions import CheckConnectionError
+
+
+async def test_gather_each_returns_results_and_exceptions_in_order() -> None:
+    running = 0
+    max_running = 0
+
+    async def double(item: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        try:
+            if item == 3:
+                raise CheckIdError(CheckId(str(item)))
+            return item * 2
+        finally:
+            running -= 1
+
+    results = await gather_each(list(range(6)), double, max_concurrency=2)
+
+    assert results[:3] == [0, 2, 4]
+    assert isinstance(results[3], CheckIdError)
+    assert results[4:] == [8, 10]
+    assert max_running <= 2
+
+
+def test_bulk_item_error_points_to_the_item() -> None:
+    error = Error(status="404", code="CheckIdError", title="Check Id not found")
+    assert bulk_item_error(2, error).source == ErrorSourcePointer(pointer="/data/2")
+    assert bulk_item_index(bulk_item_error(2, error)) == 2
+
+    error.source = ErrorSourcePointer(pointer="/data/attributes/schedule")
+    assert bulk_item_error(3, error).source == ErrorSourcePointer(
+        pointer="/data/3/attributes/schedule"
+    )
+    assert bulk_item_index(bulk_item_error(3, error)) == 3
+    assert bulk_item_index(error) is None
+
+
+async def test_rest_backend_run_checks_in_one_request() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200,
+            json={
+                "data": [
+                    {"id": "a", "type": "check", "attributes": None},
+                    {"id": "c", "type": "check", "attributes": None},
+                ],
+                "meta": {
+                    "errors": [
+                        bulk_item_error(
+                            1, CheckIdError(CheckId("b")).error
+                        ).model_dump(),
+                        bulk_item_error(
+                            3, CheckConnectionError("Connection refused").error
+                        ).model_dump(),
+                    ]
+                },
+            },
+        )
+
+    backend = RestBackend("http://check-manager")
+    await backend.aclose()
+    backend._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        results = await backend.run_checks(
+            {}, [CheckId("a"), CheckId("b"), CheckId("c"), CheckId("d")]
+        )
+    finally:
+        await backend.aclose()
+
+    assert len(requests) == 1
+    assert requests[0].url.path == BULK_RUN_CHECKS_PATH
+    assert json.loads(requests[0].content) == {
+        "data": [{"id": "a"}, {"id": "b"}, {"id": "c"}, {"id": "d"}]
+    }
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], CheckIdError)
+    assert isinstance(results[3], CheckConnectionError)
+
+
+async def test_rest_backend_rejects_mismatched_bulk_response() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        # One resource is missing, and there's no error in its place
+        return httpx.Response(
+            200,
+            json={
+                "data": [{"id": "a", "type": "check", "attributes": None}],
+                "meta": {"errors": []},
+            },
+        )
+
+    backend = RestBackend("http://check-manager")
+    await backend.aclose()
+    backend._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        with pytest.raises(CheckConnectionError):
+            await backend.run_checks({}, [CheckId("a"), CheckId("b")])
+    finally:
+        await backend.aclose()
@@ -0,0 +1,71 @@
+import base64
+import json
+from unittest.mock import patch
+
+from fastapi.security import HTTPBasicCredentials
+
+from cache_utils import TTLCache, cache_metrics_text, credentials_cache_key, digest
+
+
+def test_digest_is_stable() -> None:
+    assert digest({"a": 1, "b": [1, 2]}) == digest({"b": [1, 2], "a": 1})
+    assert digest({"a": 1}) != digest({"a": 2})
+
+
+def test_least_recently_used_entry_dropped() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=None)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert 'rh_cache_hits_total{cache="lru"} 3' in cache_metrics_text(
+        {"lru": cache}, "rh_"
+    )
+    assert 'rh_cache_misses_total{cache="lru"} 1' in cache_metrics_text(
+        {"lru": cache}, "rh_"
+    )
+
+
+@patch("cache_utils.time.time")
+def test_entries_expire(mock_time) -> None:
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=60)
+    mock_time.return_value = 1000.0
+    cache.set("ttl", 1)
+    cache.set("earlier", 2, expires_at=1030.0)
+    cache.set("later", 3, expires_at=2000.0)
+
+    mock_time.return_value = 1040.0
+    assert cache.get("ttl") == 1
+    assert cache.get("earlier") is None
+    assert cache.get("later") == 3
+
+    mock_time.return_value = 1061.0
+    assert cache.get("ttl") is None
+    assert cache.get("later") is None
+    assert len(cache) == 0
+
+
+def test_credentials_cache_key() -> None:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": 1234}).encode()).decode()
+    jwt = f"header.{payload.rstrip('=')}.signature"
+
+    class Token:
+        def __init__(self, raw: str) -> None:
+            self.raw = raw
+
+    key = credentials_cache_key({"auth": Token(jwt), "refresh": None})
+    assert key is not None
+    assert key[1] == 1234
+    assert key == credentials_cache_key({"refresh": None, "auth": Token(jwt)})
+    assert key != credentials_cache_key({"auth": Token("other"), "refresh": None})
+    assert credentials_cache_key(
+        HTTPBasicCredentials(username="a", password="b")
+    ) != credentials_cache_key(HTTPBasicCredentials(username="a", password="c"))
+    assert credentials_cache_key(None) == (digest(None), None)
+    # Objects which can't be told apart reliably aren't cached
+    assert credentials_cache_key({"auth": object()}) is None
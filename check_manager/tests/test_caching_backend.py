@@ -0,0 +1,109 @@
+from typing import Any, AsyncIterable, Callable
+from unittest.mock import Mock, patch
+
+import pytest
+
+from check_backends.caching_backend import CachingBackend
+from check_backends.check_backend import (
+    CheckId,
+    CheckIdError,
+    OutCheck,
+    collect_backend_errors,
+    report_backend_errors,
+)
+from eoepca_api_utils.json_api_types import Error
+
+
+async def test_checks_cached_per_auth_object(make_backend: Callable[..., Mock]) -> None:
+    backend = make_backend(["a", "b"])
+    caching_backend = CachingBackend(backend)
+
+    for _ in range(2):
+        assert [
+            check.id async for check in caching_backend.get_checks({"user": "x"})
+        ] == ["a", "b"]
+    assert backend.list_calls == 1
+
+    [check async for check in caching_backend.get_checks({"user": "y"})]
+    [check async for check in caching_backend.get_checks({"user": "x"}, ["a"])]
+    assert backend.list_calls == 3
+
+    # Single checks are looked up from the cached list
+    assert (await caching_backend.get_check({"user": "x"}, CheckId("a"))).id == "a"
+    with pytest.raises(CheckIdError):
+        await caching_backend.get_check({"user": "x"}, CheckId("c"))
+    assert (await caching_backend.get_check({"user": "z"}, CheckId("b"))).id == "b"
+    backend.get_check.assert_called_once()
+
+
+async def test_checks_invalidated_on_create_and_remove(
+    make_backend: Callable[..., Mock],
+) -> None:
+    backend = make_backend(["a"])
+    caching_backend = CachingBackend(backend)
+
+    [check async for check in caching_backend.get_checks({})]
+    await caching_backend.create_check({}, Mock())
+    [check async for check in caching_backend.get_checks({})]
+    assert backend.list_calls == 2
+
+    backend.remove_check.side_effect = CheckIdError(CheckId("a"))
+    with pytest.raises(CheckIdError):
+        await caching_backend.remove_check({}, CheckId("a"))
+    [check async for check in caching_backend.get_checks({})]
+    assert backend.list_calls == 3
+
+
+@patch("cache_utils.time.time")
+async def test_checks_expire(
+    mock_time: Mock, make_backend: Callable[..., Mock]
+) -> None:
+    backend = make_backend(["a"])
+    caching_backend = CachingBackend(backend, ttl_seconds=10)
+
+    mock_time.return_value = 1000.0
+    [check async for check in caching_backend.get_checks({})]
+    mock_time.return_value = 1011.0
+    [check async for check in caching_backend.get_checks({})]
+    assert backend.list_calls == 2
+
+
+async def test_partial_lists_not_cached(
+    make_check: Callable[[str], OutCheck], make_backend: Callable[..., Mock]
+) -> None:
+    backend = make_backend(["a"])
+
+    async def get_checks(auth_obj: Any, ids: Any = None) -> AsyncIterable[OutCheck]:
+        backend.list_calls += 1
+        report_backend_errors([Error(status="500", code="Error", title="Failed")])
+        yield make_check("a")
+
+    backend.get_checks = get_checks
+    caching_backend = CachingBackend(backend)
+
+    for _ in range(2):
+        with collect_backend_errors() as errors:
+            [check async for check in caching_backend.get_checks({})]
+        assert len(errors) == 1
+    assert backend.list_calls == 2
+
+
+async def test_checks_not_cached_for_opaque_auth_objects(
+    make_backend: Callable[..., Mock],
+) -> None:
+    class User:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        def __str__(self) -> str:
+            return "user"
+
+    backend = make_backend(["a"])
+    caching_backend = CachingBackend(backend)
+
+    # Users which can't be told apart reliably don't share (or get) cached listings
+    [check async for check in caching_backend.get_checks(User("x"))]
+    [check async for check in caching_backend.get_checks(User("y"))]
+    assert backend.list_calls == 2
+    assert (await caching_backend.get_check(User("x"), CheckId("b"))).id == "b"
+    backend.get_check.assert_called_once()
@@ -0,0 +1,96 @@
+import pathlib
+from types import ModuleType
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from cache_utils import TTLCache
+from check_backends.caching_backend import CachingBackend
+from check_backends.check_backend import CheckBackend
+from check_backends.rest_backend import RestBackend
+from check_hooks import HookDispatcher
+
+
+@pytest.fixture
+def check_api(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> ModuleType:
+    monkeypatch.setenv("RH_CHECK_API_BASE_URL", "http://localhost")
+    import check_api
+
+    monkeypatch.setattr(check_api, "BACKEND_CACHE_TTL_SECONDS", 10.0)
+    # Restored after the test, as the entry points replace it
+    monkeypatch.setattr(check_api, "check_backend", check_api.check_backend)
+    # uvicorn_dev writes openapi.json in the current directory
+    monkeypatch.chdir(tmp_path)
+    return check_api
+
+
+@patch("uvicorn.run")
+@patch("check_backends.k8s_backend.K8sBackend", new_callable=MagicMock)
+def test_k8s_entry_point_caches_the_backend(
+    k8s_backend: MagicMock, uvicorn_run: MagicMock, check_api: ModuleType
+) -> None:
+    check_api.uvicorn_k8s()
+
+    backend = check_api.check_backend
+    assert isinstance(backend, CachingBackend)
+    assert backend._backend is k8s_backend.__getitem__.return_value.return_value
+    uvicorn_run.assert_called_once()
+
+
+@patch("uvicorn.run")
+async def test_rest_entry_point_caches_the_backend(
+    uvicorn_run: MagicMock, check_api: ModuleType, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("BACKEND", "REST")
+    check_api.uvicorn_dev()
+
+    backend = check_api.check_backend
+    assert isinstance(backend, CachingBackend)
+    assert isinstance(backend._backend, RestBackend)
+    await backend.aclose()
+
+
+async def test_backend_closed_on_shutdown(
+    check_api: ModuleType, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    backend = AsyncMock(spec=CheckBackend)
+    monkeypatch.setattr(check_api, "check_backend", backend)
+
+    async with check_api.app.router.lifespan_context(check_api.app):
+        backend.aclose.assert_not_called()
+    backend.aclose.assert_awaited_once()
+
+
+async def test_metrics_include_the_auth_cache(check_api: ModuleType) -> None:
+    check_api.auth_cache.get("missing")
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=check_api.app), base_url="http://localhost"
+    ) as client:
+        response = await client.get(check_api.METRICS_PATH)
+    text = response.text
+    assert response.status_code == 200
+    assert (
+        response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+    )
+    assert "# TYPE rh_check_hook_duration_seconds histogram" in text
+    assert 'rh_check_cache_misses_total{cache="auth"} ' in text
+
+
+async def test_cached_auth_objects_copied(
+    check_api: ModuleType, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    on_auth = AsyncMock(side_effect=lambda auth_info: {"groups": ["admin"]})
+    monkeypatch.setattr(check_api, "loaded_hooks", HookDispatcher({"on_auth": []}))
+    monkeypatch.setattr(check_api, "on_auth_hook", on_auth)
+    monkeypatch.setattr(check_api, "auth_cache", TTLCache(max_size=10, ttl_seconds=10))
+
+    first = await check_api.authenticate({"username": "user"})
+    # Such as a hook adding to the authentication object of its request
+    first["groups"].append("changed")
+    second = await check_api.authenticate({"username": "user"})
+    second["groups"].append("changed")
+
+    assert await check_api.authenticate({"username": "user"}) == {"groups": ["admin"]}
+    on_auth.assert_called_once()
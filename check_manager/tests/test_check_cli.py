@@ -0,0 +1,18 @@
+from unittest.mock import patch
+
+from check_cli import check
+from check_cli.check_config import ServiceName
+
+
+@patch("check_cli.check.AGGREGATION_TIMEOUT_SECONDS", 5.0)
+@patch("check_cli.check.load_config")
+async def test_load_backend_sets_aggregation_timeout(mock_load_config) -> None:
+    mock_load_config.return_value = {
+        "services": [{"name": ServiceName.rest.value, "arg": "http://check-manager"}]
+    }
+
+    backend = check.load_backend()
+    try:
+        assert backend._timeout_seconds == 5.0
+    finally:
+        await backend.aclose()
@@ -0,0 +1,80 @@
+import base64
+import json
+from unittest.mock import patch
+
+from check_backends.k8s_backend.client_pool import ApiClientPool, credential_expiry
+from check_hooks.hook_utils import k8s_config
+
+
+async def test_client_reused_for_equal_configurations() -> None:
+    pool = ApiClientPool()
+    try:
+        async with pool.client(k8s_config(host="https://a")) as client_1:
+            pass
+        async with pool.client(k8s_config(host="https://a")) as client_2:
+            pass
+        async with pool.client(
+            k8s_config(host="https://a", api_key={"x": "y"})
+        ) as client_3:
+            pass
+
+        assert client_1 is client_2
+        assert client_1 is not client_3
+        assert len(pool) == 2
+    finally:
+        await pool.aclose()
+    assert len(pool) == 0
+
+
+async def test_least_recently_used_idle_client_evicted() -> None:
+    pool = ApiClientPool(max_size=1)
+    try:
+        async with pool.client(k8s_config(host="https://a")) as client_a:
+            async with pool.client(k8s_config(host="https://b")):
+                # Clients in use are never evicted
+                assert len(pool) == 2
+            # The bound is exceeded, so the idle client is closed
+            assert len(pool) == 1
+        assert len(pool) == 1
+
+        async with pool.client(k8s_config(host="https://b")) as client_b:
+            pass
+        async with pool.client(k8s_config(host="https://a")) as client_a_again:
+            pass
+        assert client_a is not client_a_again
+        assert client_b is not client_a_again
+    finally:
+        await pool.aclose()
+
+
+async def test_idle_client_evicted_after_timeout() -> None:
+    pool = ApiClientPool(idle_timeout_seconds=10)
+    try:
+        with patch(
+            "check_backends.k8s_backend.client_pool.time.monotonic"
+        ) as monotonic:
+            monotonic.return_value = 100.0
+            async with pool.client(k8s_config(host="https://a")):
+                pass
+            monotonic.return_value = 200.0
+            async with pool.client(k8s_config(host="https://b")):
+                # Closed as soon as another client is taken
+                assert len(pool) == 1
+        assert len(pool) == 1
+    finally:
+        await pool.aclose()
+
+
+def test_credential_expiry() -> None:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": 1234}).encode()).decode()
+    jwt = f"header.{payload.rstrip('=')}.signature"
+
+    assert (
+        credential_expiry(k8s_config(api_key={"authorization": f"Bearer {jwt}"}))
+        == 1234
+    )
+    assert (
+        credential_expiry(k8s_config(api_key={"authorization": "Bearer opaque"}))
+        is None
+    )
+    assert credential_expiry(k8s_config()) is None
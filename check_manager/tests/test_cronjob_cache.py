@@ -0,0 +1,266 @@
+import asyncio
+import base64
+import json
+from typing import Any, Callable
+from unittest.mock import AsyncMock, Mock, patch
+
+from kubernetes_asyncio.client.models.v1_cron_job import V1CronJob
+from kubernetes_asyncio.client.models.v1_cron_job_list import V1CronJobList
+from kubernetes_asyncio.client.models.v1_cron_job_spec import V1CronJobSpec
+from kubernetes_asyncio.client.models.v1_job_template_spec import V1JobTemplateSpec
+from kubernetes_asyncio.client.models.v1_list_meta import V1ListMeta
+from kubernetes_asyncio.client.models.v1_object_meta import V1ObjectMeta
+from kubernetes_asyncio.client.rest import ApiException
+import pytest
+
+from check_backends.k8s_backend.cronjob_cache import CronjobCache, CronjobInformer
+from check_backends.k8s_backend.templates import default_make_check
+from check_backends.check_backend import CheckId
+from check_hooks.hook_utils import k8s_config
+
+NAMESPACE: str = "resource-health"
+
+
+def make_cronjob(name: str, resource_version: str = "1") -> V1CronJob:
+    return V1CronJob(
+        metadata=V1ObjectMeta(name=name, resource_version=resource_version),
+        spec=V1CronJobSpec(schedule="* * * * *", job_template=V1JobTemplateSpec()),
+    )
+
+
+def make_event(type: str, cronjob: V1CronJob) -> dict[str, Any]:
+    return {
+        "type": type,
+        "object": cronjob,
+        "raw_object": {
+            "metadata": {
+                "name": cronjob.metadata.name,
+                "resourceVersion": cronjob.metadata.resource_version,
+            }
+        },
+    }
+
+
+class FakeWatch:
+    """Streams the given batches of events, one batch per watch request, then blocks"""
+
+    def __init__(self, batches: list[list[dict[str, Any] | Exception]]) -> None:
+        self.batches = batches
+        self.calls: list[dict[str, Any]] = []
+
+    def __call__(self) -> "FakeWatch":
+        return self
+
+    def stream(self, func: Callable, **kwargs: Any) -> "FakeWatch":
+        self.calls.append(kwargs)
+        return self
+
+    async def __aenter__(self) -> "FakeWatch":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+    async def __aiter__(self):  # type: ignore
+        if not self.batches:
+            await asyncio.Event().wait()
+        for event in self.batches.pop(0):
+            if isinstance(event, Exception):
+                raise event
+            yield event
+
+
+async def wait_until(condition: Callable[[], bool]) -> None:
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0)
+    assert condition()
+
+
+@patch("check_backends.k8s_backend.cronjob_cache.client.BatchV1Api")
+async def test_informer_list_and_watch(mock_batch_v1_api: Mock) -> None:
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = AsyncMock(
+        return_value=V1CronJobList(
+            items=[make_cronjob("a"), make_cronjob("b")],
+            metadata=V1ListMeta(resource_version="10"),
+        )
+    )
+    fake_watch = FakeWatch(
+        [
+            [
+                make_event("ADDED", make_cronjob("c", "11")),
+                make_event("DELETED", make_cronjob("a", "12")),
+                make_event("MODIFIED", make_cronjob("b", "13")),
+            ]
+        ]
+    )
+
+    informer = CronjobInformer(k8s_config(), NAMESPACE, default_make_check)
+    with patch("check_backends.k8s_backend.cronjob_cache.watch.Watch", fake_watch):
+        try:
+            await informer.wait_synced()
+            await wait_until(lambda: informer.get(CheckId("a")) is None)
+
+            assert [cached.check.id for cached in informer.list()] == ["b", "c"]
+            assert [cached.check.id for cached in informer.list(["c", "d"])] == ["c"]
+            assert informer.get(CheckId("b")).cronjob.metadata.resource_version == "13"  # type: ignore
+            assert fake_watch.calls[0]["resource_version"] == "10"
+            await wait_until(lambda: len(fake_watch.calls) == 2)
+            assert fake_watch.calls[1]["resource_version"] == "13"
+        finally:
+            await informer.aclose()
+
+    mock_batch_v1_api.return_value.list_namespaced_cron_job.assert_called_once()
+
+
+@patch("check_backends.k8s_backend.cronjob_cache.client.BatchV1Api")
+async def test_informer_skips_bad_events(mock_batch_v1_api: Mock) -> None:
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = AsyncMock(
+        return_value=V1CronJobList(
+            items=[make_cronjob("a")],
+            metadata=V1ListMeta(resource_version="10"),
+        )
+    )
+    fake_watch = FakeWatch(
+        [
+            [
+                {"type": "ADDED", "object": None, "raw_object": {}},
+                make_event("ADDED", make_cronjob("b", "12")),
+            ]
+        ]
+    )
+
+    informer = CronjobInformer(k8s_config(), NAMESPACE, default_make_check)
+    with patch("check_backends.k8s_backend.cronjob_cache.watch.Watch", fake_watch):
+        try:
+            await informer.wait_synced()
+            await wait_until(lambda: informer.get(CheckId("b")) is not None)
+
+            assert [cached.check.id for cached in informer.list()] == ["a", "b"]
+            assert not informer.is_stopped()
+            await wait_until(lambda: len(fake_watch.calls) == 2)
+            assert fake_watch.calls[1]["resource_version"] == "12"
+        finally:
+            await informer.aclose()
+
+
+@patch("check_backends.k8s_backend.cronjob_cache.client.BatchV1Api")
+async def test_informer_relists_when_watch_expires(mock_batch_v1_api: Mock) -> None:
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = AsyncMock(
+        side_effect=[
+            V1CronJobList(
+                items=[make_cronjob("a")],
+                metadata=V1ListMeta(resource_version="10"),
+            ),
+            V1CronJobList(
+                items=[make_cronjob("b")],
+                metadata=V1ListMeta(resource_version="20"),
+            ),
+        ]
+    )
+    fake_watch = FakeWatch([[ApiException(status=410)]])
+
+    informer = CronjobInformer(k8s_config(), NAMESPACE, default_make_check)
+    with patch("check_backends.k8s_backend.cronjob_cache.watch.Watch", fake_watch):
+        try:
+            await informer.wait_synced()
+            await wait_until(lambda: informer.get(CheckId("b")) is not None)
+
+            assert [cached.check.id for cached in informer.list()] == ["b"]
+            await wait_until(lambda: len(fake_watch.calls) == 2)
+            assert fake_watch.calls[1]["resource_version"] == "20"
+        finally:
+            await informer.aclose()
+
+
+@patch("check_backends.k8s_backend.cronjob_cache.client.BatchV1Api")
+async def test_informer_raises_when_first_list_fails(mock_batch_v1_api: Mock) -> None:
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = AsyncMock(
+        side_effect=ApiException(status=403)
+    )
+
+    cronjob_cache = CronjobCache(default_make_check)
+    try:
+        with pytest.raises(ApiException):
+            await cronjob_cache.informer(k8s_config(), NAMESPACE)
+        assert cronjob_cache.peek(k8s_config(), NAMESPACE) is None
+    finally:
+        await cronjob_cache.aclose()
+
+
+@patch("check_backends.k8s_backend.cronjob_cache.client.BatchV1Api")
+async def test_cache_reuses_and_bounds_informers(mock_batch_v1_api: Mock) -> None:
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = AsyncMock(
+        return_value=V1CronJobList(
+            items=[make_cronjob("a")],
+            metadata=V1ListMeta(resource_version="10"),
+        )
+    )
+
+    cronjob_cache = CronjobCache(default_make_check, max_informers=1)
+    with patch("check_backends.k8s_backend.cronjob_cache.watch.Watch", FakeWatch([])):
+        try:
+            informer = await cronjob_cache.informer(k8s_config(), NAMESPACE)
+            assert await cronjob_cache.informer(k8s_config(), NAMESPACE) is informer
+            assert (
+                mock_batch_v1_api.return_value.list_namespaced_cron_job.call_count == 1
+            )
+
+            await cronjob_cache.informer(k8s_config(), "other-namespace")
+            assert cronjob_cache.peek(k8s_config(), NAMESPACE) is None
+            assert (
+                mock_batch_v1_api.return_value.list_namespaced_cron_job.call_count == 2
+            )
+        finally:
+            await cronjob_cache.aclose()
+
+
+@patch("check_backends.k8s_backend.cronjob_cache.client.BatchV1Api")
+async def test_cache_replaces_informers_no_longer_authorized(
+    mock_batch_v1_api: Mock,
+) -> None:
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = AsyncMock(
+        side_effect=[
+            V1CronJobList(
+                items=[make_cronjob("a")],
+                metadata=V1ListMeta(resource_version="10"),
+            ),
+            V1CronJobList(
+                items=[make_cronjob("b")],
+                metadata=V1ListMeta(resource_version="20"),
+            ),
+        ]
+    )
+    fake_watch = FakeWatch([[ApiException(status=401)]])
+
+    cronjob_cache = CronjobCache(default_make_check)
+    with patch("check_backends.k8s_backend.cronjob_cache.watch.Watch", fake_watch):
+        try:
+            informer = await cronjob_cache.informer(k8s_config(), NAMESPACE)
+            await wait_until(informer.is_stopped)
+
+            # The stopped informer drops its copy and isn't handed out any more
+            assert informer.list() == []
+            assert cronjob_cache.peek(k8s_config(), NAMESPACE) is None
+            new_informer = await cronjob_cache.informer(k8s_config(), NAMESPACE)
+            assert new_informer is not informer
+            assert [cached.check.id for cached in new_informer.list()] == ["b"]
+        finally:
+            await cronjob_cache.aclose()
+
+
+@patch("check_backends.k8s_backend.cronjob_cache.time.time")
+def test_informer_stops_when_credentials_expire(mock_time: Mock) -> None:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": 1000}).encode()).decode()
+    jwt = f"header.{payload.rstrip('=')}.signature"
+    informer = CronjobInformer(
+        k8s_config(api_key={"authorization": f"Bearer {jwt}"}),
+        NAMESPACE,
+        default_make_check,
+    )
+
+    mock_time.return_value = 999.0
+    assert not informer.is_stopped()
+    mock_time.return_value = 1000.0
+    assert informer.is_stopped()
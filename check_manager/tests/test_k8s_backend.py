@@ -1,21 +1,31 @@
+import asyncio
 import contextlib
 import json
 import os
-from typing import Callable, NewType
+from typing import Any, Callable, NewType
 from unittest.mock import AsyncMock, Mock, patch
 
 import aiohttp
+import jsonschema
 from kubernetes_asyncio import client, config  # noqa: F401, used through reflection
 from kubernetes_asyncio.client.models.v1_cron_job import V1CronJob
+from kubernetes_asyncio.client.models.v1_cron_job_list import V1CronJobList
 from kubernetes_asyncio.client.models.v1_cron_job_spec import V1CronJobSpec
 from kubernetes_asyncio.client.models.v1_job_list import V1JobList
 from kubernetes_asyncio.client.models.v1_job_template_spec import V1JobTemplateSpec
+from kubernetes_asyncio.client.models.v1_list_meta import V1ListMeta
 from kubernetes_asyncio.client.models.v1_object_meta import V1ObjectMeta
 from kubernetes_asyncio.client.rest import ApiException
 import pytest
 
-from eoepca_api_utils.exceptions import APIInternalError
-from check_backends.k8s_backend import K8sBackend
+from eoepca_api_utils.api_utils import encode_cursor
+from eoepca_api_utils.exceptions import (
+    APIBadRequestError,
+    APIForbiddenError,
+    APIInternalError,
+)
+from check_backends.k8s_backend import K8sBackend, json_make_checks
+from check_backends.k8s_backend.templates import json_make_check, load_templates
 from check_backends.check_backend import (
     CheckId,
     CheckIdError,
@@ -24,9 +34,13 @@ from check_backends.check_backend import (
     CronExpression,
     InCheckAttributes,
     InCheckMetadata,
+    InCheckUpdateAttributes,
+    InCheckUpdateMetadata,
+    OutCheck,
+    collect_backend_errors,
 )
 from check_hooks.hook_utils import k8s_config
-from exceptions import CheckConnectionError
+from exceptions import CheckConnectionError, PageCursorExpiredError
 
 AuthenticationObject = NewType("AuthenticationObject", dict[str, str])
 
@@ -90,6 +104,47 @@ cronjob_3 = V1CronJob(
     ),
 )
 
+# Example of cronjob whose template arguments aren't JSON, so isn't a valid check
+cronjob_bad_args = V1CronJob(
+    metadata=V1ObjectMeta(
+        name="bad-args",
+        annotations={"template_args": "{"},
+    ),
+    spec=V1CronJobSpec(
+        schedule=str(schedule),
+        job_template=V1JobTemplateSpec(),
+    ),
+)
+
+
+def list_cronjobs(*results: object) -> AsyncMock:
+    """
+    Mock of list_namespaced_cron_job returning the results in turn (the last one from
+    then on), with only the cron job named in the field selector if there is one, and
+    as a raw JSON response when asked for one
+    """
+    remaining = list(results)
+
+    async def list_namespaced_cron_job(**kwargs: object) -> object:
+        result: Any = remaining.pop(0) if len(remaining) > 1 else remaining[0]
+        if isinstance(result, BaseException) or isinstance(result, type):
+            raise result
+        if kwargs.get("field_selector"):
+            name = str(kwargs["field_selector"]).removeprefix("metadata.name=")
+            result = type(result)(
+                items=[item for item in result.items if item.metadata.name == name],
+                metadata=result.metadata,
+            )
+        if kwargs.get("_preload_content", True):
+            return result
+        response = Mock(status=200)
+        response.read = AsyncMock(
+            return_value=json.dumps(result.to_dict(serialize=True)).encode()
+        )
+        return response
+
+    return AsyncMock(side_effect=list_namespaced_cron_job)
+
 
 @pytest.fixture(autouse=True)
 def setup_template_env() -> None:
@@ -190,6 +245,46 @@ async def test_get_check_templates(
     mock_batch_v1_api.assert_not_called()
 
 
+async def test_check_templates_made_once() -> None:
+    with patch(
+        "pydantic.BaseModel.model_json_schema", autospec=True
+    ) as model_json_schema:
+        model_json_schema.return_value = {"type": "object"}
+        k8s_backend = K8sBackend[AuthenticationObject](
+            template_dirs=TEMPLATES,
+            hooks=make_hooks(AsyncMock()),
+        )
+        for _ in range(3):
+            templates = [
+                template
+                async for template in k8s_backend.get_check_templates(
+                    AuthenticationObject(test_auth)
+                )
+            ]
+
+    # One schema per template class, however often the templates are listed
+    assert model_json_schema.call_count == len(templates)
+
+
+def test_template_args_validated_without_checking_the_schema_again() -> None:
+    template = load_templates(TEMPLATES)[template_id]
+    schema = template.check_template.attributes.arguments
+    bad_args = {"endpoint": 1}
+
+    with patch.object(
+        type(template.arguments_validator), "check_schema"
+    ) as check_schema:
+        template.validate_template_args(template_args)
+        with pytest.raises(jsonschema.ValidationError) as error_info:
+            template.validate_template_args(bad_args)
+    check_schema.assert_not_called()
+
+    # The same error as validating against the schema directly
+    with pytest.raises(jsonschema.ValidationError) as expected_info:
+        jsonschema.validate(bad_args, schema)
+    assert error_info.value.message == expected_info.value.message
+
+
 @pytest.mark.parametrize(
     "template_ids, expected_error_id",
     [
@@ -430,9 +525,8 @@ async def test_get_checks(
     expected: int | None,
     mock_api_client: Mock,
 ) -> None:
-    mock_batch_v1_api.return_value.list_namespaced_cron_job = AsyncMock(
-        side_effect=side_effect,
-        return_value=V1JobList(items=[cronjob_1, cronjob_2, cronjob_3]),
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = list_cronjobs(
+        side_effect or V1JobList(items=[cronjob_1, cronjob_2, cronjob_3]),
     )
 
     k8s_backend = K8sBackend[AuthenticationObject](
@@ -451,12 +545,276 @@ async def test_get_checks(
 
         assert len(check_list) == expected
 
-        mock_batch_v1_api.assert_called_once()
-        mock_batch_v1_api.return_value.list_namespaced_cron_job.assert_called_once()
+        mock_batch_v1_api.assert_called()
+        # A few ids are each looked up by name
+        calls = mock_batch_v1_api.return_value.list_namespaced_cron_job.call_args_list
+        if check_ids is None:
+            assert len(calls) == 1
+            assert not calls[0].kwargs["field_selector"]
+        else:
+            assert [call.kwargs["field_selector"] for call in calls] == [
+                f"metadata.name={check_id}" for check_id in check_ids
+            ]
+        call_kwargs = calls[0].kwargs
+        assert call_kwargs["namespace"] == NAMESPACE
+        # Without access hooks, the checks are read from the JSON of the cron jobs
+        assert call_kwargs["_preload_content"] is False
+
+
+@patch("check_backends.k8s_backend.LIST_PAGE_SIZE", 2)
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_get_checks_paged(
+    mock_batch_v1_api: Mock,
+    mock_api_client: Mock,
+) -> None:
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = list_cronjobs(
+        V1CronJobList(
+            items=[cronjob_1, cronjob_2],
+            metadata=V1ListMeta(_continue="next_page"),
+        ),
+        V1CronJobList(items=[cronjob_3], metadata=V1ListMeta()),
+    )
+
+    k8s_backend = K8sBackend[AuthenticationObject](
+        template_dirs=TEMPLATES,
+        hooks=make_hooks(mock_api_client),
+    )
+
+    check_async_iterator = aiter(
+        k8s_backend.get_checks(AuthenticationObject(test_auth))
+    )
+    assert (await anext(check_async_iterator)).id == check_id_1
+    # The first check is available before the next page is requested
+    mock_batch_v1_api.return_value.list_namespaced_cron_job.assert_called_once()
+
+    assert [check.id async for check in check_async_iterator] == [
+        check_id_2,
+        check_id_3,
+    ]
+    calls = mock_batch_v1_api.return_value.list_namespaced_cron_job.call_args_list
+    assert [call.kwargs["limit"] for call in calls] == [2, 2]
+    assert [call.kwargs["_continue"] for call in calls] == ["", "next_page"]
+
+
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_get_checks_page(
+    mock_batch_v1_api: Mock,
+    mock_api_client: Mock,
+) -> None:
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = list_cronjobs(
+        V1CronJobList(
+            items=[cronjob_1, cronjob_2],
+            metadata=V1ListMeta(_continue="next_page"),
+        ),
+        V1CronJobList(items=[cronjob_3], metadata=V1ListMeta()),
+        ApiException(status=410),
+        ApiException(status=400),
+    )
+
+    k8s_backend = K8sBackend[AuthenticationObject](
+        template_dirs=TEMPLATES,
+        hooks=make_hooks(mock_api_client),
+    )
+    auth = AuthenticationObject(test_auth)
+
+    page = await k8s_backend.get_checks_page(auth, page_size=2)
+    assert [check.id for check in page.items] == [check_id_1, check_id_2]
+    assert page.next_cursor == encode_cursor("next_page")
+
+    page = await k8s_backend.get_checks_page(auth, page_size=2, cursor=page.next_cursor)
+    assert [check.id for check in page.items] == [check_id_3]
+    assert page.next_cursor is None
+
+    calls = mock_batch_v1_api.return_value.list_namespaced_cron_job.call_args_list
+    assert [call.kwargs["limit"] for call in calls] == [2, 2]
+    assert [call.kwargs["_continue"] for call in calls] == ["", "next_page"]
+
+    with pytest.raises(PageCursorExpiredError):
+        await k8s_backend.get_checks_page(
+            auth, page_size=2, cursor=encode_cursor("expired")
+        )
+    # Cursors which aren't encoded continue tokens don't reach the cluster
+    with pytest.raises(APIBadRequestError):
+        await k8s_backend.get_checks_page(auth, page_size=2, cursor="next_page")
+    assert len(calls) == 3
+    # Continue tokens the cluster rejects make invalid cursors too
+    with pytest.raises(APIBadRequestError):
+        await k8s_backend.get_checks_page(
+            auth, page_size=2, cursor=encode_cursor("malformed")
+        )
+
+
+@patch("check_backends.k8s_backend.cronjob_cache.watch.Watch")
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_get_checks_page_cronjob_cache(
+    mock_batch_v1_api: Mock,
+    mock_watch: Mock,
+    mock_api_client: Mock,
+) -> None:
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = AsyncMock(
+        return_value=V1CronJobList(
+            items=[cronjob_3, cronjob_1, cronjob_2],
+            metadata=V1ListMeta(resource_version="1"),
+        ),
+    )
+    # The watch never sees any events
+    mock_watch.return_value.stream.return_value.__aenter__ = AsyncMock(
+        side_effect=asyncio.Event().wait
+    )
+
+    k8s_backend = K8sBackend[AuthenticationObject](
+        template_dirs=TEMPLATES,
+        hooks=make_hooks(mock_api_client),
+        cronjob_cache=True,
+    )
+    auth = AuthenticationObject(test_auth)
+
+    try:
+        page = await k8s_backend.get_checks_page(auth, page_size=2)
+        assert [check.id for check in page.items] == [check_id_1, check_id_2]
+        assert page.next_cursor is not None
+
+        page = await k8s_backend.get_checks_page(
+            auth, page_size=2, cursor=page.next_cursor
+        )
+        assert [check.id for check in page.items] == [check_id_3]
+        assert page.next_cursor is None
+    finally:
+        await k8s_backend.aclose()
+
+
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_get_checks_access_hooks_concurrent(
+    mock_batch_v1_api: Mock,
+    mock_api_client: Mock,
+) -> None:
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = AsyncMock(
+        return_value=V1JobList(items=[cronjob_1, cronjob_2, cronjob_3]),
+    )
+    running = 0
+    max_running = 0
+
+    async def on_k8s_cronjob_access(auth, check_id, api_client, cronjob) -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        # The first check takes the longest, but still comes first
+        await asyncio.sleep(0.01 if check_id == check_id_1 else 0)
+        running -= 1
+        if check_id == check_id_2:
+            raise CheckIdError(check_id)
+
+    hooks = make_hooks(mock_api_client)
+    hooks["on_k8s_cronjob_access"] = [on_k8s_cronjob_access]
+    k8s_backend = K8sBackend[AuthenticationObject](
+        template_dirs=TEMPLATES,
+        hooks=hooks,
+    )
+
+    assert [
+        check.id
+        async for check in k8s_backend.get_checks(AuthenticationObject(test_auth))
+    ] == [check_id_1, check_id_3]
+    assert max_running == 3
+
+
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_get_checks_access_batch_hook(
+    mock_batch_v1_api: Mock,
+    mock_api_client: Mock,
+) -> None:
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = AsyncMock(
+        return_value=V1JobList(items=[cronjob_1, cronjob_2, cronjob_3]),
+    )
+    mock_batch_v1_api.return_value.read_namespaced_cron_job = AsyncMock(
+        return_value=cronjob_2,
+    )
+    on_k8s_cronjob_access_batch = Mock(
+        side_effect=lambda auth, api_client, cronjobs: [
+            cronjob.metadata.name != check_id_2 for cronjob in cronjobs
+        ]
+    )
+    on_k8s_cronjob_access = Mock(return_value=None)
+
+    hooks = make_hooks(mock_api_client)
+    hooks["on_k8s_cronjob_access_batch"] = [on_k8s_cronjob_access_batch]
+    hooks["on_k8s_cronjob_access"] = [on_k8s_cronjob_access]
+    k8s_backend = K8sBackend[AuthenticationObject](
+        template_dirs=TEMPLATES,
+        hooks=hooks,
+    )
+    auth = AuthenticationObject(test_auth)
+
+    assert [check.id async for check in k8s_backend.get_checks(auth)] == [
+        check_id_1,
+        check_id_3,
+    ]
+    on_k8s_cronjob_access_batch.assert_called_once()
+    # The per item hooks are only called for the cron jobs the batch hooks allow
+    assert [call.args[1] for call in on_k8s_cronjob_access.call_args_list] == [
+        check_id_1,
+        check_id_3,
+    ]
+
+    with pytest.raises(CheckIdError):
+        await k8s_backend.get_check(auth, CheckId(check_id_2))
+    with pytest.raises(CheckIdError):
+        await k8s_backend.run_check(auth, CheckId(check_id_2))
+
+
+@pytest.mark.parametrize(
+    ("side_effect, allow, expectation"),
+    [
+        (None, True, contextlib.nullcontext()),
+        (None, False, pytest.raises(CheckIdError)),
+        (ApiException(status=404), True, pytest.raises(CheckIdError)),
+        (ApiException(), True, pytest.raises(ApiException)),
+        (
+            aiohttp.ClientConnectionError(),
+            True,
+            pytest.raises(CheckConnectionError),
+        ),
+    ],
+)
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_get_check(
+    mock_batch_v1_api: Mock,
+    side_effect: Exception | None,
+    allow: bool,
+    expectation: contextlib.AbstractContextManager,
+    mock_api_client: Mock,
+) -> None:
+    mock_batch_v1_api.return_value.read_namespaced_cron_job = AsyncMock(
+        side_effect=side_effect,
+        return_value=cronjob_1,
+    )
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = AsyncMock()
+
+    def on_k8s_cronjob_access(*_) -> None:
+        if not allow:
+            raise APIForbiddenError(title="Forbidden", detail="Access denied")
+
+    hooks = make_hooks(mock_api_client)
+    hooks["on_k8s_cronjob_access"] = [on_k8s_cronjob_access]
+    k8s_backend = K8sBackend[AuthenticationObject](
+        template_dirs=TEMPLATES,
+        hooks=hooks,
+    )
+
+    with expectation:
+        check = await k8s_backend.get_check(
+            AuthenticationObject(test_auth),
+            CheckId(check_id_1),
+        )
+
+        assert check.id == check_id_1
+        assert check.attributes.metadata.template_id == template_id
         call_kwargs = (
-            mock_batch_v1_api.return_value.list_namespaced_cron_job.call_args.kwargs
+            mock_batch_v1_api.return_value.read_namespaced_cron_job.call_args.kwargs
         )
+        assert call_kwargs["name"] == check_id_1
         assert call_kwargs["namespace"] == NAMESPACE
+    mock_batch_v1_api.return_value.list_namespaced_cron_job.assert_not_called()
 
 
 @pytest.mark.parametrize(
@@ -554,3 +912,526 @@ async def test_run_check(
         assert (
             call_kwargs_create["body"].metadata.owner_references[0].uid == check_uuid_1
         )
+
+
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_update_check_schedule_only(
+    mock_batch_v1_api: Mock,
+    mock_api_client: Mock,
+) -> None:
+    mock_batch_v1_api.return_value.read_namespaced_cron_job = AsyncMock(
+        return_value=cronjob_1,
+    )
+    mock_batch_v1_api.return_value.patch_namespaced_cron_job = AsyncMock(
+        return_value=cronjob_1,
+    )
+
+    k8s_backend = K8sBackend[AuthenticationObject](
+        template_dirs=TEMPLATES,
+        hooks=make_hooks(mock_api_client),
+    )
+    try:
+        await k8s_backend.update_check(
+            AuthenticationObject(test_auth),
+            CheckId(check_id_1),
+            InCheckUpdateAttributes(
+                schedule=CronExpression("0 * * * *"),
+                metadata=InCheckUpdateMetadata(description="New description"),
+            ),
+        )
+    finally:
+        await k8s_backend.aclose()
+
+    call_kwargs = (
+        mock_batch_v1_api.return_value.patch_namespaced_cron_job.call_args.kwargs
+    )
+    assert call_kwargs["name"] == check_id_1
+    # The job template is left alone, as neither the template nor its arguments changed
+    assert call_kwargs["body"] == {
+        "spec": {"schedule": "0 * * * *"},
+        "metadata": {"annotations": {"description": "New description"}},
+    }
+
+
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_update_check_template_args(
+    mock_batch_v1_api: Mock,
+    mock_api_client: Mock,
+) -> None:
+    mock_batch_v1_api.return_value.read_namespaced_cron_job = AsyncMock(
+        return_value=cronjob_1,
+    )
+    mock_batch_v1_api.return_value.patch_namespaced_cron_job = AsyncMock(
+        return_value=cronjob_1,
+    )
+    new_template_args = {**template_args, "endpoint": "www.example.org"}
+
+    k8s_backend = K8sBackend[AuthenticationObject](
+        template_dirs=TEMPLATES,
+        hooks=make_hooks(mock_api_client),
+    )
+    try:
+        await k8s_backend.update_check(
+            AuthenticationObject(test_auth),
+            CheckId(check_id_1),
+            InCheckUpdateAttributes(
+                metadata=InCheckUpdateMetadata(template_args=new_template_args)
+            ),
+        )
+    finally:
+        await k8s_backend.aclose()
+
+    body = mock_batch_v1_api.return_value.patch_namespaced_cron_job.call_args.kwargs[
+        "body"
+    ]
+    assert "schedule" not in body["spec"]
+    assert body["spec"]["jobTemplate"]["$patch"] == "replace"
+    assert "www.example.org" in json.dumps(body["spec"]["jobTemplate"])
+    assert json.loads(body["metadata"]["annotations"]["template_args"]) == (
+        new_template_args
+    )
+    assert "name" not in body["metadata"]["annotations"]
+
+
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_update_check_missing(
+    mock_batch_v1_api: Mock,
+    mock_api_client: Mock,
+) -> None:
+    mock_batch_v1_api.return_value.read_namespaced_cron_job = AsyncMock(
+        side_effect=ApiException(status=404),
+    )
+    mock_batch_v1_api.return_value.patch_namespaced_cron_job = AsyncMock()
+
+    k8s_backend = K8sBackend[AuthenticationObject](
+        template_dirs=TEMPLATES,
+        hooks=make_hooks(mock_api_client),
+    )
+    try:
+        with pytest.raises(CheckIdError):
+            await k8s_backend.update_check(
+                AuthenticationObject(test_auth),
+                CheckId(check_id_1),
+                InCheckUpdateAttributes(schedule=CronExpression("0 * * * *")),
+            )
+    finally:
+        await k8s_backend.aclose()
+    mock_batch_v1_api.return_value.patch_namespaced_cron_job.assert_not_called()
+
+
+@patch("check_backends.k8s_backend.cronjob_cache.watch.Watch")
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_get_checks_cronjob_cache(
+    mock_batch_v1_api: Mock,
+    mock_watch: Mock,
+    mock_api_client: Mock,
+) -> None:
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = AsyncMock(
+        return_value=V1CronJobList(
+            items=[cronjob_2, cronjob_3],
+            metadata=V1ListMeta(resource_version="1"),
+        ),
+    )
+    mock_batch_v1_api.return_value.create_namespaced_cron_job = AsyncMock(
+        return_value=cronjob_1,
+    )
+    mock_batch_v1_api.return_value.read_namespaced_cron_job = AsyncMock(
+        return_value=cronjob_3,
+    )
+    mock_batch_v1_api.return_value.delete_namespaced_cron_job = AsyncMock()
+    # The watch never sees any events
+    mock_watch.return_value.stream.return_value.__aenter__ = AsyncMock(
+        side_effect=asyncio.Event().wait
+    )
+
+    k8s_backend = K8sBackend[AuthenticationObject](
+        template_dirs=TEMPLATES,
+        hooks=make_hooks(mock_api_client),
+        cronjob_cache=True,
+    )
+    auth = AuthenticationObject(test_auth)
+
+    try:
+        assert [check.id async for check in k8s_backend.get_checks(auth)] == [
+            check_id_2,
+            check_id_3,
+        ]
+
+        await k8s_backend.create_check(
+            auth,
+            InCheckAttributes(
+                metadata=InCheckMetadata(
+                    name=check_name,
+                    description=check_description,
+                    template_id=CheckTemplateId(template_id),
+                    template_args=template_args,
+                ),
+                schedule=CronExpression(schedule),
+            ),
+        )
+        await k8s_backend.remove_check(auth, CheckId(check_id_3))
+
+        assert [check.id async for check in k8s_backend.get_checks(auth)] == [
+            check_id_2,
+            check_id_1,
+        ]
+        assert [
+            check.id async for check in k8s_backend.get_checks(auth, [check_id_1])
+        ] == [check_id_1]
+        assert (await k8s_backend.get_check(auth, CheckId(check_id_2))).id == check_id_2
+        with pytest.raises(CheckIdError):
+            await k8s_backend.get_check(auth, CheckId(check_id_3))
+        mock_batch_v1_api.return_value.list_namespaced_cron_job.assert_called_once()
+    finally:
+        await k8s_backend.aclose()
+
+
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_k8s_config_cached(
+    mock_batch_v1_api: Mock,
+    mock_api_client: Mock,
+) -> None:
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = list_cronjobs(
+        V1JobList(items=[cronjob_1]),
+        ApiException(status=401),
+        V1JobList(items=[cronjob_1]),
+    )
+    get_k8s_config = Mock(return_value=k8s_config())
+    get_k8s_namespace = Mock(return_value=NAMESPACE)
+
+    k8s_backend = K8sBackend[AuthenticationObject](
+        template_dirs=TEMPLATES,
+        hooks={
+            "get_k8s_config": [get_k8s_config],
+            "get_k8s_namespace": [get_k8s_namespace],
+        },
+    )
+    auth = AuthenticationObject(test_auth)
+
+    try:
+        assert len([check async for check in k8s_backend.get_checks(auth)]) == 1
+        with pytest.raises(ApiException):
+            async for _ in k8s_backend.get_checks(auth):
+                pass
+        assert get_k8s_config.call_count == 1
+        assert get_k8s_namespace.call_count == 1
+
+        # Unauthorized response means the configuration is fetched again
+        assert len([check async for check in k8s_backend.get_checks(auth)]) == 1
+        assert get_k8s_config.call_count == 2
+        assert get_k8s_namespace.call_count == 2
+    finally:
+        await k8s_backend.aclose()
+
+
+class OpaqueUser:
+    """An authentication object which isn't JSON, so can't be told apart from others by its contents"""
+
+    def __init__(self, username: str) -> None:
+        self.username = username
+
+    def __str__(self) -> str:
+        return "user"
+
+
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_k8s_config_not_cached_for_opaque_auth(
+    mock_batch_v1_api: Mock,
+    mock_api_client: Mock,
+) -> None:
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = list_cronjobs(
+        V1JobList(items=[cronjob_1]),
+        V1JobList(items=[cronjob_1]),
+    )
+    get_k8s_namespace = Mock(side_effect=lambda auth: f"ns-{auth.username}")
+
+    k8s_backend = K8sBackend[OpaqueUser](
+        template_dirs=TEMPLATES,
+        hooks={
+            "get_k8s_config": [Mock(return_value=k8s_config())],
+            "get_k8s_namespace": [get_k8s_namespace],
+        },
+    )
+
+    try:
+        for username in ["alice", "bob"]:
+            assert (
+                len(
+                    [
+                        check
+                        async for check in k8s_backend.get_checks(OpaqueUser(username))
+                    ]
+                )
+                == 1
+            )
+        # Each user gets their own namespace rather than the one cached for the other
+        assert get_k8s_namespace.call_count == 2
+        namespaces = [
+            call.kwargs["namespace"]
+            for call in mock_batch_v1_api.return_value.list_namespaced_cron_job.call_args_list
+        ]
+        assert namespaces == ["ns-alice", "ns-bob"]
+    finally:
+        await k8s_backend.aclose()
+
+
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_cronjob_labels(
+    mock_batch_v1_api: Mock,
+    mock_api_client: Mock,
+) -> None:
+    owner_label = "resource-health.eoepca.org/owner"
+    mock_batch_v1_api.return_value.create_namespaced_cron_job = AsyncMock(
+        return_value=cronjob_1,
+    )
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = list_cronjobs(
+        V1JobList(items=[cronjob_1]),
+    )
+    # cronjob_2 doesn't have the owner label
+    mock_batch_v1_api.return_value.read_namespaced_cron_job = AsyncMock(
+        return_value=cronjob_2,
+    )
+    mock_batch_v1_api.return_value.delete_namespaced_cron_job = AsyncMock()
+
+    hooks = make_hooks(mock_api_client)
+    hooks["get_k8s_cronjob_labels"] = [lambda _: {owner_label: "alice"}]
+    k8s_backend = K8sBackend[AuthenticationObject](
+        template_dirs=TEMPLATES,
+        hooks=hooks,
+    )
+    auth = AuthenticationObject(test_auth)
+
+    await k8s_backend.create_check(
+        auth,
+        InCheckAttributes(
+            metadata=InCheckMetadata(
+                name=check_name,
+                description=check_description,
+                template_id=CheckTemplateId(template_id),
+                template_args=template_args,
+            ),
+            schedule=CronExpression(schedule),
+        ),
+    )
+    body = mock_batch_v1_api.return_value.create_namespaced_cron_job.call_args.kwargs[
+        "body"
+    ]
+    assert body.metadata.labels[owner_label] == "alice"
+    assert body.metadata.labels["resource-health.eoepca.org/template-id"] == template_id
+
+    assert len([check async for check in k8s_backend.get_checks(auth)]) == 1
+    call_kwargs = (
+        mock_batch_v1_api.return_value.list_namespaced_cron_job.call_args.kwargs
+    )
+    assert call_kwargs["label_selector"] == f"{owner_label}=alice"
+
+    with pytest.raises(CheckIdError):
+        await k8s_backend.get_check(auth, CheckId(check_id_2))
+    with pytest.raises(CheckIdError):
+        await k8s_backend.remove_check(auth, CheckId(check_id_2))
+    mock_batch_v1_api.return_value.delete_namespaced_cron_job.assert_not_called()
+
+
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_cronjob_labels_not_cached_for_opaque_auth(
+    mock_batch_v1_api: Mock,
+    mock_api_client: Mock,
+) -> None:
+    owner_label = "resource-health.eoepca.org/owner"
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = list_cronjobs(
+        V1JobList(items=[cronjob_1]),
+    )
+
+    hooks = make_hooks(mock_api_client)
+    hooks["get_k8s_cronjob_labels"] = [lambda auth: {owner_label: auth.username}]
+    k8s_backend = K8sBackend[OpaqueUser](
+        template_dirs=TEMPLATES,
+        hooks=hooks,
+    )
+
+    try:
+        for username in ["alice", "bob"]:
+            async for _ in k8s_backend.get_checks(OpaqueUser(username)):
+                pass
+            call_kwargs = (
+                mock_batch_v1_api.return_value.list_namespaced_cron_job.call_args.kwargs
+            )
+            # Each user only sees their own cronjobs rather than those of the other
+            assert call_kwargs["label_selector"] == f"{owner_label}={username}"
+    finally:
+        await k8s_backend.aclose()
+
+
+@patch("check_backends.k8s_backend.ID_FIELD_SELECTOR_MAX_IDS", 1)
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_get_checks_many_ids(
+    mock_batch_v1_api: Mock,
+    mock_api_client: Mock,
+) -> None:
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = list_cronjobs(
+        V1JobList(items=[cronjob_1, cronjob_2, cronjob_3]),
+    )
+
+    k8s_backend = K8sBackend[AuthenticationObject](
+        template_dirs=TEMPLATES,
+        hooks=make_hooks(mock_api_client),
+    )
+    checks = [
+        check.id
+        async for check in k8s_backend.get_checks(
+            AuthenticationObject(test_auth), [check_id_3, check_id_1, check_id_4]
+        )
+    ]
+
+    # Too many ids to look up one by one, so the namespace is listed once
+    assert checks == [check_id_1, check_id_3]
+    mock_batch_v1_api.return_value.list_namespaced_cron_job.assert_called_once()
+
+
+def test_checks_reused_for_unchanged_cronjobs() -> None:
+    def cronjob_json(resource_version: str, schedule: str) -> dict:
+        return {
+            "metadata": {
+                "name": check_id_1,
+                "uid": check_uuid_1,
+                "resourceVersion": resource_version,
+                "annotations": {"name": check_name},
+            },
+            "spec": {"schedule": schedule},
+        }
+
+    check = json_make_check(cronjob_json("1", schedule))
+    with (
+        patch(
+            "check_backends.k8s_backend.templates.OutCheck", wraps=OutCheck
+        ) as mock_out_check,
+        patch.object(
+            OutCheck, "model_copy", autospec=True, side_effect=OutCheck.model_copy
+        ) as mock_model_copy,
+    ):
+        reused = json_make_check(cronjob_json("1", schedule))
+    # The cached check is handed out without making it again or copying it deeply
+    mock_out_check.assert_not_called()
+    assert [call.kwargs.get("deep", False) for call in mock_model_copy.mock_calls] == [
+        False
+    ]
+    assert reused == check
+    assert reused.attributes is check.attributes
+
+    changed = json_make_check(cronjob_json("2", "0 * * * *"))
+    assert changed is not check
+    assert changed.attributes.schedule == "0 * * * *"
+
+
+def test_malformed_cronjobs_reported() -> None:
+    cronjobs: list[dict] = [
+        {"metadata": {"name": "no-spec"}},
+        {"metadata": {"name": check_id_1}, "spec": {"schedule": schedule}},
+        {
+            "metadata": {
+                "name": "bad-args",
+                "annotations": {"template_args": "{"},
+            },
+            "spec": {"schedule": schedule},
+        },
+    ]
+
+    with collect_backend_errors() as errors:
+        checks = json_make_checks(cronjobs)
+
+    assert [check.id for check in checks] == [check_id_1]
+    assert [error.detail for error in errors] == [
+        "Cron job no-spec is not a valid check",
+        "Cron job bad-args is not a valid check",
+    ]
+
+
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_malformed_cronjobs_reported_with_access_hooks(
+    mock_batch_v1_api: Mock,
+    mock_api_client: Mock,
+) -> None:
+    hidden_bad_args = V1CronJob(
+        metadata=V1ObjectMeta(
+            name="hidden-bad-args",
+            annotations={"template_args": "{"},
+        ),
+        spec=V1CronJobSpec(
+            schedule=str(schedule),
+            job_template=V1JobTemplateSpec(),
+        ),
+    )
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = list_cronjobs(
+        V1CronJobList(items=[cronjob_bad_args, cronjob_1, hidden_bad_args])
+    )
+
+    def on_k8s_cronjob_access(auth, check_id, api_client, cronjob) -> None:
+        if check_id == "hidden-bad-args":
+            raise CheckIdError(check_id)
+
+    hooks = make_hooks(mock_api_client)
+    hooks["on_k8s_cronjob_access"] = [on_k8s_cronjob_access]
+    k8s_backend = K8sBackend[AuthenticationObject](
+        template_dirs=TEMPLATES,
+        hooks=hooks,
+    )
+
+    with collect_backend_errors() as errors:
+        checks = [
+            check
+            async for check in k8s_backend.get_checks(AuthenticationObject(test_auth))
+        ]
+
+    assert [check.id for check in checks] == [check_id_1]
+    # Cron jobs hidden by the access hooks aren't reported either
+    assert [error.detail for error in errors] == [
+        "Cron job bad-args is not a valid check"
+    ]
+
+
+@patch("check_backends.k8s_backend.cronjob_cache.watch.Watch")
+@patch("test_k8s_backend.client.BatchV1Api")
+async def test_malformed_cronjobs_reported_with_cronjob_cache(
+    mock_batch_v1_api: Mock,
+    mock_watch: Mock,
+    mock_api_client: Mock,
+) -> None:
+    mock_batch_v1_api.return_value.list_namespaced_cron_job = AsyncMock(
+        return_value=V1CronJobList(
+            items=[cronjob_2, cronjob_bad_args, cronjob_1],
+            metadata=V1ListMeta(resource_version="1"),
+        ),
+    )
+    # The watch never sees any events
+    mock_watch.return_value.stream.return_value.__aenter__ = AsyncMock(
+        side_effect=asyncio.Event().wait
+    )
+
+    k8s_backend = K8sBackend[AuthenticationObject](
+        template_dirs=TEMPLATES,
+        hooks=make_hooks(mock_api_client),
+        cronjob_cache=True,
+    )
+    auth = AuthenticationObject(test_auth)
+
+    try:
+        with collect_backend_errors() as errors:
+            checks = [check async for check in k8s_backend.get_checks(auth)]
+        assert [check.id for check in checks] == [check_id_2, check_id_1]
+        assert [error.detail for error in errors] == [
+            "Cron job bad-args is not a valid check"
+        ]
+
+        # Only the page the cron job would have been listed in reports it
+        with collect_backend_errors() as errors:
+            page = await k8s_backend.get_checks_page(auth, page_size=1)
+        assert [check.id for check in page.items] == [check_id_1]
+        assert len(errors) == 1
+        with collect_backend_errors() as errors:
+            page = await k8s_backend.get_checks_page(
+                auth, page_size=1, cursor=page.next_cursor
+            )
+        assert [check.id for check in page.items] == [check_id_2]
+        assert errors == []
+    finally:
+        await k8s_backend.aclose()
@@ -0,0 +1,150 @@
+from typing import Any, AsyncIterable
+from unittest.mock import AsyncMock, Mock
+
+from check_backends.check_backend import (
+    CheckBackend,
+    CheckTemplateId,
+    CronExpression,
+    InCheckAttributes,
+    InCheckMetadata,
+    OutCheck,
+    OutCheckAttributes,
+    OutCheckMetadata,
+)
+from check_backends.reconcile import ClientKeyError, plan_reconcile, reconcile
+from exceptions import CheckConnectionError
+
+
+def make_attributes(
+    client_key: str | None, schedule: str = "* * * * *"
+) -> InCheckAttributes:
+    return InCheckAttributes(
+        metadata=InCheckMetadata(
+            name=f"check {client_key}",
+            description="description",
+            template_id=CheckTemplateId("template"),
+            template_args={"script": "https://example.com/script.py"},
+            client_key=client_key,
+        ),
+        schedule=CronExpression(schedule),
+    )
+
+
+def make_check(check_id: str, attributes: InCheckAttributes) -> OutCheck:
+    return OutCheck(
+        id=check_id,
+        attributes=OutCheckAttributes(
+            metadata=OutCheckMetadata(**attributes.metadata.model_dump()),
+            schedule=attributes.schedule,
+            outcome_filter={},
+        ),
+    )
+
+
+def test_plan_reconcile() -> None:
+    current = [
+        make_check("1", make_attributes("same")),
+        make_check("2", make_attributes("changed")),
+        make_check("3", make_attributes("stale")),
+        make_check("4", make_attributes("same")),
+        make_check("5", make_attributes(None)),
+    ]
+    desired = [
+        make_attributes("same"),
+        make_attributes("changed", schedule="0 * * * *"),
+        make_attributes("new"),
+        make_attributes("new"),
+        make_attributes(None),
+    ]
+
+    plan = plan_reconcile(desired, current)
+
+    assert [(index, check.id) for index, check in plan.unchanged] == [(0, "1")]
+    assert [(index, check.id) for index, check in plan.update] == [(1, "2")]
+    assert plan.create == [2]
+    # Duplicates of a key are removed, and checks without a key are left alone
+    assert sorted(check.id for check in plan.remove) == ["3", "4"]
+    assert [index for index, _ in plan.errors] == [3, 4]
+    assert all(isinstance(error, ClientKeyError) for _, error in plan.errors)
+
+
+async def test_reconcile_without_changes_only_lists() -> None:
+    desired = [make_attributes(str(i)) for i in range(5000)]
+    current = [
+        make_check(f"id_{i}", attributes) for i, attributes in enumerate(desired)
+    ]
+    backend = Mock(spec=CheckBackend)
+    backend.list_calls = 0
+
+    async def get_checks(auth_obj: Any, ids: Any = None) -> AsyncIterable[OutCheck]:
+        backend.list_calls += 1
+        for check in current:
+            yield check
+
+    backend.get_checks = get_checks
+    backend.create_checks = AsyncMock(return_value=[])
+    backend.remove_checks = AsyncMock(return_value=[])
+
+    result = await reconcile(backend, {}, desired)
+
+    assert backend.list_calls == 1
+    assert result.unchanged == 5000 and result.created == result.updated == 0
+    assert result.checks == current
+    assert result.removed == []
+
+
+async def test_reconcile_updates_changed_checks_in_place() -> None:
+    current = [make_check("id_1", make_attributes("a"))]
+    desired = [make_attributes("a", schedule="0 * * * *")]
+    backend = Mock(spec=CheckBackend)
+
+    async def get_checks(auth_obj: Any, ids: Any = None) -> AsyncIterable[OutCheck]:
+        for check in current:
+            yield check
+
+    backend.get_checks = get_checks
+    backend.create_checks = AsyncMock(return_value=[])
+    backend.update_checks = AsyncMock(return_value=[make_check("id_1", desired[0])])
+    backend.remove_checks = AsyncMock(return_value=[])
+
+    result = await reconcile(backend, {}, desired)
+
+    assert result.updated == 1
+    [(check_id, attributes)] = backend.update_checks.call_args.args[1]
+    assert check_id == "id_1"
+    assert attributes.schedule == "0 * * * *"
+    assert backend.remove_checks.call_args.args[1] == []
+
+
+async def test_reconcile_does_not_count_failed_checks() -> None:
+    current = [
+        make_check("id_1", make_attributes("a")),
+        make_check("id_2", make_attributes("b")),
+    ]
+    desired = [
+        make_attributes("a", schedule="0 * * * *"),
+        make_attributes("b", schedule="0 * * * *"),
+        make_attributes("c"),
+        make_attributes("d"),
+    ]
+    backend = Mock(spec=CheckBackend)
+
+    async def get_checks(auth_obj: Any, ids: Any = None) -> AsyncIterable[OutCheck]:
+        for check in current:
+            yield check
+
+    backend.get_checks = get_checks
+    backend.create_checks = AsyncMock(
+        return_value=[make_check("id_3", desired[2]), CheckConnectionError("c")]
+    )
+    backend.update_checks = AsyncMock(
+        return_value=[CheckConnectionError("a"), make_check("id_2", desired[1])]
+    )
+    backend.remove_checks = AsyncMock(return_value=[])
+
+    result = await reconcile(backend, {}, desired)
+
+    assert result.created == 1
+    assert result.updated == 1
+    assert isinstance(result.checks[0], CheckConnectionError)
+    assert isinstance(result.checks[3], CheckConnectionError)
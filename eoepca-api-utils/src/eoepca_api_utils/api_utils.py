@@ -1,14 +1,22 @@
+import base64
+import binascii
+import json
 from os import environ
-from typing import Any, Iterable
+from typing import Any, Final, Iterable
 from urllib import parse
 from fastapi import APIRouter, FastAPI, Request, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter, ValidationError
 
-from eoepca_api_utils.exceptions import get_status_code_and_errors
-from eoepca_api_utils.json_api_types import APIErrorResponse, Error
+from eoepca_api_utils.exceptions import APIBadRequestError, get_status_code_and_errors
+from eoepca_api_utils.json_api_types import APIErrorResponse, Error, Link, Links
+
+# Query parameters of JSON:API cursor pagination, see https://jsonapi.org/profiles/ethanresnick/cursor-pagination/
+PAGE_SIZE_QUERY_PARAM: Final[str] = "page[size]"
+PAGE_CURSOR_QUERY_PARAM: Final[str] = "page[cursor]"
 
 
 class JSONAPIResponse(JSONResponse):
@@ -50,6 +58,80 @@ def _concat_url_str(base_url: str, path: str, query: str) -> str:
     return base_url + path + ("?" + query if query else "")
 
 
+def encode_cursor(state: Any) -> str:
+    """
+    Turns JSON-serializable pagination state (such as an offset or the last seen id)
+    into an opaque cursor that can be put in a URL.
+    """
+    return (
+        base64.urlsafe_b64encode(json.dumps(state, separators=(",", ":")).encode())
+        .decode()
+        .rstrip("=")
+    )
+
+
+def decode_cursor[T](cursor: str, state_type: type[T]) -> T:
+    """
+    Inverse of encode_cursor. Raises APIBadRequestError if the cursor wasn't made by
+    encode_cursor from a value of type state_type. Values aren't coerced, so a cursor
+    holding "1" or 1.5 isn't taken for the integer 1.
+    """
+    try:
+        return TypeAdapter(state_type).validate_json(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)), strict=True
+        )
+    except (binascii.Error, ValueError, ValidationError):
+        raise invalid_cursor_error(cursor)
+
+
+def invalid_cursor_error(cursor: str) -> APIBadRequestError:
+    """The error for a page cursor which can't be decoded or holds a value out of range"""
+    return APIBadRequestError(
+        title="Invalid page cursor",
+        detail=f"Page cursor '{cursor}' is invalid",
+    )
+
+
+def get_page_links(base_url: str, request: Request, next_cursor: str | None) -> Links:
+    """
+    Links for a page of a paginated list. The next link is the request URL with the
+    page cursor replaced by next_cursor, and is left out on the last page.
+    """
+    query_params_list = [
+        (key, value)
+        for key, value in request.query_params.multi_items()
+        if key != PAGE_CURSOR_QUERY_PARAM
+    ]
+    links: dict[str, Link] = {
+        "self": get_request_url_str(base_url, request),
+        "first": get_url_str(
+            base_url, request.url.path, query_params_list=query_params_list
+        ),
+        "root": base_url,
+    }
+    if next_cursor is not None:
+        links["next"] = get_url_str(
+            base_url,
+            request.url.path,
+            query_params_list=[
+                *query_params_list,
+                (PAGE_CURSOR_QUERY_PARAM, next_cursor),
+            ],
+        )
+    return Links(**links)
+
+
+def get_next_page_cursor(links: Links | None) -> str | None:
+    """Returns the page cursor in the next link of a page, None on the last page"""
+    if links is None or links.next is None:
+        return None
+    next_url = links.next if isinstance(links.next, str) else links.next.href
+    cursors = parse.parse_qs(parse.urlsplit(next_url).query).get(
+        PAGE_CURSOR_QUERY_PARAM
+    )
+    return cursors[0] if cursors else None
+
+
 def get_api_router_with_defaults() -> APIRouter:
     return APIRouter(
         default_response_class=JSONAPIResponse,
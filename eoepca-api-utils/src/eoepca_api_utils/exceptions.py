@@ -78,6 +78,11 @@ class APIUnauthorizedError(APIException):
         )
 
 
+class APIBadRequestError(APIException):
+    def __init__(self, title: str, detail: str) -> None:
+        super().__init__(status="400", title=title, detail=detail)
+
+
 class APIUserInputError(APIException):
     def __init__(self, title: str, detail: str) -> None:
         super().__init__(status="422", title=title, detail=detail)
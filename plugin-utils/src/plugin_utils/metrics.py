@@ -0,0 +1,113 @@
+import bisect
+from dataclasses import dataclass, field
+import logging
+
+# Upper bounds in seconds of the buckets of the latency histograms
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+@dataclass
+class LatencyHistogram:
+    buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS
+    # How many calls fell in each bucket (not cumulative), the last one being above all the buckets
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    sum: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+
+class HookMetrics:
+    """
+    Latency histograms of hook calls by hook name, and by hook name and function, as recorded by the functions prepared
+    with plugin_utils.runner.prepare_hook. Calls slower than slow_seconds are logged as warnings, unless it is None.
+    """
+
+    def __init__(
+        self,
+        slow_seconds: float | None = None,
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+        logger: logging.Logger = logging.getLogger(__name__),
+    ) -> None:
+        self.slow_seconds = slow_seconds
+        self.buckets = buckets
+        self.logger = logger
+        self.hooks: dict[str, LatencyHistogram] = {}
+        self.functions: dict[tuple[str, str], LatencyHistogram] = {}
+
+    def observe(self, hook_name: str, function_name: str, seconds: float) -> None:
+        if hook_name not in self.hooks:
+            self.hooks[hook_name] = LatencyHistogram(self.buckets)
+        self.hooks[hook_name].observe(seconds)
+        if (hook_name, function_name) not in self.functions:
+            self.functions[(hook_name, function_name)] = LatencyHistogram(self.buckets)
+        self.functions[(hook_name, function_name)].observe(seconds)
+
+        if self.slow_seconds is not None and seconds > self.slow_seconds:
+            self.logger.warning(
+                f"Slow hook {hook_name}: {function_name} took {seconds:.3f} seconds"
+            )
+
+    def prometheus_text(self, prefix: str = "") -> str:
+        """The histograms in the Prometheus text exposition format, with prefix before the metric names"""
+        hook_metric = f"{prefix}hook_duration_seconds"
+        function_metric = f"{prefix}hook_function_duration_seconds"
+        lines = [
+            f"# HELP {hook_metric} How long the functions of each hook take",
+            f"# TYPE {hook_metric} histogram",
+        ]
+        for hook_name, histogram in sorted(self.hooks.items()):
+            lines.extend(
+                _histogram_lines(
+                    hook_metric, f'hook="{_escape_label(hook_name)}"', histogram
+                )
+            )
+        lines.extend(
+            [
+                f"# HELP {function_metric} How long each hook function takes",
+                f"# TYPE {function_metric} histogram",
+            ]
+        )
+        for (hook_name, function_name), histogram in sorted(self.functions.items()):
+            labels = f'hook="{_escape_label(hook_name)}",function="{_escape_label(function_name)}"'
+            lines.extend(_histogram_lines(function_metric, labels, histogram))
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(
+    metric_name: str, labels: str, histogram: LatencyHistogram
+) -> list[str]:
+    lines: list[str] = []
+    cumulative = 0
+    for bucket, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f'{metric_name}_bucket{{{labels},le="{bucket}"}} {cumulative}')
+    lines.append(f'{metric_name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+    lines.append(f"{metric_name}_sum{{{labels}}} {histogram.sum}")
+    lines.append(f"{metric_name}_count{{{labels}}} {histogram.count}")
+    return lines
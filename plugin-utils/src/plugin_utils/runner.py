@@ -1,5 +1,176 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+import contextvars
+import functools
 import inspect
-from typing import Any, Awaitable, Callable
+import time
+from typing import Any, Awaitable, Callable, Iterable, Sequence
+
+from plugin_utils.metrics import HookMetrics
+
+try:
+    from opentelemetry import trace
+except ImportError:  # pragma: no cover
+    trace = None  # type: ignore
+
+# How many sync hooks are run at the same time by the default hook executor
+DEFAULT_HOOK_THREADS = 8
+
+_INLINE_ATTRIBUTE = "_plugin_utils_inline"
+_PREPARED_ATTRIBUTE = "_plugin_utils_prepared"
+_default_executor: Executor | None = None
+
+
+def run_inline[F: Callable](func: F) -> F:
+    """
+    Decorator for sync hooks which are quick and don't block, such as ones which only look at their arguments.
+    prepare_hook calls them on the event loop instead of in a thread.
+    """
+    setattr(func, _INLINE_ATTRIBUTE, True)
+    return func
+
+
+def _get_default_executor() -> Executor:
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = ThreadPoolExecutor(max_workers=DEFAULT_HOOK_THREADS, thread_name_prefix="hook")
+    return _default_executor
+
+
+def prepare_hook(
+    func: Callable, executor: Executor | None = None, *, hook_name: str | None = None, metrics: HookMetrics | None = None
+) -> Callable[..., Awaitable[Any]]:
+    """
+    Returns an async function calling func, deciding once how to call it.
+    Async functions are returned as they are, and sync functions decorated with run_inline are called on the event loop.
+    Other sync functions are run in executor (a shared pool of DEFAULT_HOOK_THREADS threads by default) with the context of the caller,
+    so a hook which blocks doesn't stall everything else on the event loop.
+    If hook_name is given, each call is traced in an OpenTelemetry span (if opentelemetry is installed) and timed in metrics (if given).
+    """
+    if getattr(func, _PREPARED_ATTRIBUTE, False):
+        return func
+    if hook_name is not None:
+        return _instrument(prepare_hook(func, executor), func, hook_name, metrics)
+    if inspect.iscoroutinefunction(func):
+        return func
+
+    if getattr(func, _INLINE_ATTRIBUTE, False):
+        @functools.wraps(func)
+        async def prepared(*args: Any, **kwargs: Any) -> Any:
+            return await wait_if_async(func(*args, **kwargs))
+    else:
+        @functools.wraps(func)
+        async def prepared(*args: Any, **kwargs: Any) -> Any:
+            context = contextvars.copy_context()
+            result = await asyncio.get_running_loop().run_in_executor(
+                executor or _get_default_executor(), functools.partial(context.run, func, *args, **kwargs)
+            )
+            # Sync functions may still return awaitables, which are awaited on the event loop
+            return await wait_if_async(result)
+
+    setattr(prepared, _PREPARED_ATTRIBUTE, True)
+    return prepared
+
+
+def _instrument(
+    prepared: Callable[..., Awaitable[Any]], func: Callable, hook_name: str, metrics: HookMetrics | None
+) -> Callable[..., Awaitable[Any]]:
+    function_name = f"{func.__module__}.{func.__qualname__}"
+    tracer = trace.get_tracer(__name__) if trace is not None else None
+    attributes = {"hook.name": hook_name, "hook.function": function_name}
+
+    @functools.wraps(func)
+    async def instrumented(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            if tracer is None:
+                return await prepared(*args, **kwargs)
+            with tracer.start_as_current_span(f"hook {hook_name}", attributes=attributes):
+                return await prepared(*args, **kwargs)
+        finally:
+            if metrics is not None:
+                metrics.observe(hook_name, function_name, time.perf_counter() - start)
+
+    setattr(instrumented, _PREPARED_ATTRIBUTE, True)
+    return instrumented
+
+
+class ConcurrentHooks(list[Callable]):
+    """
+    Functions of a hook which don't depend on each other, such as notification or audit hooks.
+    call_hooks_ignore_results and call_hooks_check_if_allow call them all at the same time instead of one by one,
+    and then handle the exception of the earliest function which raised one as if they had been called one by one.
+    """
+
+
+def prepare_hooks(
+    hooks: dict[str, list[Callable]],
+    executor: Executor | None = None,
+    metrics: HookMetrics | None = None,
+    concurrent: Iterable[str] = (),
+) -> dict[str, list[Callable]]:
+    """
+    Same as prepare_hook for each hook function, meant to be done when the hooks are loaded.
+    The calls are traced and timed in metrics under the name of their hook.
+    The functions of the hooks named in concurrent are returned as ConcurrentHooks.
+    """
+    concurrent = set(concurrent)
+    return {
+        name: (ConcurrentHooks if name in concurrent else list)(
+            prepare_hook(func, executor, hook_name=name, metrics=metrics) for func in funcs
+        )
+        for name, funcs in hooks.items()
+    }
+
+
+async def _no_hooks(*args: Any, **kwargs: Any) -> None:
+    return None
+
+
+def bind_hooks_until_not_none(funcs: list[Callable], executor: Executor | None = None) -> Callable[..., Awaitable[Any]]:
+    """
+    Same as call_hooks_until_not_none, with the functions prepared with prepare_hook once, ahead of the calls.
+    Returns an async function taking the arguments of the hooks, which does nothing if there are no functions.
+    """
+    prepared = [prepare_hook(func, executor) for func in funcs]
+    if not prepared:
+        return _no_hooks
+    if len(prepared) == 1:
+        return prepared[0]
+
+    async def call(*args: Any, **kwargs: Any) -> Any:
+        for func in prepared:
+            result = await func(*args, **kwargs)
+            if result is not None:
+                return result
+        return None
+
+    return call
+
+
+def bind_hooks_ignore_results(funcs: list[Callable], executor: Executor | None = None) -> Callable[..., Awaitable[None]]:
+    """
+    Same as call_hooks_ignore_results, with the functions prepared with prepare_hook once, ahead of the calls.
+    Returns an async function taking the arguments of the hooks, which does nothing if there are no functions.
+    """
+    prepared = [prepare_hook(func, executor) for func in funcs]
+    if not prepared:
+        return _no_hooks
+
+    if isinstance(funcs, ConcurrentHooks) and len(prepared) > 1:
+
+        async def call(*args: Any, **kwargs: Any) -> None:
+            for result in await asyncio.gather(*(func(*args, **kwargs) for func in prepared), return_exceptions=True):
+                if isinstance(result, BaseException):
+                    raise result
+
+    else:
+
+        async def call(*args: Any, **kwargs: Any) -> None:
+            for func in prepared:
+                await func(*args, **kwargs)
+
+    return call
 
 
 async def call_hooks_until_not_none(funcs: list[Callable], *args: Any, **kwargs: Any) -> Any:
@@ -13,18 +184,41 @@ async def call_hooks_until_not_none(funcs: list[Callable], *args: Any, **kwargs:
     return None
 
 
+async def _call_concurrently(funcs: list[Callable], *args: Any, **kwargs: Any) -> list[Any]:
+    """The result or the exception of each of the functions, called at the same time, in the same order as funcs"""
+
+    async def call(func: Callable) -> Any:
+        return await wait_if_async(func(*args, **kwargs))
+
+    return await asyncio.gather(*(call(func) for func in funcs), return_exceptions=True)
+
+
 async def call_hooks_ignore_results(funcs: list[Callable], *args: Any, **kwargs: Any) -> None:
     """
-    Calls functions one by one and ignores the returned values
+    Calls functions one by one and ignores the returned values.
+    ConcurrentHooks are called at the same time, and the exception of the earliest function which raised one is raised
     """
+    if isinstance(funcs, ConcurrentHooks) and len(funcs) > 1:
+        for result in await _call_concurrently(funcs, *args, **kwargs):
+            if isinstance(result, BaseException):
+                raise result
+        return
     for func in funcs:
         await wait_if_async(func(*args, **kwargs))
 
 async def call_hooks_check_if_allow(exceptions: type[BaseException] | tuple[type[BaseException], ...], funcs: list[Callable], *args: Any, **kwargs: Any) -> bool:
     """
     Calls functions one by one and if catch any exception from exceptions, return that it's not allowed (false)
-    All other exceptions are not caught
+    All other exceptions are not caught. ConcurrentHooks are called at the same time,
+    and the exception of the earliest function which raised one is handled the same way
     """
+    if isinstance(funcs, ConcurrentHooks) and len(funcs) > 1:
+        for result in await _call_concurrently(funcs, *args, **kwargs):
+            if isinstance(result, exceptions):
+                return False
+            if isinstance(result, BaseException):
+                raise result
+        return True
     for func in funcs:
         try:
             await wait_if_async(func(*args, **kwargs))
@@ -33,5 +227,50 @@ async def call_hooks_check_if_allow(exceptions: type[BaseException] | tuple[type
     return True
 
 
+async def call_hooks_check_if_allow_many(exceptions: type[BaseException] | tuple[type[BaseException], ...], funcs: list[Callable], args_list: Iterable[tuple[Any, ...]], max_concurrency: int) -> list[bool]:
+    """
+    Same as call_hooks_check_if_allow for each tuple of positional arguments in args_list,
+    but with up to max_concurrency of them checked at the same time.
+    Returns whether each is allowed, in the same order as args_list.
+    If a check raises an exception which is not in exceptions, the remaining checks are cancelled and the exception is raised
+    """
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def check_if_allow(args: tuple[Any, ...]) -> bool:
+        async with semaphore:
+            return await call_hooks_check_if_allow(exceptions, funcs, *args)
+
+    tasks = [asyncio.ensure_future(check_if_allow(args)) for args in args_list]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+async def call_batch_hooks_check_if_allow(exceptions: type[BaseException] | tuple[type[BaseException], ...], funcs: list[Callable], items: Sequence[Any], *args: Any, batch_size: int, **kwargs: Any) -> list[bool]:
+    """
+    Batch version of call_hooks_check_if_allow. Each function is called with args, then a list of at most batch_size items (all items if batch_size is 0),
+    then kwargs, and must return whether each of those items is allowed, in the same order.
+    Returns whether each item is allowed by all the functions. Later functions are only called with the items allowed so far.
+    If a function raises any exception from exceptions, none of the items it was called with are allowed. All other exceptions are not caught
+    """
+    allowed = [True] * len(items)
+    for func in funcs:
+        indices = [index for index, allow in enumerate(allowed) if allow]
+        for start in range(0, len(indices), batch_size or len(indices) or 1):
+            batch = indices[start : start + (batch_size or len(indices))]
+            try:
+                results = list(await wait_if_async(func(*args, [items[index] for index in batch], **kwargs)))
+            except exceptions:
+                results = [False] * len(batch)
+            if len(results) != len(batch):
+                raise ValueError(f"Batch hook {func.__name__} returned {len(results)} results for {len(batch)} items")
+            for index, allow in zip(batch, results):
+                allowed[index] = bool(allow)
+    return allowed
+
+
 async def wait_if_async[T](x: Awaitable[T] | T) -> T:
     return (await x) if inspect.isawaitable(x) else x
\ No newline at end of file
@@ -1,12 +1,24 @@
+import asyncio
 import contextlib
+import contextvars
+import threading
 from dataclasses import dataclass
 from typing import Any, Callable
 
 import pytest
+from plugin_utils.metrics import HookMetrics
 from plugin_utils.runner import (
+    ConcurrentHooks,
+    bind_hooks_ignore_results,
+    bind_hooks_until_not_none,
+    call_batch_hooks_check_if_allow,
     call_hooks_check_if_allow,
+    call_hooks_check_if_allow_many,
     call_hooks_ignore_results,
     call_hooks_until_not_none,
+    prepare_hook,
+    prepare_hooks,
+    run_inline,
 )
 
 
@@ -141,3 +153,177 @@ async def test_call_hooks_check_if_allow(args: HooksArgs) -> None:
             )
             == e
         )
+
+
+async def test_call_hooks_check_if_allow_many() -> None:
+    running = 0
+    max_running = 0
+
+    async def hook(a: str) -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        # Let the other checks start
+        await asyncio.sleep(0.01 if a == "slow" else 0)
+        running -= 1
+        if a == "deny":
+            raise ValueError(a)
+
+    assert await call_hooks_check_if_allow_many(
+        ValueError,
+        [hook],
+        [("slow",), ("deny",), ("allow",), ("deny",), ("allow",)],
+        max_concurrency=2,
+    ) == [True, False, True, False, True]
+    assert max_running == 2
+
+    with pytest.raises(RuntimeError):
+        await call_hooks_check_if_allow_many(
+            ValueError, [hookC], [("a",), ("c",)], max_concurrency=2
+        )
+
+
+async def test_call_batch_hooks_check_if_allow() -> None:
+    calls: list[list[int]] = []
+
+    async def allow_even(prefix: str, items: list[int]) -> list[bool]:
+        assert prefix == "p"
+        calls.append(items)
+        return [item % 2 == 0 for item in items]
+
+    def allow_small(prefix: str, items: list[int]) -> list[bool]:
+        calls.append(items)
+        if 6 in items:
+            raise ValueError("6")
+        return [item < 4 for item in items]
+
+    assert await call_batch_hooks_check_if_allow(
+        ValueError, [allow_even, allow_small], [0, 1, 2, 3, 4, 5, 6], "p", batch_size=2
+    ) == [True, False, True, False, False, False, False]
+    # The second hook only sees the items the first allowed
+    assert calls == [[0, 1], [2, 3], [4, 5], [6], [0, 2], [4, 6]]
+
+    with pytest.raises(ValueError):
+        await call_batch_hooks_check_if_allow(
+            (), [lambda prefix, items: [True]], [1, 2], "p", batch_size=0
+        )
+
+
+async def test_prepare_hooks_runs_sync_hooks_off_the_event_loop() -> None:
+    request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id")
+    loop_thread = threading.get_ident()
+    release = threading.Event()
+
+    def blocking(a: str) -> tuple[str, bool]:
+        release.wait(timeout=5)
+        return request_id.get() + a, threading.get_ident() == loop_thread
+
+    @run_inline
+    def trivial(a: str) -> tuple[str, bool]:
+        return a, threading.get_ident() == loop_thread
+
+    hooks = prepare_hooks({"blocking": [blocking], "trivial": [trivial, hookC]})
+    # Async functions are called as they are
+    assert prepare_hook(hookC) is hookC
+
+    request_id.set("request ")
+    blocked = asyncio.ensure_future(call_hooks_until_not_none(hooks["blocking"], "a"))
+    # The event loop keeps going while the sync hook blocks
+    assert await call_hooks_until_not_none(hooks["trivial"], "b") == ("b", True)
+    assert not blocked.done()
+
+    release.set()
+    # The sync hook sees the context of its caller
+    assert await blocked == ("request a", False)
+
+
+async def test_bind_hooks() -> None:
+    calls: list[str] = []
+
+    def record(a: str) -> None:
+        calls.append(a)
+
+    until_not_none = bind_hooks_until_not_none([hookA, hookB, hookC])
+    assert await until_not_none("a") == "aB"
+    ignore_results = bind_hooks_ignore_results([record, record])
+    await ignore_results("x")
+    assert calls == ["x", "x"]
+
+    # Hooks without functions do nothing, and share one function
+    assert bind_hooks_until_not_none([]) is bind_hooks_ignore_results([])
+    await bind_hooks_ignore_results([])("a")
+    # A single async function is called as it is
+    assert bind_hooks_until_not_none([hookC]) is hookC
+
+
+async def test_prepare_hooks_times_each_call(caplog: pytest.LogCaptureFixture) -> None:
+    async def slow(a: str) -> None:
+        await asyncio.sleep(0.02)
+
+    metrics = HookMetrics(slow_seconds=0.01)
+    hooks = prepare_hooks({"on_a": [hookA, slow], "on_b": [hookB]}, metrics=metrics)
+    await call_hooks_ignore_results(hooks["on_a"], "a")
+    await call_hooks_ignore_results(hooks["on_a"], "a")
+    assert await call_hooks_until_not_none(hooks["on_b"], "b") == "bB"
+
+    assert metrics.hooks["on_a"].count == 4
+    assert metrics.hooks["on_b"].count == 1
+    assert metrics.functions[("on_a", f"{__name__}.hookA")].count == 2
+    slow_name = f"{__name__}.test_prepare_hooks_times_each_call.<locals>.slow"
+    assert metrics.functions[("on_a", slow_name)].sum >= 0.04
+    assert [record.getMessage().split(" took")[0] for record in caplog.records] == [
+        f"Slow hook on_a: {slow_name}"
+    ] * 2
+
+    text = metrics.prometheus_text("rh_")
+    assert 'rh_hook_duration_seconds_count{hook="on_a"} 4' in text
+    assert (
+        f'rh_hook_function_duration_seconds_bucket{{hook="on_b",function="{__name__}.hookB",le="+Inf"}} 1'
+        in text
+    )
+
+
+async def test_concurrent_hooks() -> None:
+    running = 0
+    max_running = 0
+
+    async def notify(a: str) -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    async def deny(a: str) -> None:
+        await asyncio.sleep(0.005)
+        raise ValueError(a)
+
+    hooks = prepare_hooks(
+        {"on_a": [notify, notify, notify], "on_b": [notify, notify]},
+        concurrent=["on_a"],
+    )
+    assert isinstance(hooks["on_a"], ConcurrentHooks)
+    await call_hooks_ignore_results(hooks["on_a"], "a")
+    assert max_running == 3
+    max_running = 0
+    await bind_hooks_ignore_results(hooks["on_a"])("a")
+    assert max_running == 3
+    max_running = 0
+    await call_hooks_ignore_results(hooks["on_b"], "b")
+    assert max_running == 1
+
+    # The exception of the earliest function which raised one counts
+    with pytest.raises(NotImplementedError):
+        await call_hooks_ignore_results(ConcurrentHooks([notify, hookC, deny]), "b")
+    with pytest.raises(NotImplementedError):
+        await bind_hooks_ignore_results(ConcurrentHooks([notify, hookC, deny]))("b")
+    assert not await call_hooks_check_if_allow(
+        ValueError, ConcurrentHooks([notify, deny, hookC]), "b"
+    )
+    with pytest.raises(NotImplementedError):
+        await call_hooks_check_if_allow(
+            ValueError, ConcurrentHooks([notify, hookC, deny]), "b"
+        )
+    assert await call_hooks_check_if_allow(
+        ValueError, ConcurrentHooks([notify, hookA]), "b"
+    )